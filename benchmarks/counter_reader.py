@@ -0,0 +1,42 @@
+"""
+Сравнение стоимости чтения счетчиков адаптеров: psutil и /proc/net/dev.
+
+Запуск из корня проекта:
+    python -m benchmarks.counter_reader [адаптер ...]
+"""
+
+import sys
+import timeit
+
+from src.core.counter_reader import ProcNetDevReader, PsutilCounterReader
+
+
+def measure(reader, adapter_names, number):
+    """Среднее время одного чтения, микросекунды"""
+    reader.read(adapter_names)  # Прогрев
+    best = min(timeit.repeat(lambda: reader.read(adapter_names), number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main():
+    adapter_names = sys.argv[1:] or ['lo']
+    number = 2000
+    psutil_reader = PsutilCounterReader()
+    print(f"Адаптеры: {', '.join(adapter_names)}")
+    psutil_cost = measure(psutil_reader, adapter_names, number)
+    print(f"psutil.net_io_counters: {psutil_cost:8.1f} мкс/образец")
+    try:
+        proc_reader = ProcNetDevReader()
+    except OSError as e:
+        print(f"/proc/net/dev недоступен: {e}")
+        return
+    # Значения могут измениться между чтениями, поэтому сравниваем набор адаптеров
+    if proc_reader.read(adapter_names).keys() != psutil_reader.read(adapter_names).keys():
+        print("Наборы найденных адаптеров различаются")
+    proc_cost = measure(proc_reader, adapter_names, number)
+    print(f"/proc/net/dev (preadv): {proc_cost:8.1f} мкс/образец ({psutil_cost / proc_cost:.1f}x)")
+    proc_reader.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Время импорта точек входа приложения.
+
+Каждый модуль импортируется в отдельном процессе (python -X importtime),
+из нескольких запусков берется лучший. Кроме времени выводится, какие
+тяжелые модули загрузились при импорте.
+
+Запуск из корня проекта:
+    python -m benchmarks.import_time [-n ПОВТОРОВ]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Модули, загружаемые main.py, run_client.py и run_server.py
+ENTRY_MODULES = {
+    'main.py': 'src.ui.network_monitor_window',
+    'run_client.py': 'src.client.client_window',
+    'run_server.py': 'src.core.server_core',
+}
+HEAVY_MODULES = ('numpy', 'pyqtgraph', 'wmi', 'PyQt6.QtWidgets', 'asyncio')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time(module):
+    """Импортирует модуль в новом процессе
+
+    Returns:
+        tuple: (суммарное время импорта в мкс, загруженные тяжелые модули)
+    """
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            total = int(parts[1])
+    return total, result.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время импорта точек входа")
+    parser.add_argument('-n', type=int, default=5, help="количество запусков (по умолчанию 5)")
+    args = parser.parse_args()
+
+    for script, module in ENTRY_MODULES.items():
+        runs = [import_time(module) for _ in range(args.n)]
+        best = min(total for total, _ in runs)
+        print(f"{script:14} {module:32} {best / 1000:7.1f} мс  [{runs[0][1] or '-'}]")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,10 @@
 import os
-from PyQt6.QtWidgets import QMainWindow, QTableWidgetItem
+from PyQt6.QtWidgets import QMainWindow
 from PyQt6 import uic
 from PyQt6.QtCore import Qt
+from ..core.log_queue import ERROR, INFO
+from ..ui.info_table_model import INFO_FIELDS, MEASUREMENT_FIELDS, info_table_model, speed_values
+from ..ui.log_view import LogView
 from .network_client import NetworkClient
 
 class ClientWindow(QMainWindow):
@@ -18,7 +21,6 @@ class ClientWindow(QMainWindow):
         self.client.connected.connect(self.on_connected)
         self.client.disconnected.connect(self.on_disconnected)
         self.client.error.connect(self.on_error)
-        self.client.log_message.connect(self.update_log)
         self.client.adapter_info_received.connect(self.update_adapter_info)
         self.client.speeds_received.connect(self.update_speeds)
         self.client.adapters_list_received.connect(self.update_adapters_list)
@@ -33,12 +35,14 @@ class ClientWindow(QMainWindow):
     def setup_ui(self):
         """Настройка начального состояния UI"""
         # Настраиваем таблицу информации об адаптере
-        self.adapterInfoTable.setColumnCount(2)
-        self.adapterInfoTable.setHorizontalHeaderLabels(["Параметр", "Значение"])
+        self.info_model = info_table_model(self.adapterInfoTable, INFO_FIELDS + MEASUREMENT_FIELDS)
         
         # Очищаем список адаптеров
         self.adapterList.clear()
         
+        # Лог агента выводится в виджет пачками по таймеру
+        self.log_view = LogView(self.logWidget, self.client.log)
+        
         # Устанавливаем начальный статус
         self.statusLabel.setText("Статус: Не подключен")
         
@@ -50,7 +54,7 @@ class ClientWindow(QMainWindow):
             try:
                 port = int(self.serverPortInput.text())
             except ValueError:
-                self.update_log("Ошибка: некорректный порт")
+                self.update_log("Ошибка: некорректный порт", ERROR)
                 return
                 
             self.client.connect_to_server(ip, port)
@@ -76,15 +80,15 @@ class ClientWindow(QMainWindow):
         self.serverIPInput.setEnabled(True)
         self.serverPortInput.setEnabled(True)
         self.adapterList.clear()
-        self.adapterInfoTable.setRowCount(0)
+        self.info_model.clear_values()
         
     def on_error(self, error_msg):
         """Обработка ошибок"""
-        self.update_log(f"Ошибка: {error_msg}")
+        self.update_log(f"Ошибка: {error_msg}", ERROR)
         
-    def update_log(self, message):
-        """Обновление лога"""
-        self.logWidget.append(message)
+    def update_log(self, message, level=INFO):
+        """Добавление сообщения в лог (выводится вместе с записями агента)"""
+        self.client.log.log(level, message)
         
     def on_adapter_selected(self):
         """Обработка выбора адаптера из списка"""
@@ -99,77 +103,11 @@ class ClientWindow(QMainWindow):
         
     def update_adapter_info(self, info):
         """Обновление информации об адаптере"""
-        self.adapterInfoTable.setRowCount(len(info))
-        for row, (key, value) in enumerate(info.items()):
-            self.adapterInfoTable.setItem(row, 0, QTableWidgetItem(str(key)))
-            self.adapterInfoTable.setItem(row, 1, QTableWidgetItem(str(value)))
-            
-        # Настраиваем ширину столбцов
-        self.adapterInfoTable.resizeColumnsToContents()
-        self.adapterInfoTable.horizontalHeader().setStretchLastSection(True)
+        self.info_model.update({field_id: info.get(field_id, '-') for field_id, _ in INFO_FIELDS})
             
     def update_speeds(self, speeds):
-        """Обновление информации о скорости"""
-        # Проверяем, есть ли уже строки для скорости
-        speed_rows = []
-        for row in range(self.adapterInfoTable.rowCount()):
-            param = self.adapterInfoTable.item(row, 0).text()
-            if "Загрузка" in param or "Отдача" in param:
-                speed_rows.append(row)
-                
-        # Если строк для скорости нет, добавляем их
-        if not speed_rows:
-            # Добавляем строки для текущей скорости
-            current_row = self.adapterInfoTable.rowCount()
-            self.adapterInfoTable.setRowCount(current_row + 2)
-            
-            self.adapterInfoTable.setItem(current_row, 0, QTableWidgetItem("Загрузка - текущая"))
-            self.adapterInfoTable.setItem(current_row, 1, QTableWidgetItem(f"{speeds['download']:.2f} Кбит/с"))
-            
-            self.adapterInfoTable.setItem(current_row + 1, 0, QTableWidgetItem("Отдача - текущая"))
-            self.adapterInfoTable.setItem(current_row + 1, 1, QTableWidgetItem(f"{speeds['upload']:.2f} Кбит/с"))
-            
-            # Добавляем статистику
-            if 'stats' in speeds:
-                stats = speeds['stats']
-                stat_row = current_row + 2
-                self.adapterInfoTable.setRowCount(stat_row + 4)
-                
-                self.adapterInfoTable.setItem(stat_row, 0, QTableWidgetItem("Загрузка - максимальная"))
-                self.adapterInfoTable.setItem(stat_row, 1, QTableWidgetItem(f"{stats['max_download']:.2f} Кбит/с"))
-                
-                self.adapterInfoTable.setItem(stat_row + 1, 0, QTableWidgetItem("Загрузка - средняя"))
-                self.adapterInfoTable.setItem(stat_row + 1, 1, QTableWidgetItem(f"{stats['avg_download']:.2f} Кбит/с"))
-                
-                self.adapterInfoTable.setItem(stat_row + 2, 0, QTableWidgetItem("Отдача - максимальная"))
-                self.adapterInfoTable.setItem(stat_row + 2, 1, QTableWidgetItem(f"{stats['max_upload']:.2f} Кбит/с"))
-                
-                self.adapterInfoTable.setItem(stat_row + 3, 0, QTableWidgetItem("Отдача - средняя"))
-                self.adapterInfoTable.setItem(stat_row + 3, 1, QTableWidgetItem(f"{stats['avg_upload']:.2f} Кбит/с"))
-        else:
-            # Обновляем существующие строки
-            for row in range(self.adapterInfoTable.rowCount()):
-                param = self.adapterInfoTable.item(row, 0).text()
-                if param == "Загрузка - текущая":
-                    self.adapterInfoTable.setItem(row, 1, QTableWidgetItem(f"{speeds['download']:.2f} Кбит/с"))
-                elif param == "Отдача - текущая":
-                    self.adapterInfoTable.setItem(row, 1, QTableWidgetItem(f"{speeds['upload']:.2f} Кбит/с"))
-                
-                # Обновляем статистику
-                if 'stats' in speeds:
-                    stats = speeds['stats']
-                    if param == "Загрузка - максимальная":
-                        self.adapterInfoTable.setItem(row, 1, QTableWidgetItem(f"{stats['max_download']:.2f} Кбит/с"))
-                    elif param == "Загрузка - средняя":
-                        self.adapterInfoTable.setItem(row, 1, QTableWidgetItem(f"{stats['avg_download']:.2f} Кбит/с"))
-                    elif param == "Отдача - максимальная":
-                        self.adapterInfoTable.setItem(row, 1, QTableWidgetItem(f"{stats['max_upload']:.2f} Кбит/с"))
-                    elif param == "Отдача - средняя":
-                        self.adapterInfoTable.setItem(row, 1, QTableWidgetItem(f"{stats['avg_upload']:.2f} Кбит/с"))
-                        
-        # Настраиваем ширину столбцов
-        self.adapterInfoTable.resizeColumnsToContents()
-        self.adapterInfoTable.horizontalHeader().setStretchLastSection(True)
+        """Обновление информации о скорости (только изменившиеся ячейки)"""
+        self.info_model.update(speed_values(speeds, "Кбит/с"))
 
     def update_adapters_list(self, adapters):
         """Обновление списка адаптеров"""
@@ -3,16 +3,24 @@ import json
 import threading
 import time
 import platform
+from functools import partial
 from PyQt6.QtCore import QObject, pyqtSignal
-from PyQt6.QtWidgets import QTableWidgetItem
+from ..core.log_queue import DEBUG, ERROR, INFO, LogQueue
 from ..core.network_monitor import NetworkMonitor
+from ..core.protocol import (
+    BINARY_SAMPLES, CAPABILITIES, MAX_BATCH_SAMPLES, MessageReader, ProtocolError,
+    decode_payload, encode_message, encode_sample, encode_sample_batch
+)
+from ..core.scheduler import PeriodicSchedule, normalize_interval
+
+DEFAULT_BATCH_SAMPLES = 100  # Максимум образцов в пакете по умолчанию
+
 
 class NetworkClient(QObject):
     """Класс для взаимодействия клиента с сервером"""
     connected = pyqtSignal()
     disconnected = pyqtSignal()
     error = pyqtSignal(str)
-    log_message = pyqtSignal(str)
     adapter_info_received = pyqtSignal(dict)
     speeds_received = pyqtSignal(dict)
     adapters_list_received = pyqtSignal(list)
@@ -22,12 +30,39 @@ class NetworkClient(QObject):
         self.socket = None
         self.is_connected = False
         self.receive_thread = None
-        self.network_monitor = NetworkMonitor()
-        self.current_monitored_adapter = None
+        self.network_monitor = NetworkMonitor(history_capacity=0)  # История скорости не нужна
+        self.sessions = {}  # {adapter_name: MeasurementSession} - отслеживаемые адаптеры
         self.monitoring_thread = None
         self.is_monitoring = False
+        # Прерывает паузу цикла мониторинга: при остановке и смене интервала
+        self._monitoring_wakeup = threading.Event()
+        self.interval = normalize_interval(None)  # Интервал измерения, секунды
+        self.capabilities = set()  # Возможности протокола, подтвержденные сервером
+        self.adapter_ids = {}  # {adapter_name: id} - объявленные серверу id для образцов
+        self._next_adapter_id = 0
+        self._send_lock = threading.Lock()  # Кадры из разных потоков не должны перемешиваться
+        # Пакетная отправка: образцы копятся batch_window секунд или до
+        # batch_samples штук и отправляются одним сообщением (0 - сразу)
+        self.batch_window = 0.0
+        self.batch_samples = DEFAULT_BATCH_SAMPLES
+        self._batch = []
+        self._batch_deadline = None
+        self._batch_lock = threading.Lock()
+        self.log = LogQueue()  # Лог агента; записи забирает окно пачками
+        # Ошибки фоновых потоков монитора (наблюдение за адаптерами, кэш сведений) - в лог
+        self.network_monitor.set_error_handler(partial(self.log.log, ERROR))
         self.pc_name = self.get_pc_name()
         
+    def _log(self, message, *args, level=INFO):
+        """Добавление сообщения в лог агента
+        
+        Args:
+            message: Текст или шаблон '%s'; аргументы подставляются, только
+                если сообщение попадет в лог
+            level: Уровень сообщения
+        """
+        self.log.log(level, message, *args)
+        
     def get_pc_name(self):
         """Получение имени компьютера"""
         try:
@@ -46,31 +81,37 @@ class NetworkClient(QObject):
             bool: True если подключение успешно, иначе False
         """
         try:
-            self.log_message.emit(f"Подключаемся к серверу {ip}:{port}...")
+            self._log("Подключаемся к серверу %s:%s...", ip, port)
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.connect((ip, port))
             self.is_connected = True
+            self.capabilities = set()
+            self.adapter_ids = {}
             
             # Устанавливаем таймаут для сокета
             self.socket.settimeout(5.0)
-            self.log_message.emit("Соединение установлено успешно!")
+            self._log("Соединение установлено успешно!")
             
             # Отправляем информацию о клиенте
-            self.log_message.emit("Отправляем информацию о клиенте...")
+            self._log("Отправляем информацию о клиенте...")
             self._send_client_info()
             
+            # Изменения адаптеров сообщаем серверу сразу, без его запросов
+            self.network_monitor.remove_adapter_listener(self._on_adapter_event)
+            self.network_monitor.add_adapter_listener(self._on_adapter_event)
+            
             # Запускаем поток для приема данных
-            self.log_message.emit("Запускаем поток приема данных...")
+            self._log("Запускаем поток приема данных...")
             self.receive_thread = threading.Thread(target=self._receive_data)
             self.receive_thread.daemon = True
             self.receive_thread.start()
             
             self.connected.emit()
-            self.log_message.emit(f"Подключено к серверу {ip}:{port}")
+            self._log("Подключено к серверу %s:%s", ip, port)
             return True
         except Exception as e:
             self.error.emit(f"Ошибка подключения: {str(e)}")
-            self.log_message.emit(f"Критическая ошибка при подключении: {str(e)}")
+            self._log("Критическая ошибка при подключении: %s", e, level=ERROR)
             self.is_connected = False
             return False
             
@@ -84,48 +125,57 @@ class NetworkClient(QObject):
             if self.is_monitoring:
                 self.stop_monitoring()
                 
+            self.network_monitor.remove_adapter_listener(self._on_adapter_event)
+            
             # Закрываем сокет
             if self.socket:
                 self.socket.close()
                 
             self.is_connected = False
             self.disconnected.emit()
-            self.log_message.emit("Отключено от сервера")
+            self._log("Отключено от сервера")
         except Exception as e:
             self.error.emit(f"Ошибка при отключении: {str(e)}")
             
     def _receive_data(self):
         """Поток для приема данных от сервера"""
-        self.log_message.emit("Запущен поток приема данных от сервера")
+        self._log("Запущен поток приема данных от сервера")
+        reader = MessageReader(self.socket)
         while self.is_connected:
             try:
-                self.log_message.emit("Ожидаем данные от сервера...")
-                data = self.socket.recv(4096)
-                if not data:
+                self._log("Ожидаем данные от сервера...", level=DEBUG)
+                payloads = reader.read()
+                if payloads is None:
                     # Сервер отключился
                     self.is_connected = False
                     self.disconnected.emit()
-                    self.log_message.emit("Сервер разорвал соединение")
+                    self._log("Сервер разорвал соединение")
                     break
                 
-                self.log_message.emit(f"Получены данные от сервера: {len(data)} байт")
-                # Обрабатываем полученные данные
-                self._process_server_request(data)
+                # Обрабатываем каждое полностью полученное сообщение
+                for payload in payloads:
+                    self._log("Получены данные от сервера: %s байт", len(payload), level=DEBUG)
+                    self._process_server_request(payload)
             except socket.timeout:
-                self.log_message.emit("Таймаут ожидания данных от сервера")
+                self._log("Таймаут ожидания данных от сервера", level=DEBUG)
                 continue
+            except ProtocolError as e:
+                self.error.emit(f"Нарушение протокола: {str(e)}")
+                self.is_connected = False
+                self.disconnected.emit()
+                break
             except Exception as e:
                 # Проверяем, не закрыт ли уже сокет
                 if not self.is_connected:
                     break
                 
                 self.error.emit(f"Ошибка при получении данных: {str(e)}")
-                self.log_message.emit(f"Критическая ошибка в потоке приема: {str(e)}")
+                self._log("Критическая ошибка в потоке приема: %s", e, level=ERROR)
                 self.is_connected = False
                 self.disconnected.emit()
                 break
         
-        self.log_message.emit("Поток приема данных завершен")
+        self._log("Поток приема данных завершен")
 
     def _process_server_request(self, data):
         """Обработка запроса от сервера
@@ -135,42 +185,53 @@ class NetworkClient(QObject):
         """
         try:
             # Декодируем данные
-            self.log_message.emit(f"Декодируем полученные данные: {data[:100]}...")
-            message = json.loads(data.decode('utf-8'))
-            self.log_message.emit(f"Получено сообщение от сервера: {message}")
+            self._log("Декодируем полученные данные: %s...", data[:100], level=DEBUG)
+            message = decode_payload(data)
+            self._log("Получено сообщение от сервера: %s", message, level=DEBUG)
             
             # Обрабатываем различные типы сообщений
             if 'type' in message:
                 message_type = message['type']
-                self.log_message.emit(f"Тип сообщения: {message_type}")
+                self._log("Тип сообщения: %s", message_type, level=DEBUG)
                 
                 if message_type == 'get_adapters':
                     # Запрос на получение списка адаптеров
-                    self.log_message.emit("ПОЛУЧЕН ЗАПРОС НА СПИСОК АДАПТЕРОВ")
+                    self._log("ПОЛУЧЕН ЗАПРОС НА СПИСОК АДАПТЕРОВ")
                     self._send_adapters_list()
                     
                 elif message_type == 'get_adapter_info':
                     # Запрос на получение информации об адаптере
                     adapter_name = message.get('adapter')
                     if adapter_name:
-                        self.log_message.emit(f"ПОЛУЧЕН ЗАПРОС НА ИНФОРМАЦИЮ ОБ АДАПТЕРЕ: {adapter_name}")
+                        self._log("ПОЛУЧЕН ЗАПРОС НА ИНФОРМАЦИЮ ОБ АДАПТЕРЕ: %s", adapter_name)
                         self._send_adapter_info(adapter_name)
                     else:
                         self.error.emit("Получен запрос без имени адаптера")
                         
+                elif message_type == 'get_snapshot':
+                    # Запрос всех адаптеров со сведениями и счетчиками одним сообщением
+                    self._log("ПОЛУЧЕН ЗАПРОС НА СНИМОК АДАПТЕРОВ")
+                    self._send_snapshot()
+                    
                 elif message_type == 'start_monitoring':
                     # Запрос на начало мониторинга
                     adapter_name = message.get('adapter')
                     if adapter_name:
-                        self.log_message.emit(f"ПОЛУЧЕН ЗАПРОС НА НАЧАЛО МОНИТОРИНГА АДАПТЕРА: {adapter_name}")
-                        self.start_monitoring(adapter_name)
+                        self._log("ПОЛУЧЕН ЗАПРОС НА НАЧАЛО МОНИТОРИНГА АДАПТЕРА: %s", adapter_name)
+                        self.start_monitoring(adapter_name, message.get('interval'),
+                                              message.get('batch_window'), message.get('batch_samples'))
                     else:
                         self.error.emit("Получен запрос на мониторинг без имени адаптера")
                         
                 elif message_type == 'stop_monitoring':
-                    # Запрос на остановку мониторинга
-                    self.log_message.emit("ПОЛУЧЕН ЗАПРОС НА ОСТАНОВКУ МОНИТОРИНГА")
-                    self.stop_monitoring()
+                    # Запрос на остановку мониторинга (одного адаптера или всех)
+                    self._log("ПОЛУЧЕН ЗАПРОС НА ОСТАНОВКУ МОНИТОРИНГА")
+                    self.stop_monitoring(message.get('adapter'))
+                    
+                elif message_type == 'capabilities':
+                    # Сервер подтвердил поддерживаемые возможности протокола
+                    self.capabilities = set(message.get('capabilities', [])) & set(CAPABILITIES)
+                    self._log("Возможности протокола: %s", sorted(self.capabilities))
                     
                 elif message_type == 'error':
                     # Сообщение об ошибке от сервера
@@ -179,18 +240,18 @@ class NetworkClient(QObject):
                     
                 else:
                     # Неизвестный тип сообщения
-                    self.log_message.emit(f"Получено неизвестное сообщение: {message_type}")
+                    self._log("Получено неизвестное сообщение: %s", message_type)
                     
             else:
                 # Сообщение без типа
-                self.log_message.emit(f"Получено сообщение без типа: {message}")
+                self._log("Получено сообщение без типа: %s", message)
                 
         except json.JSONDecodeError as e:
             self.error.emit(f"Получены некорректные данные от сервера: {str(e)}")
-            self.log_message.emit(f"Ошибка декодирования JSON: {str(e)}, данные: {data[:100]}...")
+            self._log("Ошибка декодирования JSON: %s, данные: %s...", e, data[:100], level=ERROR)
         except Exception as e:
             self.error.emit(f"Ошибка обработки данных от сервера: {str(e)}")
-            self.log_message.emit(f"Критическая ошибка при обработке данных: {str(e)}")
+            self._log("Критическая ошибка при обработке данных: %s", e, level=ERROR)
             
     def _send_message(self, message):
         """Отправка сообщения серверу
@@ -202,31 +263,118 @@ class NetworkClient(QObject):
             bool: True если отправка успешна, иначе False
         """
         if not self.is_connected:
-            self.log_message.emit("Не удалось отправить сообщение: нет подключения к серверу")
+            self._log("Не удалось отправить сообщение: нет подключения к серверу", level=ERROR)
             return False
             
         try:
-            self.log_message.emit(f"Отправляем сообщение серверу: {message}")
-            data = json.dumps(message).encode('utf-8')
-            self.socket.sendall(data)
-            self.log_message.emit(f"Сообщение успешно отправлено ({len(data)} байт)")
+            self._log("Отправляем сообщение серверу: %s", message, level=DEBUG)
+            data = encode_message(message)
+            with self._send_lock:
+                self.socket.sendall(data)
+            self._log("Сообщение успешно отправлено (%s байт)", len(data), level=DEBUG)
             return True
         except Exception as e:
             self.error.emit(f"Ошибка отправки сообщения: {str(e)}")
-            self.log_message.emit(f"Ошибка при отправке данных: {str(e)}")
+            self._log("Ошибка при отправке данных: %s", e, level=ERROR)
             return False
             
+    def _send_sample(self, adapter_name, sample):
+        """Отправка образца счетчиков серверу
+
+        Скорость и статистику по счетчикам считает сервер. Если он
+        поддерживает двоичные образцы, образец передается записью
+        фиксированного размера без записи в лог; иначе - в JSON.
+        При включенной пакетной отправке образец только добавляется в пакет.
+
+        Args:
+            adapter_name: Имя адаптера
+            sample: Результат session.read_counters()
+        """
+        adapter_id = self._declare_adapter(adapter_name)
+        if adapter_id is None:
+            return False
+        record = (adapter_id,) + sample
+
+        if self.batch_window <= 0:
+            if BINARY_SAMPLES in self.capabilities:
+                return self._send_frame(encode_sample(*record))
+            return self._send_message({'type': 'speeds_data', 'sample': record})
+
+        with self._batch_lock:
+            self._batch.append(record)
+            now = time.monotonic()
+            if self._batch_deadline is None:
+                self._batch_deadline = now + self.batch_window
+            ready = len(self._batch) >= self.batch_samples or now >= self._batch_deadline
+        if ready:
+            return self._flush_batch()
+        return True
+
+    def _declare_adapter(self, adapter_name):
+        """Возвращает id адаптера для образцов, при необходимости объявляя его
+
+        Returns:
+            int: id адаптера или None, если объявление не удалось отправить
+        """
+        adapter_id = self.adapter_ids.get(adapter_name)
+        if adapter_id is None:
+            adapter_id = self._next_adapter_id
+            self._next_adapter_id = (self._next_adapter_id + 1) % 0x10000
+            if not self._send_message({'type': 'adapter_id', 'adapter': adapter_name, 'id': adapter_id}):
+                return None
+            self.adapter_ids[adapter_name] = adapter_id
+        return adapter_id
+
+    def _flush_batch(self):
+        """Отправка накопленного пакета образцов"""
+        with self._batch_lock:
+            batch, self._batch = self._batch, []
+            self._batch_deadline = None
+        if not batch:
+            return True
+
+        if BINARY_SAMPLES not in self.capabilities:
+            return self._send_message({'type': 'speeds_batch', 'samples': batch})
+        ok = True
+        for start in range(0, len(batch), MAX_BATCH_SAMPLES):
+            ok = self._send_frame(encode_sample_batch(batch[start:start + MAX_BATCH_SAMPLES])) and ok
+        return ok
+
+    def _send_frame(self, data):
+        """Отправка готового кадра без записи в лог"""
+        if not self.is_connected:
+            return False
+        try:
+            with self._send_lock:
+                self.socket.sendall(data)
+            return True
+        except Exception as e:
+            self.error.emit(f"Ошибка отправки образца: {str(e)}")
+            return False
+
+    def _on_adapter_event(self, event, adapter_name):
+        """Отправка серверу изменения адаптера (вызывается в потоке наблюдения)
+
+        Args:
+            event: Событие adapter_watcher (added, removed, up, down)
+            adapter_name: Имя адаптера
+        """
+        if not self.is_connected:
+            return
+        self._log("Адаптер %s: %s", adapter_name, event)
+        self._send_message({'type': 'adapter_event', 'event': event, 'adapter': adapter_name})
+        
     def _send_adapters_list(self):
         """Отправка списка адаптеров серверу"""
         adapters = self.network_monitor.get_adapters()
-        self.log_message.emit(f"Отправляем список адаптеров: {adapters}")
+        self._log("Отправляем список адаптеров: %s", adapters, level=DEBUG)
         message = {
             'type': 'adapters_list',
             'adapters': adapters
         }
         self._send_message(message)
         self.adapters_list_received.emit(adapters)
-        self.log_message.emit(f"Отправлен список адаптеров: {adapters}")
+        self._log("Отправлен список адаптеров: %s", adapters)
         
     def _send_adapter_info(self, adapter_name):
         """Отправка информации об адаптере серверу
@@ -235,7 +383,7 @@ class NetworkClient(QObject):
             adapter_name: Имя адаптера
         """
         info = self.network_monitor.get_adapter_info(adapter_name)
-        self.log_message.emit(f"Отправляем информацию об адаптере {adapter_name}: {info}")
+        self._log("Отправляем информацию об адаптере %s: %s", adapter_name, info, level=DEBUG)
         message = {
             'type': 'adapter_info',
             'adapter': adapter_name,
@@ -243,78 +391,134 @@ class NetworkClient(QObject):
         }
         self._send_message(message)
         self.adapter_info_received.emit(info)
-        self.log_message.emit(f"Отправлена информация об адаптере {adapter_name}")
+        self._log("Отправлена информация об адаптере %s", adapter_name)
+        
+    def _send_snapshot(self):
+        """Отправка снимка всех адаптеров (сведения и счетчики) серверу"""
+        snapshot = self.network_monitor.get_snapshot()
+        message = {'type': 'snapshot'}
+        message.update(snapshot)
+        self._send_message(message)
+        self._log("Отправлен снимок адаптеров: %s", len(snapshot['adapters']))
         
-    def start_monitoring(self, adapter_name):
+    def start_monitoring(self, adapter_name, interval=None, batch_window=None, batch_samples=None):
         """Запуск мониторинга скорости адаптера
         
+        Несколько адаптеров могут отслеживаться одновременно: у каждого
+        своя сессия измерения, а счетчики читаются одним вызовом psutil.
+        Интервал и настройки пакетной отправки общие для всех адаптеров.
+        
         Args:
             adapter_name: Имя адаптера для мониторинга
+            interval: Интервал измерения в секундах (None - не менять)
+            batch_window: Время накопления пакета образцов в секундах
+                (0 - отправлять каждый образец сразу, None - не менять)
+            batch_samples: Максимум образцов в пакете (None - не менять)
         """
-        if self.is_monitoring:
-            self.stop_monitoring()
-            
         try:
-            # Запоминаем текущий адаптер
-            self.current_monitored_adapter = adapter_name
-            
-            # Устанавливаем адаптер в NetworkMonitor
-            self.network_monitor.selected_adapter = adapter_name
-            self.network_monitor.start_measurement(adapter_name)
-            
-            # Запускаем мониторинг
-            self.is_monitoring = True
+            if interval is not None:
+                interval = normalize_interval(interval)
+                if interval != self.interval:
+                    self.interval = interval
+                    # Новый интервал действует сразу, а не после паузы по старому
+                    self._monitoring_wakeup.set()
+            if batch_window is not None:
+                self.batch_window = max(float(batch_window), 0.0)
+            if batch_samples is not None:
+                self.batch_samples = min(max(int(batch_samples), 1), MAX_BATCH_SAMPLES)
+
+            # Повторный запуск начинает измерение адаптера заново
+            # (новый id адаптера сбрасывает и статистику на сервере)
+            self.adapter_ids.pop(adapter_name, None)
+            session = self.sessions.pop(adapter_name, None)
+            if session:
+                self.network_monitor.close_session(session)
+            self.sessions[adapter_name] = self.network_monitor.open_session(adapter_name)
             
-            # Запускаем поток мониторинга
-            self.monitoring_thread = threading.Thread(target=self._monitoring_loop)
-            self.monitoring_thread.daemon = True
-            self.monitoring_thread.start()
+            # Запускаем поток мониторинга, если он еще не работает
+            if not self.is_monitoring:
+                self.is_monitoring = True
+                self._monitoring_wakeup.clear()
+                self.monitoring_thread = threading.Thread(target=self._monitoring_loop)
+                self.monitoring_thread.daemon = True
+                self.monitoring_thread.start()
             
-            self.log_message.emit(f"Запущен мониторинг адаптера {adapter_name}")
+            self._log("Запущен мониторинг адаптера %s", adapter_name)
         except Exception as e:
             self.error.emit(f"Ошибка запуска мониторинга: {str(e)}")
-            self.log_message.emit(f"Не удалось запустить мониторинг: {str(e)}")
-            self.is_monitoring = False
+            self._log("Не удалось запустить мониторинг: %s", e, level=ERROR)
+            if not self.sessions:
+                self.is_monitoring = False
             
-    def stop_monitoring(self):
-        """Остановка мониторинга скорости"""
+    def stop_monitoring(self, adapter_name=None):
+        """Остановка мониторинга скорости
+        
+        Args:
+            adapter_name: Имя адаптера (None - остановить мониторинг всех адаптеров)
+        """
         if not self.is_monitoring:
             return
             
+        if adapter_name is not None:
+            session = self.sessions.pop(adapter_name, None)
+            if session:
+                self.network_monitor.close_session(session)
+                self._log("Мониторинг адаптера %s остановлен", adapter_name)
+            if self.sessions:
+                # Накопленные образцы остановленного адаптера отправляем сразу
+                self._flush_batch()
+                return
+                
         self.is_monitoring = False
-        self.current_monitored_adapter = None
+        self._monitoring_wakeup.set()
         
-        # Ждем завершения потока
-        if self.monitoring_thread:
-            try:
-                self.monitoring_thread.join(1.0)
-            except:
-                pass
+        # Ждем завершения потока: пауза прервана событием, поэтому ожидание
+        # не дольше одного такта, а новый запуск не застанет старый поток
+        if self.monitoring_thread and self.monitoring_thread is not threading.current_thread():
+            self.monitoring_thread.join()
+        self.monitoring_thread = None
                 
-        self.log_message.emit("Мониторинг остановлен")
+        # Отправляем образцы, оставшиеся в незавершенном пакете
+        self._flush_batch()
+        
+        for session in self.sessions.values():
+            self.network_monitor.close_session(session)
+        self.sessions = {}
+                
+        self._log("Мониторинг остановлен")
         
     def _monitoring_loop(self):
         """Цикл мониторинга и отправки данных серверу"""
+        schedule = PeriodicSchedule(self.interval)
         while self.is_monitoring and self.is_connected:
-            try:
-                # Получаем текущие скорости
-                speeds = self.network_monitor.get_current_speeds()
-                
-                if speeds:
-                    # Отправляем данные серверу
-                    message = {
-                        'type': 'speeds_data',
-                        'adapter': self.current_monitored_adapter,
-                        'data': speeds
-                    }
-                    self._send_message(message)
-                    self.speeds_received.emit(speeds)
+            # Все сессии используют одно чтение счетчиков за такт
+            for adapter_name, session in list(self.sessions.items()):
+                try:
+                    # Серверу отправляем сами счетчики
+                    sample = session.read_counters()
+                    if sample is None:
+                        continue
+                    self._send_sample(adapter_name, sample)
                     
-            except Exception as e:
-                self.error.emit(f"Ошибка мониторинга: {str(e)}")
+                    # Локальная скорость нужна только подключенному окну
+                    if self.receivers(self.speeds_received) > 0:
+                        speeds = session.get_current_speeds(sample)
+                        if speeds:
+                            self.speeds_received.emit(speeds)
+                        
+                except Exception as e:
+                    self.error.emit(f"Ошибка мониторинга: {str(e)}")
                 
-            # Пауза между измерениями
-            time.sleep(1)
+            # Пауза до следующего такта; ее прерывают остановка мониторинга
+            # и смена интервала по запросу сервера
+            while True:
+                if schedule.interval != self.interval:
+                    schedule = PeriodicSchedule(self.interval)
+                if not schedule.wait(self._monitoring_wakeup):
+                    break
+                self._monitoring_wakeup.clear()
+                if not self.is_monitoring:
+                    return
             
     def get_adapters_list(self):
         """Получение списка адаптеров
@@ -339,7 +543,8 @@ class NetworkClient(QObject):
         """Отправка информации о клиенте серверу"""
         message = {
             'type': 'client_info',
-            'pc_name': self.pc_name
+            'pc_name': self.pc_name,
+            'capabilities': list(CAPABILITIES)
         }
         self._send_message(message)
-        self.log_message.emit(f"Отправлена информация о клиенте: {self.pc_name}") 
\ No newline at end of file
+        self._log("Отправлена информация о клиенте: %s", self.pc_name) 
\ No newline at end of file
@@ -1,21 +1,29 @@
 """
 Пакет с основной логикой приложения
-""" 
 
-from src.core.network_monitor import NetworkMonitor
-from src.core.network_client import NetworkClient
-from src.core.graph_builder import GraphBuilder
-from src.core.ping_worker import PingWorker
-from src.core.traceroute_worker import TracerouteWorker
-from src.core.network_server import NetworkServer
+Классы импортируются при первом обращении, чтобы модули без
+графического интерфейса (например, ServerCore) можно было загрузить
+без PyQt6 и pyqtgraph.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'NetworkMonitor': 'src.core.network_monitor',
+    'NetworkClient': 'src.core.network_client',
+    'GraphBuilder': 'src.core.graph_builder',
+    'PingWorker': 'src.core.ping_worker',
+    'TracerouteWorker': 'src.core.traceroute_worker',
+    'NetworkServer': 'src.core.network_server',
+    'ServerCore': 'src.core.server_core',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'NetworkMonitor',
-    'NetworkClient',
-    'GraphBuilder',
-    'PingWorker',
-    'TracerouteWorker',
-    'NetworkScanner',
-    'NetworkScannerWorker',
-    'NetworkServer'
-] 
\ No newline at end of file
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,192 @@
+"""
+Кэш сведений о сетевых адаптерах.
+
+Перебор Win32_NetworkAdapter через WMI занимает сотни миллисекунд, поэтому
+описания адаптеров запрашиваются одним запросом в фоновом потоке, а
+сведения о всех адаптерах (описание, MAC, тип, скорость, MTU, адрес,
+состояние) собираются целиком и отдаются из словаря без обращения к
+системе. Кэш обновляется по расписанию и при появлении незнакомого
+адаптера; invalidate() запрашивает внеочередное обновление.
+"""
+
+import sys
+import threading
+import psutil
+
+REFRESH_INTERVAL = 10.0  # секунды между фоновыми обновлениями
+
+
+def interface_type(adapter_name):
+    """Определяет тип интерфейса по имени адаптера"""
+    name = adapter_name.lower()
+    if 'wi' in name or 'wlan' in name:
+        return 'Wi-Fi'
+    if 'bluetooth' in name:
+        return 'Bluetooth'
+    if 'vpn' in name:
+        return 'VPN'
+    if 'loopback' in name:
+        return 'Loopback'
+    return 'Ethernet'  # По умолчанию предполагаем Ethernet
+
+
+def query_descriptions():
+    """Описания всех адаптеров одним запросом WMI
+
+    Returns:
+        dict: {NetConnectionID: описание}; пустой, если WMI недоступен
+    """
+    if sys.platform != 'win32':
+        return {}
+    try:
+        # wmi есть только в Windows и загружается долго - импортируем при первом запросе
+        import wmi
+        if threading.current_thread() is not threading.main_thread():
+            # Каждому потоку, работающему с WMI, нужна своя инициализация COM
+            import pythoncom
+            pythoncom.CoInitialize()
+        connection = wmi.WMI()
+        return {
+            adapter.NetConnectionID: adapter.Name or adapter.Description
+            for adapter in connection.Win32_NetworkAdapter()
+            if adapter.NetConnectionID
+        }
+    except Exception:
+        return {}
+
+
+class AdapterMetadataCache:
+    """Сведения о всех адаптерах, обновляемые в фоне"""
+
+    def __init__(self, refresh_interval=REFRESH_INTERVAL, on_error=None):
+        """
+        Args:
+            refresh_interval: Интервал фонового обновления, секунды
+            on_error: Обработчик ошибок фонового обновления on_error(шаблон, *аргументы)
+                в стиле LogQueue.log; вызывается в фоновом потоке
+        """
+        self.refresh_interval = refresh_interval
+        self.on_error = on_error
+        self.last_error = None  # Последняя ошибка фонового обновления
+        self._info = {}  # {adapter_name: dict} - заменяется целиком при обновлении
+        self._descriptions = {}  # Описания WMI; запрашиваются заново только для новых адаптеров
+        self._refresh_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Запускает фоновое обновление (первое заполнение - сразу)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refresh_loop)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def invalidate(self):
+        """Запрашивает внеочередное обновление в фоне"""
+        self._wakeup.set()
+
+    def _refresh_loop(self):
+        """Поток фонового обновления"""
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = e
+                if self.on_error:
+                    self.on_error("Ошибка обновления сведений об адаптерах: %s", e)
+            self._wakeup.wait(self.refresh_interval)
+            self._wakeup.clear()
+
+    def refresh(self, query_wmi=True):
+        """Собирает сведения о всех адаптерах
+
+        Args:
+            query_wmi: Запрашивать описания новых адаптеров через WMI
+                (False - использовать имя адаптера до следующего обновления)
+        """
+        addresses = psutil.net_if_addrs()
+        descriptions = None
+        if query_wmi and any(name not in self._descriptions for name in addresses):
+            # Медленный запрос выполняется без блокировки, чтобы не задерживать get()
+            descriptions = query_descriptions()
+
+        with self._refresh_lock:
+            if descriptions is not None:
+                # Адаптеры без записи WMI не запрашиваем повторно
+                known = {name: descriptions.get(name) for name in addresses}
+                known.update(descriptions)
+                self._descriptions = known
+            stats = psutil.net_if_stats()
+
+            info = {}
+            for adapter_name, adapter_addresses in addresses.items():
+                adapter_info = {
+                    'id': adapter_name,  # Используем имя адаптера как ID
+                    'description': self._descriptions.get(adapter_name) or adapter_name,
+                    'interface_type': interface_type(adapter_name),
+                    'ip': '',
+                    'mac': '',
+                    'speed': '',
+                    'mtu': '',
+                    'status': ''
+                }
+                for addr in adapter_addresses:
+                    if addr.family.name == "AF_INET":
+                        adapter_info['ip'] = addr.address
+                    elif addr.family.name in ["AF_PACKET", "AF_LINK"]:
+                        adapter_info['mac'] = addr.address
+
+                adapter_stats = stats.get(adapter_name)
+                if adapter_stats:
+                    adapter_info['speed'] = f"{adapter_stats.speed} Мбит/с"
+                    adapter_info['mtu'] = f"{adapter_stats.mtu} байт"
+                    adapter_info['status'] = "Активен" if adapter_stats.isup else "Неактивен"
+                info[adapter_name] = adapter_info
+
+            self._info = info
+            self._ready.set()
+
+    def names(self):
+        """Имена адаптеров из последнего обновления"""
+        self._ensure_filled()
+        return list(self._info)
+
+    def get(self, adapter_name):
+        """Возвращает сведения об адаптере
+
+        Args:
+            adapter_name: Имя адаптера
+
+        Returns:
+            dict: Копия сведений или None, если адаптер не найден
+        """
+        self._ensure_filled()
+        info = self._info.get(adapter_name)
+        if info is None:
+            # Адаптер появился после обновления: быстро обновляем без WMI,
+            # описание дополнит фоновое обновление
+            self.refresh(query_wmi=False)
+            self.invalidate()
+            info = self._info.get(adapter_name)
+        return dict(info) if info is not None else None
+
+    def _ensure_filled(self):
+        """Заполняет кэш без WMI, если первое фоновое обновление еще не прошло"""
+        if not self._ready.is_set():
+            self.refresh(query_wmi=False)
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_adapter_cache():
+    """Общий для процесса кэш сведений об адаптерах (окно, сервер и агент
+    используют один фоновый поток)"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = AdapterMetadataCache()
+            _shared_cache.start()
+        return _shared_cache
@@ -0,0 +1,170 @@
+"""
+Отслеживание изменений набора сетевых адаптеров.
+
+На Linux поток наблюдения ждет уведомлений ядра об изменении
+интерфейсов (netlink, группа RTMGRP_LINK) и только после уведомления
+сравнивает состояние адаптеров с предыдущим. На остальных системах
+состояние сравнивается периодически. О каждом изменении сообщается
+событием: ADAPTER_ADDED, ADAPTER_REMOVED, ADAPTER_UP или ADAPTER_DOWN.
+"""
+
+import socket
+import threading
+import psutil
+
+ADAPTER_ADDED = 'added'
+ADAPTER_REMOVED = 'removed'
+ADAPTER_UP = 'up'
+ADAPTER_DOWN = 'down'
+ADAPTER_EVENTS = (ADAPTER_ADDED, ADAPTER_REMOVED, ADAPTER_UP, ADAPTER_DOWN)
+
+POLL_INTERVAL = 2.0  # секунды между проверками без netlink
+NETLINK_ROUTE = 0
+RTMGRP_LINK = 1
+
+
+def adapter_states():
+    """Текущее состояние адаптеров
+
+    Returns:
+        dict: {adapter_name: True, если адаптер включен}
+    """
+    states = {name: False for name in psutil.net_if_addrs()}
+    for name, stats in psutil.net_if_stats().items():
+        states[name] = stats.isup
+    return states
+
+
+def diff_states(old, new):
+    """События, переводящие состояние old в new
+
+    Returns:
+        list: Пары (событие, имя адаптера)
+    """
+    events = []
+    for name in old:
+        if name not in new:
+            events.append((ADAPTER_REMOVED, name))
+    for name, is_up in new.items():
+        if name not in old:
+            events.append((ADAPTER_ADDED, name))
+            if is_up:
+                events.append((ADAPTER_UP, name))
+        elif is_up != old[name]:
+            events.append((ADAPTER_UP if is_up else ADAPTER_DOWN, name))
+    return events
+
+
+def _open_netlink():
+    """Сокет уведомлений об изменении интерфейсов или None, если netlink недоступен"""
+    if not hasattr(socket, 'AF_NETLINK'):
+        return None
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        sock.bind((0, RTMGRP_LINK))
+        return sock
+    except OSError:
+        return None
+
+
+class AdapterWatcher:
+    """Поток наблюдения за адаптерами"""
+
+    def __init__(self, callback, poll_interval=POLL_INTERVAL, on_error=None):
+        """
+        Args:
+            callback: Обработчик callback(событие, имя адаптера); вызывается
+                в потоке наблюдения
+            poll_interval: Интервал проверки без netlink, секунды
+            on_error: Обработчик ошибок on_error(шаблон, *аргументы) в стиле
+                LogQueue.log; вызывается в потоке наблюдения
+        """
+        self.callback = callback
+        self.on_error = on_error
+        self.poll_interval = poll_interval
+        self.states = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._netlink = None
+
+    @property
+    def uses_netlink(self):
+        return self._netlink is not None
+
+    def start(self):
+        """Запоминает текущее состояние и начинает наблюдение"""
+        if self._thread is not None:
+            return
+        self.states = adapter_states()
+        self._stop_event.clear()
+        self._netlink = _open_netlink()
+        if self._netlink is not None:
+            # Таймаут нужен, чтобы поток замечал остановку
+            self._netlink.settimeout(self.poll_interval)
+        self._thread = threading.Thread(target=self._watch_loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Останавливает наблюдение
+
+        Поток не ожидается: он завершится и закроет сокет netlink после
+        очередного таймаута, не задерживая вызывающий поток.
+        """
+        self._stop_event.set()
+        self._thread = None
+        self._netlink = None
+
+    def _watch_loop(self):
+        """Ожидание изменений и рассылка событий"""
+        netlink = self._netlink
+        try:
+            self._watch(netlink)
+        finally:
+            if netlink is not None:
+                netlink.close()
+
+    def _watch(self, netlink):
+        """Цикл наблюдения до остановки"""
+        while not self._stop_event.is_set():
+            if netlink is not None:
+                try:
+                    netlink.recv(65536)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    # Уведомления недоступны - переходим к периодической проверке
+                    netlink = None
+                    continue
+                # Уведомления приходят пачкой - разбираем все накопившиеся
+                netlink.setblocking(False)
+                try:
+                    while True:
+                        netlink.recv(65536)
+                except OSError:
+                    pass
+                netlink.settimeout(self.poll_interval)
+            elif self._stop_event.wait(self.poll_interval):
+                break
+            if not self._stop_event.is_set():
+                self.check()
+
+    def check(self):
+        """Сравнивает состояние адаптеров с предыдущим и сообщает об изменениях"""
+        try:
+            states = adapter_states()
+        except Exception as e:
+            self._report_error("Ошибка чтения состояния адаптеров: %s", e)
+            return
+        events = diff_states(self.states, states)
+        self.states = states
+        for event, adapter_name in events:
+            try:
+                self.callback(event, adapter_name)
+            except Exception as e:
+                self._report_error("Ошибка в обработчике изменения адаптера %s: %s", adapter_name, e)
+
+    def _report_error(self, message, *args):
+        """Передает ошибку обработчику on_error, если он назначен"""
+        if self.on_error:
+            self.on_error(message, *args)
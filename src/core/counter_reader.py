@@ -0,0 +1,137 @@
+"""
+Чтение счетчиков сетевых адаптеров.
+
+psutil.net_io_counters(pernic=True) при каждом вызове разбирает весь
+/proc/net/dev и создает namedtuple для каждого интерфейса. На Linux
+ProcNetDevReader держит файл открытым, читает его через preadv() в один
+заранее выделенный буфер и разбирает только строки запрошенных
+адаптеров. На остальных системах используется psutil.
+"""
+
+import os
+import psutil
+
+PROC_NET_DEV = '/proc/net/dev'
+INITIAL_BUFFER_SIZE = 16 * 1024
+
+# Номера колонок /proc/net/dev для полей protocol.COUNTER_FIELDS: 8 колонок приема
+# (bytes packets errs drop fifo frame compressed multicast) и 8 колонок отправки
+_PROC_COLUMNS = (0, 8, 1, 9, 2, 10, 3, 11)
+
+
+class PsutilCounterReader:
+    """Чтение счетчиков через psutil (любая система)"""
+
+    def read(self, adapter_names):
+        """Читает счетчики адаптеров
+
+        Args:
+            adapter_names: Имена адаптеров
+
+        Returns:
+            dict: {adapter_name: счетчики в порядке COUNTER_FIELDS} для
+                найденных адаптеров
+        """
+        net_io = psutil.net_io_counters(pernic=True)
+        result = {}
+        for adapter_name in adapter_names:
+            adapter_io = net_io.get(adapter_name)
+            if adapter_io is not None:
+                result[adapter_name] = (
+                    adapter_io.bytes_recv, adapter_io.bytes_sent,
+                    adapter_io.packets_recv, adapter_io.packets_sent,
+                    adapter_io.errin, adapter_io.errout,
+                    adapter_io.dropin, adapter_io.dropout
+                )
+        return result
+
+    def close(self):
+        pass
+
+
+class ProcNetDevReader:
+    """Чтение счетчиков из /proc/net/dev без повторного открытия файла (Linux)"""
+
+    def __init__(self, path=PROC_NET_DEV):
+        """
+        Args:
+            path: Путь к файлу статистики интерфейсов
+
+        Raises:
+            OSError: Файл недоступен
+        """
+        self._fd = None
+        self._fd = os.open(path, os.O_RDONLY)
+        self._buffer = bytearray(INITIAL_BUFFER_SIZE)
+        self._length = 0
+
+    def _fill(self):
+        """Читает файл целиком в буфер, при необходимости увеличивая его"""
+        total = 0
+        while True:
+            view = memoryview(self._buffer)[total:]
+            received = os.preadv(self._fd, [view], total)
+            view.release()
+            if received == 0:
+                break
+            total += received
+            if total == len(self._buffer):
+                self._buffer.extend(bytes(len(self._buffer)))
+        self._length = total
+
+    def read(self, adapter_names):
+        """Читает счетчики адаптеров
+
+        Args:
+            adapter_names: Имена адаптеров
+
+        Returns:
+            dict: {adapter_name: счетчики в порядке COUNTER_FIELDS} для
+                найденных адаптеров
+        """
+        self._fill()
+        buffer = self._buffer
+        length = self._length
+        result = {}
+        for adapter_name in adapter_names:
+            # Имя выровнено пробелами по правому краю и заканчивается двоеточием
+            key = b' ' + adapter_name.encode() + b':'
+            start = buffer.find(key, 0, length)
+            if start < 0:
+                key = b'\n' + key[1:]
+                start = buffer.find(key, 0, length)
+                if start < 0:
+                    continue
+            start += len(key)
+            end = buffer.find(b'\n', start, length)
+            if end < 0:
+                end = length
+            columns = buffer[start:end].split()
+            result[adapter_name] = tuple(int(columns[index]) for index in _PROC_COLUMNS)
+        return result
+
+    def close(self):
+        """Закрывает файл"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self):
+        self.close()
+
+
+def create_counter_reader():
+    """Создает самый быстрый доступный способ чтения счетчиков
+
+    Returns:
+        ProcNetDevReader на Linux, иначе PsutilCounterReader
+    """
+    if hasattr(os, 'preadv'):
+        try:
+            reader = ProcNetDevReader()
+            reader.read(())
+            return reader
+        except OSError:
+            pass
+    return PsutilCounterReader()
+
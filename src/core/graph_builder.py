@@ -1,16 +1,25 @@
-from PyQt6.QtWidgets import QVBoxLayout
 import pyqtgraph as pg
-from pyqtgraph import mkPen
+import numpy as np
 import traceback
-import sys
+from src.core.ring_buffer import DEFAULT_CAPACITY, RingBuffer
+from src.core.rollup import RollupSeries
+
+ROLLUP_ROWS = 6  # Рядов значений уровня: среднее, минимум и максимум для загрузки и отдачи
+
 
 class GraphBuilder:
     def __init__(self, graph_widget):
         try:
             self.graph = graph_widget
             self.configure_graph()
-            self.time_axis = []
-            self.max_points = 60
+            self.max_points = DEFAULT_CAPACITY
+
+            # Заранее выделенные массивы оси X: обновление графика не создает массивов
+            self._index_axis = np.arange(self.max_points, dtype=np.float64)  # номера точек
+            self._time_buffer = np.empty(self.max_points, dtype=np.float64)  # время уровней RollupSeries
+            # Значения уровней: средние, минимумы, максимумы загрузки, затем отдачи
+            self._value_buffer = np.empty((ROLLUP_ROWS, self.max_points), dtype=np.float64)
+            self.time_axis = self._index_axis[:0]
             
             # Определяем цвета
             self.download_color = (0, 100, 255)  # Синий
@@ -20,26 +29,55 @@ class GraphBuilder:
             self.download_pen = pg.mkPen(color=self.download_color, width=2)
             self.upload_pen = pg.mkPen(color=self.upload_color, width=2)
             
-            # Проверяем, что виджет графика правильного типа
-            print(f"Тип виджета графика: {type(self.graph)}")
-            
-            # Создаем кривые
-            self.download_curve = self.graph.plot(pen=self.download_pen, name='Загрузка')
-            self.upload_curve = self.graph.plot(pen=self.upload_pen, name='Отдача')
+            # Создаем кривые. Данные всегда конечны, поэтому проверка на
+            # NaN/inf не нужна; вне видимой области точки не рисуются, а
+            # при плотных данных pyqtgraph прореживает их до ширины экрана
+            curve_options = dict(
+                skipFiniteCheck=True,
+                clipToView=True,
+                autoDownsample=True,
+                downsampleMethod='peak'
+            )
+            self.download_curve = self.graph.plot(pen=self.download_pen, name='Загрузка', **curve_options)
+            self.upload_curve = self.graph.plot(pen=self.upload_pen, name='Отдача', **curve_options)
+
+            # Полоса минимум-максимум для уровней агрегации: среднее сглаживает
+            # кратковременные пики, а полоса их сохраняет
+            self.download_band = self._create_band(self.download_color)
+            self.upload_band = self._create_band(self.upload_color)
+            self._band_shown = False
             
             # Состояние видимости
             self.download_visible = True
             self.upload_visible = True
 
             # Данные для графиков
-            self.download_speeds = []
-            self.upload_speeds = []
+            self.download_speeds = RingBuffer(self.max_points)
+            self.upload_speeds = RingBuffer(self.max_points)
+
+            # Многоуровневые ряды (RollupSeries) и отображаемый уровень
+            self._series = None
+            self._tier_index = None
+            self.graph.getViewBox().sigXRangeChanged.connect(self._on_x_range_changed)
             
             print("GraphBuilder успешно инициализирован")
         except Exception as e:
             print(f"ОШИБКА при инициализации GraphBuilder: {e}")
             traceback.print_exc()
 
+    def _create_band(self, color):
+        """Создает заливку между кривыми минимума и максимума
+
+        Returns:
+            tuple: (кривая минимума, кривая максимума, заливка)
+        """
+        min_curve = pg.PlotCurveItem(pen=None, skipFiniteCheck=True)
+        max_curve = pg.PlotCurveItem(pen=None, skipFiniteCheck=True)
+        fill = pg.FillBetweenItem(min_curve, max_curve, brush=pg.mkBrush(*color, 50))
+        fill.setZValue(-1)  # Под линиями средних
+        self.graph.addItem(fill)
+        return min_curve, max_curve, fill
+
     def configure_graph(self):
         """Настройка графика"""
         try:
@@ -56,73 +94,193 @@ class GraphBuilder:
             traceback.print_exc()
 
     def update_graph(self, download_speeds, upload_speeds):
-        """Обновление графика"""
+        """Обновление графика
+
+        Args:
+            download_speeds: Скорости загрузки (RingBuffer, RollupSeries,
+                массив или одно значение для добавления к ряду графика)
+            upload_speeds: Скорости отдачи того же вида
+        """
         try:
-            print(f"Вызван update_graph с данными:")
-            if isinstance(download_speeds, list):
-                print(f"download_speeds: {download_speeds[:5]}... (всего {len(download_speeds)} точек)")
-            else:
-                print(f"download_speeds: {download_speeds} (тип: {type(download_speeds)})")
-            
-            if isinstance(upload_speeds, list):
-                print(f"upload_speeds: {upload_speeds[:5]}... (всего {len(upload_speeds)} точек)")
-            else:
-                print(f"upload_speeds: {upload_speeds} (тип: {type(upload_speeds)})")
-            
-            # Если передано одно значение, а не список - добавляем его к существующим данным
-            if not isinstance(download_speeds, list) and not isinstance(upload_speeds, list):
+            # Для многоуровневых рядов отображается уровень под видимый интервал
+            if isinstance(download_speeds, RollupSeries) and isinstance(upload_speeds, RollupSeries):
+                self._series = (download_speeds, upload_speeds)
+                self._render_rollup()
+                return
+            self._series = None
+            self._tier_index = None
+            self._clear_bands()
+
+            # Если передано одно значение, а не ряд - добавляем его к существующим данным
+            if np.isscalar(download_speeds) and np.isscalar(upload_speeds):
                 self.download_speeds.append(download_speeds)
                 self.upload_speeds.append(upload_speeds)
-                
-                # Ограничиваем размер списков
-                if len(self.download_speeds) > self.max_points:
-                    self.download_speeds.pop(0)
-                    self.upload_speeds.pop(0)
-                    
                 download_speeds = self.download_speeds
                 upload_speeds = self.upload_speeds
-            
-            if not download_speeds or not upload_speeds:
-                print("Нет данных для обновления графика")
+
+            # Кольцевые буферы отдают данные без копирования
+            download_speeds = self._as_array(download_speeds)
+            upload_speeds = self._as_array(upload_speeds)
+
+            count = min(len(download_speeds), len(upload_speeds))
+            if not count:
                 return
-                
-            # Обновляем временную ось
-            self.time_axis = list(range(len(download_speeds)))
-            print(f"Временная ось: {self.time_axis[:5]}... (всего {len(self.time_axis)} точек)")
-            
-            # Обновляем кривые если они видимы
-            if self.download_visible:
-                print("Обновляем кривую загрузки")
-                self.download_curve.setData(self.time_axis, download_speeds)
-                
-            if self.upload_visible:
-                print("Обновляем кривую отдачи")
-                self.upload_curve.setData(self.time_axis, upload_speeds)
-                
-            print("График успешно обновлен")
+
+            # Ось X - номер точки, берем срез заранее подготовленного массива
+            self._reserve(count)
+            self.time_axis = self._index_axis[:count]
+            self._set_curves(self.time_axis, download_speeds[-count:], upload_speeds[-count:])
         except Exception as e:
             print(f"ОШИБКА при обновлении графика: {e}")
             traceback.print_exc()
 
+    @staticmethod
+    def _as_array(values):
+        """Данные ряда в виде массива NumPy (без копирования, если возможно)"""
+        if isinstance(values, RingBuffer):
+            return values.view()
+        return np.asarray(values, dtype=np.float64)
+
+    def _reserve(self, count):
+        """Увеличивает массивы оси X, если точек больше, чем помещается в них"""
+        if count <= len(self._index_axis):
+            return
+        size = max(count, 2 * len(self._index_axis))
+        self._index_axis = np.arange(size, dtype=np.float64)
+        self._time_buffer = np.empty(size, dtype=np.float64)
+        self._value_buffer = np.empty((ROLLUP_ROWS, size), dtype=np.float64)
+
+    def _set_curves(self, x, download, upload):
+        """Передача данных видимым кривым"""
+        if self.download_visible:
+            self.download_curve.setData(x, download)
+        if self.upload_visible:
+            self.upload_curve.setData(x, upload)
+
+    def _visible_range(self, series):
+        """Интервал времени ряда, который будет виден на графике
+
+        Returns:
+            tuple: (начало, конец) в секундах в шкале времени ряда
+        """
+        view_box = self.graph.getViewBox()
+        if view_box.state['autoRange'][0] is not False:
+            # При автомасштабе виден весь ряд
+            return series.start_time, series.raw.times.last(series.start_time)
+        x_min, x_max = view_box.viewRange()[0]
+        return series.start_time + x_min, series.start_time + x_max
+
+    def _render_rollup(self):
+        """Отображение уровня многоуровневых рядов, подходящего к видимому интервалу"""
+        download_series, upload_series = self._series
+        if download_series.start_time is None:
+            return
+
+        tier = download_series.tier_for_range(*self._visible_range(download_series))
+        self._tier_index = download_series.tiers.index(tier)
+        upload_tier = upload_series.tiers[self._tier_index]
+
+        times = tier.times.view()
+        count = min(len(times), len(upload_tier))
+        # Последней точкой идет текущий, еще не завершенный интервал уровня
+        download_partial = tier.partial()
+        upload_partial = upload_tier.partial()
+        partial = download_partial is not None and upload_partial is not None
+        total = count + partial
+        if not total:
+            return
+
+        # Завершенные интервалы и незавершенный записываются в заранее
+        # выделенные массивы, без выделения памяти на каждый кадр
+        self._reserve(total)
+        self.time_axis = self._time_buffer[:total]
+        values = self._value_buffer[:, :total]
+
+        # Точка агрегата ставится в середину его интервала
+        origin = download_series.start_time - tier.resolution / 2
+        start = len(times) - count
+        upload_start = len(upload_tier) - count
+        np.subtract(times[start:], origin, out=self.time_axis[:count])
+        rings = (tier.avgs, tier.mins, tier.maxs, upload_tier.avgs, upload_tier.mins, upload_tier.maxs)
+        for row, ring in enumerate(rings):
+            values[row, :count] = ring.view()[start if row < 3 else upload_start:]
+
+        if partial:
+            # Середина незавершенного интервала может быть в будущем - ставим не позже последнего образца
+            last_time = download_series.raw.times.last(download_partial[0])
+            self.time_axis[count] = min(download_partial[0], last_time - tier.resolution / 2) - origin
+            values[:, count] = (download_partial[3], download_partial[1], download_partial[2],
+                                upload_partial[3], upload_partial[1], upload_partial[2])
+
+        self._set_curves(self.time_axis, values[0], values[3])
+        if tier.resolution:
+            self._set_bands(self.time_axis, values[1:3], values[4:6])
+        else:
+            self._clear_bands()
+
+    def _set_bands(self, x, download, upload):
+        """Передача минимумов и максимумов полосам
+
+        Args:
+            x: Ось X
+            download: (минимумы, максимумы) загрузки
+            upload: (минимумы, максимумы) отдачи
+        """
+        for band, (low, high), visible in ((self.download_band, download, self.download_visible),
+                                           (self.upload_band, upload, self.upload_visible)):
+            if visible:
+                band[0].setData(x, low)
+                band[1].setData(x, high)
+        self._band_shown = True
+
+    def _clear_bands(self):
+        """Удаление полос минимум-максимум (для исходных образцов они не нужны)"""
+        if not self._band_shown:
+            return
+        for band in (self.download_band, self.upload_band):
+            band[0].setData([], [])
+            band[1].setData([], [])
+        self._band_shown = False
+
+    def _on_x_range_changed(self, *args):
+        """Смена уровня детализации при масштабировании графика"""
+        if self._series is None:
+            return
+        download_series = self._series[0]
+        if download_series.start_time is None:
+            return
+        tier = download_series.tier_for_range(*self._visible_range(download_series))
+        if download_series.tiers.index(tier) != self._tier_index:
+            self._render_rollup()
+
     def set_download_visible(self, visible):
         """Установка видимости кривой загрузки"""
         self.download_visible = visible
         self.download_curve.setVisible(visible)
+        self.download_band[2].setVisible(visible)
+        if visible and self._series is not None:
+            self._render_rollup()
 
     def set_upload_visible(self, visible):
         """Установка видимости кривой отдачи"""
         self.upload_visible = visible
         self.upload_curve.setVisible(visible)
+        self.upload_band[2].setVisible(visible)
+        if visible and self._series is not None:
+            self._render_rollup()
 
     def clear_graphs(self):
         """Очистка графиков"""
         try:
-            self.download_speeds = []
-            self.upload_speeds = []
-            self.time_axis = []
+            self.download_speeds.clear()
+            self.upload_speeds.clear()
+            self._series = None
+            self._tier_index = None
+            self.time_axis = self._index_axis[:0]
             self.download_curve.setData([], [])
             self.upload_curve.setData([], [])
-            print("Графики очищены")
+            self._band_shown = True
+            self._clear_bands()
         except Exception as e:
             print(f"ОШИБКА при очистке графиков: {e}")
             traceback.print_exc() 
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Очередь сообщений лога.
+
+Сообщения лога возникают в потоках сервера и агента на каждый пакет,
+поэтому они не передаются в интерфейс по одному. log() только добавляет
+запись в ограниченную очередь (collections.deque с maxlen: добавление и
+извлечение атомарны и не требуют блокировки), а потребитель - окно или
+фоновый сервер - периодически забирает накопившиеся записи пачкой через
+drain(). Сообщение форматируется только при извлечении, а сообщения ниже
+текущего уровня отбрасываются до форматирования. При переполнении
+теряются самые старые записи; drain() сообщает, сколько их было.
+"""
+
+import time
+from collections import deque
+
+# Уровни совпадают с уровнями модуля logging
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+
+DEFAULT_CAPACITY = 10000  # Записей в очереди до вытеснения старых
+
+
+class LogQueue:
+    """Ограниченная очередь записей лога с отложенным форматированием"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, level=INFO):
+        """
+        Args:
+            capacity: Максимальное количество записей в очереди
+            level: Минимальный уровень сохраняемых сообщений
+        """
+        self.level = level
+        self._records = deque(maxlen=capacity)
+        self._dropped = 0  # Вытеснено записей с последнего drain() (без блокировки - приблизительно)
+
+    def is_enabled(self, level):
+        """Проверяет, сохраняются ли сообщения уровня level"""
+        return level >= self.level
+
+    def log(self, level, message, *args):
+        """Добавляет сообщение в очередь
+
+        Args:
+            level: Уровень сообщения (DEBUG, INFO, WARNING, ERROR)
+            message: Текст или шаблон в стиле '%s' (если переданы args)
+            *args: Аргументы шаблона; подставляются только при извлечении
+        """
+        if level < self.level:
+            return
+        records = self._records
+        if len(records) == records.maxlen:
+            self._dropped += 1
+        records.append((time.time(), level, message, args))
+
+    def drain(self, limit=None):
+        """Забирает накопившиеся записи
+
+        Args:
+            limit: Максимальное количество записей (None - все)
+
+        Returns:
+            list: Кортежи (время, уровень, текст) в порядке добавления;
+                если записи были вытеснены, первым идет сообщение об этом
+        """
+        records = self._records
+        result = []
+        dropped, self._dropped = self._dropped, 0
+        if dropped:
+            result.append((time.time(), WARNING, f"Пропущено сообщений лога: {dropped}"))
+
+        count = len(records) if limit is None else min(limit, len(records))
+        for _ in range(count):
+            try:
+                timestamp, level, message, args = records.popleft()
+            except IndexError:
+                break
+            result.append((timestamp, level, self._format(message, args)))
+        return result
+
+    def __len__(self):
+        return len(self._records)
+
+    @staticmethod
+    def _format(message, args):
+        """Подставляет аргументы в шаблон сообщения"""
+        if not args:
+            return str(message)
+        try:
+            return message % args
+        except Exception:
+            return f"{message} {args}"
@@ -0,0 +1,280 @@
+"""
+Хранилище измерений скорости на диске.
+
+Используется SQLite в режиме WAL: запись идет пакетами из отдельного
+потока, поэтому прием данных от клиентов не ждет диска, а чтение
+истории не блокирует запись. Образцы хранятся в таблице, упорядоченной
+по (ряд, время), что делает выборку диапазона времени дешевой.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0  # секунды
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    client TEXT NOT NULL,
+    adapter TEXT NOT NULL,
+    UNIQUE (client, adapter)
+);
+CREATE TABLE IF NOT EXISTS samples (
+    series_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    download REAL NOT NULL,
+    upload REAL NOT NULL,
+    PRIMARY KEY (series_id, ts)
+) WITHOUT ROWID;
+"""
+
+_FLUSH = object()  # Маркер принудительной записи
+_STOP = object()   # Маркер остановки потока записи
+
+
+def default_store_path():
+    """Путь к хранилищу по умолчанию в домашнем каталоге пользователя"""
+    return os.path.join(os.path.expanduser('~'), '.network_monitor', 'measurements.db')
+
+
+class MeasurementStore:
+    """Хранилище временных рядов скорости по клиентам и адаптерам"""
+
+    def __init__(self, path=None, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, retention=None, on_error=None):
+        """
+        Args:
+            path: Путь к файлу базы данных (по умолчанию default_store_path())
+            batch_size: Количество образцов, после которого пакет записывается сразу
+            flush_interval: Максимальная задержка записи пакета, секунды
+            retention: Срок хранения образцов в секундах (None - хранить всегда)
+            on_error: Обработчик ошибок записи on_error(исключение); вызывается
+                в потоке записи
+        """
+        self.path = path or default_store_path()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention = retention
+        self.on_error = on_error
+        self._queue = queue.SimpleQueue()
+        self._writer_thread = None
+        self._series_ids = {}  # {(client, adapter): series_id}, используется потоком записи
+        self.last_error = None  # Последняя ошибка записи
+
+    @property
+    def is_open(self):
+        return self._writer_thread is not None and self._writer_thread.is_alive()
+
+    def open(self):
+        """Создает базу данных при необходимости и запускает поток записи"""
+        if self.is_open:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Схему создаем синхронно, чтобы ошибки открытия были видны сразу
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            connection.commit()
+        finally:
+            connection.close()
+
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="MeasurementStoreWriter")
+        self._writer_thread.daemon = True
+        self._writer_thread.start()
+
+    def close(self):
+        """Записывает накопленные образцы и останавливает поток записи"""
+        if not self._writer_thread:
+            return
+        self._queue.put(_STOP)
+        self._writer_thread.join(10.0)
+        self._writer_thread = None
+
+    def append(self, client, adapter, download, upload, timestamp=None):
+        """Добавляет образец в очередь записи (не блокирует вызывающий поток)
+
+        Args:
+            client: Идентификатор клиента
+            adapter: Имя адаптера
+            download: Скорость загрузки, КБ/с
+            upload: Скорость отдачи, КБ/с
+            timestamp: Время образца (UNIX time), по умолчанию текущее
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        self._queue.put((client, adapter, timestamp, download, upload))
+
+    def extend(self, client, adapter, samples):
+        """Добавляет несколько образцов ряда одним элементом очереди
+
+        Args:
+            client: Идентификатор клиента
+            adapter: Имя адаптера
+            samples: Кортежи (timestamp, download, upload)
+        """
+        rows = [(client, adapter, timestamp, download, upload) for timestamp, download, upload in samples]
+        if rows:
+            self._queue.put(rows)
+
+    def flush(self):
+        """Просит поток записи немедленно записать накопленные образцы"""
+        self._queue.put(_FLUSH)
+
+    def query(self, client, adapter, start=None, end=None):
+        """Выборка образцов ряда за интервал времени
+
+        Args:
+            client: Идентификатор клиента
+            adapter: Имя адаптера
+            start: Начало интервала (UNIX time), None - с начала
+            end: Конец интервала (UNIX time), None - до конца
+
+        Returns:
+            list: Кортежи (timestamp, download, upload) по возрастанию времени;
+                пустой, если хранилище еще не создано
+        """
+        connection = self._connect_reader()
+        if connection is None:
+            return []
+        try:
+            return connection.execute(
+                "SELECT s.ts, s.download, s.upload FROM samples s"
+                " JOIN series r ON r.id = s.series_id"
+                " WHERE r.client = ? AND r.adapter = ? AND s.ts >= ? AND s.ts <= ?"
+                " ORDER BY s.ts",
+                (client, adapter,
+                 float('-inf') if start is None else start,
+                 float('inf') if end is None else end)
+            ).fetchall()
+        finally:
+            connection.close()
+
+    def list_series(self):
+        """Список сохраненных рядов
+
+        Returns:
+            list: Кортежи (client, adapter); пустой, если хранилище еще не создано
+        """
+        connection = self._connect_reader()
+        if connection is None:
+            return []
+        try:
+            return connection.execute("SELECT client, adapter FROM series ORDER BY client, adapter").fetchall()
+        finally:
+            connection.close()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30.0)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _connect_reader(self):
+        """Соединение для чтения или None, если базы данных или ее таблиц нет
+
+        Хранилище создается только open(): чтение до запуска сервера не
+        должно создавать пустой файл.
+        """
+        if not os.path.exists(self.path):
+            return None
+        connection = self._connect()
+        exists = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'samples'"
+        ).fetchone()
+        if not exists:
+            connection.close()
+            return None
+        return connection
+
+    def _writer_loop(self):
+        """Поток записи: собирает образцы в пакеты и пишет одной транзакцией
+
+        Ошибка записи (база заблокирована дольше таймаута, диск заполнен)
+        не останавливает поток: пакет теряется, соединение открывается
+        заново перед следующей записью.
+        """
+        connection = None
+        batch = []
+        deadline = None
+        last_prune = 0.0
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = _FLUSH
+
+            if item is not _FLUSH and item is not _STOP:
+                if isinstance(item, list):
+                    batch.extend(item)
+                else:
+                    batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            try:
+                if connection is None:
+                    connection = self._connect()
+                if batch:
+                    self._write_batch(connection, batch)
+                if self.retention and time.monotonic() - last_prune > 3600:
+                    last_prune = time.monotonic()
+                    self._prune(connection)
+            except sqlite3.Error as e:
+                self._report_error(e)
+                if connection is not None:
+                    connection.close()
+                    connection = None
+            batch = []
+            deadline = None
+
+            if item is _STOP:
+                break
+        if connection is not None:
+            connection.close()
+
+    def _report_error(self, error):
+        """Сохраняет ошибку записи и передает ее обработчику"""
+        self.last_error = error
+        # Откаченная транзакция могла отменить и добавление рядов
+        self._series_ids = {}
+        if self.on_error:
+            try:
+                self.on_error(error)
+            except Exception:
+                pass
+
+    def _write_batch(self, connection, batch):
+        rows = [
+            (self._series_id(connection, client, adapter), timestamp, download, upload)
+            for client, adapter, timestamp, download, upload in batch
+        ]
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO samples (series_id, ts, download, upload) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def _series_id(self, connection, client, adapter):
+        key = (client, adapter)
+        series_id = self._series_ids.get(key)
+        if series_id is None:
+            connection.execute("INSERT OR IGNORE INTO series (client, adapter) VALUES (?, ?)", key)
+            series_id = connection.execute(
+                "SELECT id FROM series WHERE client = ? AND adapter = ?", key
+            ).fetchone()[0]
+            self._series_ids[key] = series_id
+        return series_id
+
+    def _prune(self, connection):
+        with connection:
+            connection.execute("DELETE FROM samples WHERE ts < ?", (time.time() - self.retention,))
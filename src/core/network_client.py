@@ -1,22 +1,47 @@
+import itertools
 import socket
-import json
-from typing import Optional, Dict, Any
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, Dict, Any, List
+from src.core.protocol import MessageReader, decode_payload, encode_message
+from src.core.ring_buffer import DEFAULT_CAPACITY, RingBuffer
 
 class NetworkClient:
-    def __init__(self, host: str, port: int = 5000):
-        self.download_speeds = []
-        self.upload_speeds = []
+    def __init__(self, host: str, port: int = 5000, history_capacity: int = DEFAULT_CAPACITY):
+        self.download_speeds = RingBuffer(history_capacity)
+        self.upload_speeds = RingBuffer(history_capacity)
         self.host = host
         self.port = port
         self.socket: Optional[socket.socket] = None
+        self.reader: Optional[MessageReader] = None
         self.connected = False
+        self.response_timeout = 10.0  # Время ожидания ответа на команду, секунды
+        self.on_speeds: Optional[Callable[[dict], None]] = None  # Обработчик скорости от сервера
+        # Ожидающие ответа запросы {id: Future}; ответы сопоставляются по id,
+        # поэтому несколько запросов могут выполняться одновременно
+        self._pending: "OrderedDict[int, Future]" = OrderedDict()
+        self._pending_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._reader_thread: Optional[threading.Thread] = None
 
     def connect(self) -> bool:
         """Подключается к серверу"""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.connect((self.host, self.port))
+            # Короткие команды отправляются подряд без ожидания ответа -
+            # отключаем алгоритм Нейгла, чтобы они не задерживались
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.reader = MessageReader(self.socket)
             self.connected = True
+
+            # Все входящие сообщения читает отдельный поток: ответы на команды
+            # передаются ожидающим запросам, а скорость от подписки - в on_speeds
+            self._reader_thread = threading.Thread(target=self._reader_loop, args=(self.reader,))
+            self._reader_thread.daemon = True
+            self._reader_thread.start()
             return True
         except Exception as e:
             print(f"Ошибка подключения к серверу: {e}")
@@ -25,30 +50,136 @@ class NetworkClient:
     def disconnect(self):
         """Отключается от сервера"""
         if self.socket:
+            self.connected = False
+            try:
+                # Будим поток чтения, ожидающий данных
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
             self.socket.close()
             self.socket = None
+            self.reader = None
+            if self._reader_thread and self._reader_thread is not threading.current_thread():
+                self._reader_thread.join(1.0)
+            self._reader_thread = None
+
+    def _reader_loop(self, reader: MessageReader):
+        """Поток чтения сообщений сервера"""
+        try:
+            while True:
+                payload = reader.read_message()
+                if payload is None:
+                    break
+                message = decode_payload(payload)
+                if isinstance(message, dict) and message.get('type') == 'speeds_update':
+                    callback = self.on_speeds
+                    if callback:
+                        try:
+                            callback(self._speeds_from_message(message))
+                        except Exception as e:
+                            print(f"Ошибка в обработчике данных о скорости: {e}")
+                else:
+                    self._resolve(message)
+        except Exception as e:
+            if self.connected:
+                print(f"Ошибка при чтении данных сервера: {e}")
+        finally:
+            if self.connected:
+                print("Соединение с сервером закрыто")
             self.connected = False
+            # Разблокируем запросы, ожидающие ответа
+            with self._pending_lock:
+                pending, self._pending = self._pending, OrderedDict()
+            for future in pending.values():
+                future.set_result(None)
 
-    def _send_command(self, command: dict) -> Optional[dict]:
-        """Отправляет команду серверу и получает ответ"""
+    def _resolve(self, message):
+        """Передает ответ запросу с тем же id
+
+        Сервер без поддержки id отвечает по порядку, поэтому ответ без id
+        достается самому старому ожидающему запросу.
+        """
+        request_id = message.get('id') if isinstance(message, dict) else None
+        with self._pending_lock:
+            if request_id is not None:
+                future = self._pending.pop(request_id, None)
+            elif self._pending:
+                _, future = self._pending.popitem(last=False)
+            else:
+                future = None
+        if future is None:
+            print(f"Ответ сервера без ожидающего запроса: {message}")
+            return
+        future.set_result(message)
+
+    @staticmethod
+    def _speeds_from_message(message: dict) -> dict:
+        """Данные о скорости из сообщения speeds или speeds_update"""
+        speeds = message.get('speeds', {})
+        speeds['time'] = message.get('time', '-')
+        return speeds
+
+    def send_request(self, command: dict) -> Optional[Future]:
+        """Отправляет команду, не дожидаясь ответа
+
+        Команде назначается id, по которому сервер помечает ответ.
+        Можно отправить несколько команд подряд и затем ждать ответы:
+        все запросы выполняются за одно время приема-передачи.
+
+        Returns:
+            Future: Ответ сервера (None при разрыве соединения) или None,
+                если команду не удалось отправить
+        """
         if not self.connected:
             print("Не подключено к серверу")
             return None
 
+        future = Future()
+        request_id = next(self._request_ids)
+        with self._pending_lock:
+            self._pending[request_id] = future
         try:
-            # Отправляем команду
-            self.socket.send(json.dumps(command).encode('utf-8'))
-            
-            # Получаем ответ
-            response = self.socket.recv(1024).decode('utf-8')
-            if not response:
-                return None
-                
-            return json.loads(response)
+            with self._send_lock:
+                self.socket.sendall(encode_message(dict(command, id=request_id)))
+            return future
         except Exception as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
             print(f"Ошибка при отправке команды: {e}")
             return None
 
+    def _wait_response(self, future: Optional[Future], command: dict) -> Optional[dict]:
+        """Ожидает ответ на отправленную команду"""
+        if future is None:
+            return None
+        try:
+            return future.result(timeout=self.response_timeout)
+        except FutureTimeoutError:
+            print(f"Нет ответа сервера на команду {command.get('type')}")
+            # Ответ уже не нужен: запоздавший ответ будет отброшен
+            with self._pending_lock:
+                for request_id, pending in self._pending.items():
+                    if pending is future:
+                        del self._pending[request_id]
+                        break
+            return None
+
+    def _send_command(self, command: dict) -> Optional[dict]:
+        """Отправляет команду серверу и получает ответ"""
+        return self._wait_response(self.send_request(command), command)
+
+    def send_commands(self, commands: List[dict]) -> List[Optional[dict]]:
+        """Отправляет несколько команд сразу и собирает ответы
+
+        Args:
+            commands: Команды серверу
+
+        Returns:
+            list: Ответы в порядке команд (None для команд без ответа)
+        """
+        futures = [self.send_request(command) for command in commands]
+        return [self._wait_response(future, command) for future, command in zip(futures, commands)]
+
     def get_adapters(self) -> Optional[list]:
         """Получает список сетевых адаптеров"""
         response = self._send_command({'type': 'get_adapters'})
@@ -66,6 +197,34 @@ class NetworkClient:
             return response.get('info')
         return None
 
+    def get_adapters_info(self, adapter_names: List[str]) -> Dict[str, dict]:
+        """Получает информацию о нескольких адаптерах одним пакетом запросов
+
+        Returns:
+            dict: {adapter_name: info} для адаптеров, о которых пришел ответ
+        """
+        responses = self.send_commands([
+            {'type': 'get_adapter_info', 'adapter': adapter_name}
+            for adapter_name in adapter_names
+        ])
+        return {
+            adapter_name: response.get('info')
+            for adapter_name, response in zip(adapter_names, responses)
+            if response and response.get('type') == 'adapter_info'
+        }
+
+    def get_snapshot(self) -> Optional[List[dict]]:
+        """Получает все адаптеры со сведениями и счетчиками одним запросом
+
+        Returns:
+            list: [{'name', 'info', 'counters'}, ...] или None, если сервер
+                не поддерживает снимок (старая версия) или не ответил
+        """
+        response = self._send_command({'type': 'get_snapshot'})
+        if response and response.get('type') == 'snapshot':
+            return response.get('adapters', [])
+        return None
+
     def start_measurement(self, adapter_name: str) -> bool:
         """Начинает измерение скорости"""
         response = self._send_command({
@@ -83,7 +242,29 @@ class NetworkClient:
         """Получает текущие значения скорости"""
         response = self._send_command({'type': 'get_speeds'})
         if response and response.get('type') == 'speeds':
-            speeds = response.get('speeds', {})
-            speeds['time'] = response.get('time', '-')
-            return speeds
-        return None 
\ No newline at end of file
+            return self._speeds_from_message(response)
+        return None
+
+    def subscribe(self, callback: Callable[[dict], None], interval: float = 1.0) -> bool:
+        """Подписывается на данные о скорости
+
+        Сервер сам присылает скорость с заданным интервалом, пока запущено
+        измерение. callback вызывается в потоке чтения с теми же данными,
+        что возвращает get_speeds().
+
+        Args:
+            callback: Обработчик данных о скорости
+            interval: Интервал отправки данных, секунды
+        """
+        self.on_speeds = callback
+        response = self._send_command({'type': 'subscribe', 'interval': interval})
+        if response and response.get('type') == 'subscribed':
+            return True
+        self.on_speeds = None
+        return False
+
+    def unsubscribe(self) -> bool:
+        """Отменяет подписку на данные о скорости"""
+        self.on_speeds = None
+        response = self._send_command({'type': 'unsubscribe'})
+        return bool(response) and response.get('type') == 'unsubscribed' 
\ No newline at end of file
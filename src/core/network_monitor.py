@@ -1,148 +1,419 @@
 import psutil
-import wmi  # Добавляем импорт WMI
+import threading
 import time
+from src.core.adapter_cache import get_adapter_cache, interface_type
+from src.core.adapter_watcher import AdapterWatcher
+from src.core.counter_reader import create_counter_reader
+from src.core.protocol import COUNTER_FIELDS
+from src.core.sample_stats import counter_deltas, counter_rates
+from src.core.stream_stats import StreamStats
+
+class AdapterCounters:
+    """Последние прочитанные счетчики адаптера, общие для всех сессий"""
+    __slots__ = ('values', 'timestamp_ns', 'present', 'sessions')
 
-class NetworkMonitor:
     def __init__(self):
-        self.selected_adapter = None
-        self.download_speeds = []
-        self.upload_speeds = []
-        self.prev_recv = 0
-        self.prev_sent = 0
-        self.max_download = 0
-        self.max_upload = 0
-        self.total_download = 0
-        self.total_upload = 0
-        self.measurement_count = 0
-        self.measurement_start_time = None  # Добавляем время начала измерения
-        # Инициализируем WMI
-        try:
-            self.wmi = wmi.WMI()
-        except:
-            self.wmi = None
+        self.values = (0,) * len(COUNTER_FIELDS)  # Значения счетчиков в порядке COUNTER_FIELDS
+        self.timestamp_ns = 0  # Время чтения счетчиков, time.monotonic_ns()
+        self.present = False  # Был ли адаптер в последнем чтении
+        self.sessions = 0  # Количество открытых сессий по адаптеру
 
-    def get_adapters(self):
-        """Возвращает список доступных сетевых адаптеров"""
-        return list(psutil.net_if_addrs().keys())
+    @property
+    def bytes_recv(self):
+        return self.values[0]
 
-    def get_adapter_description(self, adapter_name):
-        """Получает подробное описание адаптера через WMI"""
-        if not self.wmi:
-            return adapter_name
-            
-        try:
-            # Получаем все сетевые адаптеры через WMI
-            for adapter in self.wmi.Win32_NetworkAdapter():
-                # Проверяем, совпадает ли имя адаптера
-                if adapter.NetConnectionID == adapter_name:
-                    return adapter.Name or adapter.Description or adapter_name
-            return adapter_name
-        except:
-            return adapter_name
+    @property
+    def bytes_sent(self):
+        return self.values[1]
 
-    def get_adapter_info(self, adapter_name):
-        """Получает информацию о сетевом адаптере"""
-        addresses = psutil.net_if_addrs().get(adapter_name, [])
-        stats = psutil.net_if_stats().get(adapter_name)
-        
-        info = {
-            'id': adapter_name,  # Используем имя адаптера как ID
-            'description': self.get_adapter_description(adapter_name),  # Получаем подробное описание
-            'interface_type': 'Ethernet',  # По умолчанию предполагаем Ethernet
-            'ip': '',
-            'mac': '',
-            'speed': '',
-            'mtu': '',
-            'status': ''
-        }
-        
-        for addr in addresses:
-            if addr.family.name == "AF_INET":
-                info['ip'] = addr.address
-            elif addr.family.name in ["AF_PACKET", "AF_LINK"]:
-                info['mac'] = addr.address
-
-        if stats:
-            info['speed'] = f"{stats.speed} Мбит/с"
-            info['mtu'] = f"{stats.mtu} байт"
-            info['status'] = "Активен" if stats.isup else "Неактивен"
-            
-        # Определяем тип интерфейса на основе имени
-        if 'wi' in adapter_name.lower() or 'wlan' in adapter_name.lower():
-            info['interface_type'] = 'Wi-Fi'
-        elif 'bluetooth' in adapter_name.lower():
-            info['interface_type'] = 'Bluetooth'
-        elif 'vpn' in adapter_name.lower():
-            info['interface_type'] = 'VPN'
-        elif 'loopback' in adapter_name.lower():
-            info['interface_type'] = 'Loopback'
-            
-        return info
 
-    def start_measurement(self, adapter_name):
-        """Начинает измерение скорости"""
-        self.selected_adapter = adapter_name
-        self.download_speeds = []
-        self.upload_speeds = []
-        self.prev_recv = psutil.net_io_counters(pernic=True)[adapter_name].bytes_recv
-        self.prev_sent = psutil.net_io_counters(pernic=True)[adapter_name].bytes_sent
-        self.max_download = 0
-        self.max_upload = 0
-        self.total_download = 0
+class MeasurementSession:
+    """Независимое измерение скорости одного адаптера
+
+    Каждая сессия хранит собственные предыдущие значения счетчиков и
+    статистику, поэтому несколько измерений (в том числе одного и того же
+    адаптера) не мешают друг другу. Сами счетчики читаются монитором
+    одним вызовом psutil для всех адаптеров.
+
+    Скорость считается по фактическому времени между чтениями счетчиков
+    (time.monotonic_ns()), поэтому не зависит от точности таймера, который
+    вызывает get_current_speeds(), и от выбранного интервала измерения.
+
+    Расчет скорости и сброс статистики выполняются под блокировкой сессии:
+    сервер читает одну сессию и из цикла событий (подписка), и из пула
+    потоков (запросы get_speeds), и без нее оба читателя считали бы
+    скорость от одних и тех же предыдущих счетчиков.
+    """
+    __slots__ = (
+        'monitor', 'adapter_name', 'prev_counters', 'prev_time_ns',
+        'sample_tick', 'download_speeds', 'upload_speeds', 'download_stats',
+        'upload_stats', 'total_download', 'total_upload', 'total_time',
+        'measurement_count', 'measurement_start_ns', 'is_open', '_lock'
+    )
+
+    def __init__(self, monitor, adapter_name, history_capacity=None):
+        """
+        Args:
+            monitor: NetworkMonitor, читающий счетчики
+            adapter_name: Имя адаптера
+            history_capacity: Количество точек истории скорости
+                (None - ring_buffer.DEFAULT_CAPACITY, 0 - без истории)
+        """
+        self.monitor = monitor
+        self.adapter_name = adapter_name
+        self.prev_counters = (0,) * len(COUNTER_FIELDS)  # Счетчики предыдущего чтения
+        self.prev_time_ns = 0
+        self.sample_tick = 0
+        self.is_open = True
+        self._lock = threading.Lock()
+        self.download_speeds = self.upload_speeds = None
+        self.download_stats = StreamStats()
+        self.upload_stats = StreamStats()
+        if history_capacity != 0:
+            # numpy загружается только процессами, которым нужна история для графиков
+            from src.core.ring_buffer import DEFAULT_CAPACITY, RingBuffer
+            self.download_speeds = RingBuffer(history_capacity or DEFAULT_CAPACITY)
+            self.upload_speeds = RingBuffer(history_capacity or DEFAULT_CAPACITY)
+        self.reset_statistics()
+
+    def reset_statistics(self):
+        """Сбрасывает историю и статистику измерения"""
+        with self._lock:
+            self._reset_statistics()
+
+    def _reset_statistics(self):
+        """Сброс статистики (вызывается под блокировкой сессии)"""
+        if self.download_speeds is not None:
+            self.download_speeds.clear()
+            self.upload_speeds.clear()
+        self.download_stats.reset()
+        self.upload_stats.reset()
+        self.total_download = 0  # КБ за время измерения
         self.total_upload = 0
+        self.total_time = 0.0  # Суммарное время между чтениями, секунды
         self.measurement_count = 0
-        self.measurement_start_time = time.time()  # Записываем время начала
+        self.measurement_start_ns = time.monotonic_ns()
 
-    def stop_measurement(self):
-        """Останавливает измерение скорости"""
-        self.selected_adapter = None
-        self.measurement_start_time = None
+    def read_counters(self):
+        """Читает счетчики адаптера сессии без расчета скорости
 
-    def get_current_speeds(self):
-        """Получает текущую скорость сети"""
-        if not self.selected_adapter:
+        Returns:
+            tuple: (timestamp_ns, счетчики в порядке COUNTER_FIELDS) или
+                None, если адаптер недоступен
+        """
+        if not self.is_open:
+            return None
+        counters = self.monitor._read_counters(self)
+        if counters is None:
             return None
+        return (counters.timestamp_ns,) + counters.values
+
+    def get_current_speeds(self, sample=None):
+        """Получает текущую скорость сети для адаптера сессии
+
+        Args:
+            sample: Результат read_counters(), если счетчики уже прочитаны
+        """
+        with self._lock:
+            return self._update_speeds(sample)
 
-        net_io = psutil.net_io_counters(pernic=True).get(self.selected_adapter)
-        if not net_io:
+    def _update_speeds(self, sample):
+        """Расчет скорости по образцу (вызывается под блокировкой сессии)"""
+        if sample is None:
+            sample = self.read_counters()
+        if sample is None:
             return None
 
-        recv_speed = (net_io.bytes_recv - self.prev_recv) / 1024  # КБ/с
-        sent_speed = (net_io.bytes_sent - self.prev_sent) / 1024  # КБ/с
+        timestamp_ns, counters = sample[0], sample[1:]
+        elapsed = (timestamp_ns - self.prev_time_ns) / 1e9
+        if elapsed <= 0:
+            return None
+        deltas = counter_deltas(self.prev_counters, counters)
+        recv_kb = deltas[0] / 1024
+        sent_kb = deltas[1] / 1024
+        recv_speed = recv_kb / elapsed  # КБ/с
+        sent_speed = sent_kb / elapsed  # КБ/с
 
-        self.prev_recv = net_io.bytes_recv
-        self.prev_sent = net_io.bytes_sent
+        self.prev_counters = counters
+        self.prev_time_ns = timestamp_ns
 
-        # Обновление статистики
-        self.max_download = max(self.max_download, recv_speed)
-        self.max_upload = max(self.max_upload, sent_speed)
-        self.total_download += recv_speed
-        self.total_upload += sent_speed
+        # Обновление статистики (средняя скорость взвешена по времени)
+        timestamp = timestamp_ns / 1e9
+        self.download_stats.update(recv_speed, timestamp, elapsed)
+        self.upload_stats.update(sent_speed, timestamp, elapsed)
+        self.total_download += recv_kb
+        self.total_upload += sent_kb
+        self.total_time += elapsed
         self.measurement_count += 1
 
-        # Добавление в историю
-        self.download_speeds.append(recv_speed)
-        self.upload_speeds.append(sent_speed)
-
-        # Ограничение количества точек
-        max_points = 60
-        if len(self.download_speeds) > max_points:
-            self.download_speeds.pop(0)
-            self.upload_speeds.pop(0)
+        # Добавление в историю (старые точки вытесняются буфером)
+        if self.download_speeds is not None:
+            self.download_speeds.append(recv_speed)
+            self.upload_speeds.append(sent_speed)
 
         # Вычисляем длительность измерения
-        measurement_duration = 0
-        if self.measurement_start_time:
-            measurement_duration = int(time.time() - self.measurement_start_time)
+        measurement_duration = int((time.monotonic_ns() - self.measurement_start_ns) // 1_000_000_000)
 
-        return {
+        stats = {
+            'avg_download': self.total_download / self.total_time,
+            'avg_upload': self.total_upload / self.total_time,
+            'duration': measurement_duration  # Добавляем длительность измерения
+        }
+        # Максимум, EWMA, отклонение, минимум и максимум за окно, процентили
+        stats.update(self.download_stats.summary('download'))
+        stats.update(self.upload_stats.summary('upload'))
+        data = {
             'download': recv_speed,
             'upload': sent_speed,
-            'stats': {
-                'max_download': self.max_download,
-                'max_upload': self.max_upload,
-                'avg_download': self.total_download / self.measurement_count,
-                'avg_upload': self.total_upload / self.measurement_count,
-                'duration': measurement_duration  # Добавляем длительность измерения
+            'interval': elapsed,  # Фактический интервал измерения, секунды
+            'stats': stats
+        }
+        # Пакеты, ошибки и отбрасывания из того же чтения счетчиков
+        data.update(counter_rates(deltas, elapsed))
+        return data
+
+
+class NetworkMonitor:
+    def __init__(self, history_capacity=None):
+        """
+        Args:
+            history_capacity: Количество точек истории скорости в каждой сессии
+                (None - по умолчанию, 0 - не хранить историю)
+        """
+        self.history_capacity = history_capacity
+        self.session = None  # Сессия для start_measurement()/get_current_speeds()
+        self._adapters = {}  # {adapter_name: AdapterCounters} для адаптеров с открытыми сессиями
+        self._tick = 0  # Номер последнего чтения счетчиков
+        self._lock = threading.Lock()
+        self._counter_reader = create_counter_reader()  # /proc/net/dev на Linux, иначе psutil
+        self.adapter_cache = get_adapter_cache()  # Сведения об адаптерах (WMI в фоновом потоке)
+        self._adapter_listeners = []  # Обработчики изменений адаптеров
+        self._watcher = None  # Запускается с первым обработчиком
+        self.on_error = None  # Обработчик ошибок фоновых потоков, см. set_error_handler()
+
+    def get_adapters(self):
+        """Возвращает список доступных сетевых адаптеров"""
+        adapters = list(psutil.net_if_addrs().keys())
+        if set(adapters) != set(self.adapter_cache.names()):
+            # Набор адаптеров изменился - обновляем сведения в фоне
+            self.adapter_cache.invalidate()
+        return adapters
+
+    def set_error_handler(self, callback):
+        """Назначает обработчик ошибок фоновых потоков
+
+        Ошибки наблюдения за адаптерами и фонового обновления кэша сведений
+        передаются обработчику вместо вывода в консоль. Кэш общий для
+        процесса, поэтому его ошибки получает последний назначенный обработчик.
+
+        Args:
+            callback: Обработчик callback(шаблон, *аргументы) в стиле
+                LogQueue.log; вызывается в фоновых потоках
+        """
+        self.on_error = callback
+        self.adapter_cache.on_error = callback
+
+    def add_adapter_listener(self, callback):
+        """Подписывает на изменения адаптеров (добавление, удаление, включение, отключение)
+
+        Args:
+            callback: Обработчик callback(событие, имя адаптера), где событие -
+                одна из констант adapter_watcher.ADAPTER_EVENTS. Вызывается в
+                потоке наблюдения.
+        """
+        with self._lock:
+            self._adapter_listeners.append(callback)
+            if self._watcher is None:
+                self._watcher = AdapterWatcher(self._on_adapter_event, on_error=self._on_watcher_error)
+                self._watcher.start()
+
+    def remove_adapter_listener(self, callback):
+        """Отменяет подписку на изменения адаптеров"""
+        with self._lock:
+            if callback in self._adapter_listeners:
+                self._adapter_listeners.remove(callback)
+            watcher = self._watcher if not self._adapter_listeners else None
+            if watcher:
+                self._watcher = None
+        if watcher:
+            watcher.stop()
+
+    def _on_watcher_error(self, message, *args):
+        """Ошибка в потоке наблюдения за адаптерами"""
+        if self.on_error:
+            self.on_error(message, *args)
+
+    def _on_adapter_event(self, event, adapter_name):
+        """Рассылка события наблюдателя адаптеров"""
+        # Состояние и адреса обновляем сразу, описания WMI - в фоне
+        self.adapter_cache.refresh(query_wmi=False)
+        self.adapter_cache.invalidate()
+        for callback in list(self._adapter_listeners):
+            callback(event, adapter_name)
+
+    def get_adapter_description(self, adapter_name):
+        """Получает подробное описание адаптера (из кэша сведений WMI)"""
+        info = self.adapter_cache.get(adapter_name)
+        return info['description'] if info else adapter_name
+
+    def get_adapter_info(self, adapter_name):
+        """Получает информацию о сетевом адаптере
+
+        Сведения берутся из кэша, поэтому вызов не обращается к WMI и
+        подходит для потока интерфейса.
+        """
+        info = self.adapter_cache.get(adapter_name)
+        if info is None:
+            # Неизвестный адаптер: отдаем заготовку, как и раньше
+            info = {
+                'id': adapter_name,
+                'description': adapter_name,
+                'interface_type': interface_type(adapter_name),
+                'ip': '',
+                'mac': '',
+                'speed': '',
+                'mtu': '',
+                'status': ''
             }
-        } 
\ No newline at end of file
+        return info
+
+    def get_snapshot(self):
+        """Снимок всех адаптеров: сведения и текущие счетчики
+
+        Счетчики всех адаптеров читаются одним чтением, сведения берутся
+        из кэша, поэтому снимок собирается без обращения к WMI.
+
+        Returns:
+            dict: {'timestamp_ns': время чтения счетчиков (time.monotonic_ns()),
+                'adapters': [{'name', 'info', 'counters': {поле COUNTER_FIELDS:
+                значение} или None}, ...]}
+        """
+        adapters = self.get_adapters()
+        with self._lock:
+            values = self._counter_reader.read(adapters)
+            timestamp_ns = time.monotonic_ns()
+        snapshot = []
+        for adapter_name in adapters:
+            adapter_values = values.get(adapter_name)
+            snapshot.append({
+                'name': adapter_name,
+                'info': self.get_adapter_info(adapter_name),
+                'counters': dict(zip(COUNTER_FIELDS, adapter_values)) if adapter_values else None
+            })
+        return {'timestamp_ns': timestamp_ns, 'adapters': snapshot}
+
+    def open_session(self, adapter_name):
+        """Открывает независимую сессию измерения для адаптера
+
+        Args:
+            adapter_name: Имя адаптера
+
+        Returns:
+            MeasurementSession: Новая сессия измерения
+        """
+        with self._lock:
+            counters = self._adapters.get(adapter_name)
+            if counters is None:
+                counters = self._adapters[adapter_name] = AdapterCounters()
+            counters.sessions += 1
+
+            # Ошибка чтения счетчиков или создания сессии (например, numpy
+            # не загрузился) не должна оставлять адаптер в опросе
+            try:
+                # Берем начальные значения из свежего чтения счетчиков
+                self._sample()
+                if not counters.present:
+                    raise ValueError(f"Адаптер {adapter_name} не найден")
+
+                session = MeasurementSession(self, adapter_name, self.history_capacity)
+            except Exception:
+                self._release(adapter_name)
+                raise
+            session.prev_counters = counters.values
+            session.prev_time_ns = counters.timestamp_ns
+            session.sample_tick = self._tick
+            return session
+
+    def close_session(self, session):
+        """Закрывает сессию измерения"""
+        with self._lock:
+            if session.is_open:
+                session.is_open = False
+                self._release(session.adapter_name)
+
+    def sample(self):
+        """Читает счетчики всех отслеживаемых адаптеров одним чтением"""
+        with self._lock:
+            self._sample()
+
+    def _sample(self):
+        """Чтение счетчиков (вызывается под блокировкой)"""
+        values = self._counter_reader.read(self._adapters)
+        timestamp_ns = time.monotonic_ns()
+        self._tick += 1
+        for adapter_name, counters in self._adapters.items():
+            adapter_values = values.get(adapter_name)
+            counters.present = adapter_values is not None
+            if adapter_values is not None:
+                counters.values = adapter_values
+                counters.timestamp_ns = timestamp_ns
+
+    def _read_counters(self, session):
+        """Возвращает счетчики адаптера сессии
+
+        Новое чтение выполняется, только если сессия уже использовала
+        последнее, поэтому сессии, опрашиваемые с одной частотой, делят
+        между собой один вызов psutil за такт.
+        """
+        with self._lock:
+            if session.sample_tick >= self._tick:
+                self._sample()
+            session.sample_tick = self._tick
+            counters = self._adapters.get(session.adapter_name)
+            if counters is None or not counters.present:
+                return None
+            return counters
+
+    def _release(self, adapter_name):
+        """Уменьшает счетчик сессий адаптера (вызывается под блокировкой)"""
+        counters = self._adapters.get(adapter_name)
+        if counters is None:
+            return
+        counters.sessions -= 1
+        if counters.sessions <= 0:
+            del self._adapters[adapter_name]
+
+    @property
+    def selected_adapter(self):
+        """Адаптер текущего измерения"""
+        return self.session.adapter_name if self.session else None
+
+    @property
+    def download_speeds(self):
+        return self.session.download_speeds if self.session and self.session.download_speeds is not None else []
+
+    @property
+    def upload_speeds(self):
+        return self.session.upload_speeds if self.session and self.session.upload_speeds is not None else []
+
+    def start_measurement(self, adapter_name):
+        """Начинает измерение скорости"""
+        self.stop_measurement()
+        self.session = self.open_session(adapter_name)
+
+    def stop_measurement(self):
+        """Останавливает измерение скорости"""
+        if self.session:
+            self.close_session(self.session)
+            self.session = None
+
+    def reset_statistics(self):
+        """Сбрасывает историю и статистику текущего измерения"""
+        if self.session:
+            self.session.reset_statistics()
+
+    def get_current_speeds(self):
+        """Получает текущую скорость сети"""
+        if not self.session:
+            return None
+        return self.session.get_current_speeds()
@@ -0,0 +1,246 @@
+"""
+Протокол обмена сообщениями между сервером и клиентами.
+
+Каждое сообщение передается отдельным кадром: 4 байта длины полезной
+нагрузки (big-endian) и сама нагрузка - JSON в кодировке UTF-8. Кадры
+позволяют корректно разбирать поток TCP, в котором несколько сообщений
+могут прийти одним пакетом, а одно сообщение - несколькими.
+
+Частые сообщения с образцами скорости могут передаваться двоичной
+записью фиксированного размера (см. encode_sample()) или пакетом таких
+записей (encode_sample_batch()). Такая нагрузка
+начинается с байта-метки, который не может начинать JSON-сообщение.
+Двоичные образцы отправляются, только если обе стороны объявили
+поддержку BINARY_SAMPLES в списке возможностей.
+"""
+
+import json
+import struct
+from collections import deque
+from typing import Any, List, Optional
+
+HEADER = struct.Struct('!I')
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024  # Защита от переполнения буфера
+RECV_BUFFER_SIZE = 64 * 1024
+
+# Возможность передачи образцов двоичными записями
+BINARY_SAMPLES = 'binary_counters'
+# Возможность получить все адаптеры со сведениями одним сообщением get_snapshot
+SNAPSHOT = 'snapshot'
+CAPABILITIES = (BINARY_SAMPLES, SNAPSHOT)
+
+# Счетчики адаптера в образце, в порядке передачи. Агент передает
+# сами счетчики, скорость и статистику по ним считает сервер
+COUNTER_FIELDS = (
+    'bytes_recv', 'bytes_sent', 'packets_recv', 'packets_sent',
+    'errin', 'errout', 'dropin', 'dropout'
+)
+
+# Двоичный образец: метка SAMPLE_TAG и запись SAMPLE_RECORD - id адаптера,
+# время чтения счетчиков (time.monotonic_ns() отправителя) и счетчики
+# COUNTER_FIELDS. Образец в JSON - список с теми же полями
+SAMPLE_TAG = 0x01
+SAMPLE_RECORD = struct.Struct('!HQ' + 'Q' * len(COUNTER_FIELDS))
+_SAMPLE_FRAME_HEADER = HEADER.pack(1 + SAMPLE_RECORD.size) + bytes((SAMPLE_TAG,))
+
+# Пакет образцов: метка SAMPLE_BATCH_TAG, количество записей (uint16) и записи
+SAMPLE_BATCH_TAG = 0x02
+SAMPLE_BATCH_HEADER = struct.Struct('!BH')
+MAX_BATCH_SAMPLES = 0xFFFF
+
+
+class ProtocolError(Exception):
+    """Нарушение формата потока сообщений"""
+
+
+def encode_message(message: Any) -> bytes:
+    """Упаковывает сообщение в кадр для отправки
+
+    Args:
+        message: Сообщение (сериализуемое в JSON)
+
+    Returns:
+        bytes: Заголовок длины и полезная нагрузка
+    """
+    payload = json.dumps(message).encode('utf-8')
+    if len(payload) > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Слишком большое сообщение: {len(payload)} байт")
+    return HEADER.pack(len(payload)) + payload
+
+
+def decode_payload(payload) -> Any:
+    """Декодирует полезную нагрузку кадра
+
+    Args:
+        payload: Байты полезной нагрузки
+
+    Returns:
+        Декодированное сообщение
+    """
+    return json.loads(payload)
+
+
+def encode_sample(adapter_id: int, timestamp_ns: int, *counters: int) -> bytes:
+    """Упаковывает образец счетчиков в кадр с двоичной записью
+
+    Args:
+        adapter_id: Идентификатор адаптера, объявленный сообщением adapter_id
+        timestamp_ns: Время чтения счетчиков, time.monotonic_ns()
+        *counters: Значения счетчиков в порядке COUNTER_FIELDS
+
+    Returns:
+        bytes: Кадр для отправки
+    """
+    return _SAMPLE_FRAME_HEADER + SAMPLE_RECORD.pack(adapter_id, timestamp_ns, *counters)
+
+
+def encode_sample_batch(samples) -> bytes:
+    """Упаковывает несколько образцов в один кадр
+
+    Args:
+        samples: Последовательность кортежей с полями encode_sample()
+            (не больше MAX_BATCH_SAMPLES)
+
+    Returns:
+        bytes: Кадр для отправки
+    """
+    count = len(samples)
+    if count > MAX_BATCH_SAMPLES:
+        raise ProtocolError(f"Слишком много образцов в пакете: {count}")
+    length = SAMPLE_BATCH_HEADER.size + count * SAMPLE_RECORD.size
+    frame = bytearray(HEADER.size + length)
+    HEADER.pack_into(frame, 0, length)
+    SAMPLE_BATCH_HEADER.pack_into(frame, HEADER.size, SAMPLE_BATCH_TAG, count)
+    offset = HEADER.size + SAMPLE_BATCH_HEADER.size
+    for sample in samples:
+        SAMPLE_RECORD.pack_into(frame, offset, *sample)
+        offset += SAMPLE_RECORD.size
+    return bytes(frame)
+
+
+def is_sample(payload) -> bool:
+    """Проверяет, содержит ли нагрузка кадра двоичный образец"""
+    return len(payload) > 0 and payload[0] == SAMPLE_TAG
+
+
+def is_sample_batch(payload) -> bool:
+    """Проверяет, содержит ли нагрузка кадра пакет двоичных образцов"""
+    return len(payload) > 0 and payload[0] == SAMPLE_BATCH_TAG
+
+
+def decode_sample(payload) -> tuple:
+    """Распаковывает двоичный образец
+
+    Returns:
+        tuple: (adapter_id, timestamp_ns, счетчики в порядке COUNTER_FIELDS)
+    """
+    if len(payload) != 1 + SAMPLE_RECORD.size:
+        raise ProtocolError(f"Неверный размер двоичного образца: {len(payload)} байт")
+    return SAMPLE_RECORD.unpack_from(payload, 1)
+
+
+def decode_sample_batch(payload) -> List[tuple]:
+    """Распаковывает пакет двоичных образцов
+
+    Returns:
+        list: Кортежи в формате decode_sample()
+    """
+    if len(payload) < SAMPLE_BATCH_HEADER.size:
+        raise ProtocolError("Неполный заголовок пакета образцов")
+    _, count = SAMPLE_BATCH_HEADER.unpack_from(payload)
+    if len(payload) != SAMPLE_BATCH_HEADER.size + count * SAMPLE_RECORD.size:
+        raise ProtocolError(f"Неверный размер пакета образцов: {len(payload)} байт")
+    return list(SAMPLE_RECORD.iter_unpack(memoryview(payload)[SAMPLE_BATCH_HEADER.size:]))
+
+
+class MessageDecoder:
+    """Потоковый декодер кадров
+
+    Накапливает полученные байты во внутреннем буфере и выдает полезные
+    нагрузки всех кадров, которые пришли полностью. Неполный кадр
+    остается в буфере до следующего вызова feed().
+    """
+
+    def __init__(self, max_message_size: int = MAX_MESSAGE_SIZE):
+        self._buffer = bytearray()
+        self.max_message_size = max_message_size
+
+    def feed(self, data) -> List[bytes]:
+        """Добавляет данные в буфер и возвращает готовые полезные нагрузки
+
+        Args:
+            data: Очередная порция байт из сокета
+
+        Returns:
+            list: Полезные нагрузки полностью полученных кадров
+        """
+        buffer = self._buffer
+        buffer += data
+
+        payloads = []
+        offset = 0
+        available = len(buffer)
+        while available - offset >= HEADER.size:
+            (length,) = HEADER.unpack_from(buffer, offset)
+            if length > self.max_message_size:
+                raise ProtocolError(f"Слишком большой кадр: {length} байт")
+
+            end = offset + HEADER.size + length
+            if end > available:
+                break
+
+            payloads.append(bytes(buffer[offset + HEADER.size:end]))
+            offset = end
+
+        # Сдвигаем буфер один раз за вызов, а не на каждый кадр
+        if offset:
+            del buffer[:offset]
+        return payloads
+
+    def pending_bytes(self) -> int:
+        """Количество байт неполного кадра в буфере"""
+        return len(self._buffer)
+
+    def reset(self):
+        """Очищает буфер"""
+        self._buffer.clear()
+
+
+class MessageReader:
+    """Чтение кадров из блокирующего сокета
+
+    Использует один заранее выделенный буфер приема для всех вызовов
+    recv_into(), поэтому чтение не создает новых объектов bytes.
+    """
+
+    def __init__(self, sock, buffer_size: int = RECV_BUFFER_SIZE):
+        self.sock = sock
+        self.decoder = MessageDecoder()
+        self._chunk = bytearray(buffer_size)
+        self._view = memoryview(self._chunk)
+        self._pending = deque()
+
+    def read(self) -> Optional[List[bytes]]:
+        """Читает данные из сокета
+
+        Returns:
+            list: Полезные нагрузки полученных кадров (может быть пустым),
+                None если соединение закрыто
+        """
+        received = self.sock.recv_into(self._chunk)
+        if not received:
+            return None
+        return self.decoder.feed(self._view[:received])
+
+    def read_message(self) -> Optional[bytes]:
+        """Читает ровно один кадр, сохраняя остальные для следующих вызовов
+
+        Returns:
+            bytes: Полезная нагрузка кадра или None, если соединение закрыто
+        """
+        while not self._pending:
+            payloads = self.read()
+            if payloads is None:
+                return None
+            self._pending.extend(payloads)
+        return self._pending.popleft()
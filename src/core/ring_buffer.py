@@ -0,0 +1,86 @@
+import numpy as np
+
+DEFAULT_CAPACITY = 3600  # Час измерений с частотой 1 Гц
+
+
+class RingBuffer:
+    """Кольцевой буфер фиксированной емкости для временных рядов
+
+    Значения хранятся в массиве двойной длины: каждое значение
+    записывается в позиции i и i + capacity. Благодаря этому последние
+    значения всегда лежат в памяти подряд, и view() возвращает их в
+    хронологическом порядке без копирования. Добавление выполняется за
+    O(1) и не выделяет память.
+    """
+    __slots__ = ('capacity', '_data', '_index', '_size')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError("Емкость буфера должна быть положительной")
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity * 2, dtype=dtype)
+        self._index = 0  # Позиция следующей записи
+        self._size = 0
+
+    def append(self, value):
+        """Добавляет значение, вытесняя самое старое при заполнении"""
+        index = self._index
+        self._data[index] = value
+        self._data[index + self.capacity] = value
+        index += 1
+        self._index = 0 if index == self.capacity else index
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend(self, values):
+        """Добавляет несколько значений"""
+        values = np.asarray(values, dtype=self._data.dtype).ravel()
+        if len(values) >= self.capacity:
+            # Остаются только последние capacity значений
+            values = values[-self.capacity:]
+            self._data[:self.capacity] = values
+            self._data[self.capacity:] = values
+            self._index = 0
+            self._size = self.capacity
+            return
+
+        for value in values:
+            self.append(value)
+
+    def view(self):
+        """Возвращает значения от старых к новым без копирования
+
+        Returns:
+            np.ndarray: Представление данных буфера только для чтения;
+                оно остается корректным до следующего изменения буфера
+        """
+        if self._size < self.capacity:
+            result = self._data[:self._size]
+        else:
+            result = self._data[self._index:self._index + self.capacity]
+        result.flags.writeable = False
+        return result
+
+    def last(self, default=None):
+        """Последнее добавленное значение"""
+        if not self._size:
+            return default
+        return self._data[self._index - 1 + self.capacity]
+
+    def clear(self):
+        """Удаляет все значения"""
+        self._index = 0
+        self._size = 0
+
+    def tolist(self):
+        """Копия значений в виде списка"""
+        return self.view().tolist()
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __repr__(self):
+        return f"RingBuffer(capacity={self.capacity}, size={self._size})"
@@ -0,0 +1,185 @@
+"""
+Многоуровневая история временного ряда.
+
+Кроме исходных образцов ряд хранит агрегаты (минимум, максимум,
+среднее) по интервалам 10 с, 1 мин и 1 ч. Агрегаты обновляются
+инкрементально при добавлении образца, поэтому для отображения длинного
+интервала можно взять уровень, в котором несколько тысяч точек, а не
+все образцы.
+"""
+
+import math
+
+from src.core.ring_buffer import DEFAULT_CAPACITY, RingBuffer
+
+# Длительность интервала агрегации уровней, секунды (0 - исходные образцы)
+ROLLUP_RESOLUTIONS = (0, 10, 60, 3600)
+
+# Сколько точек уровня считается разумным для отображения
+DEFAULT_MAX_POINTS = 2000
+
+
+class RollupTier:
+    """Один уровень детализации ряда
+
+    Для уровня исходных образцов (resolution == 0) значения хранятся
+    один раз, а mins, maxs и avgs указывают на один и тот же буфер.
+    """
+    __slots__ = (
+        'resolution', 'times', 'mins', 'maxs', 'avgs',
+        '_bucket', '_sum', '_count', '_min', '_max'
+    )
+
+    def __init__(self, resolution, capacity=DEFAULT_CAPACITY):
+        self.resolution = resolution
+        self.times = RingBuffer(capacity)
+        if resolution:
+            self.mins = RingBuffer(capacity)
+            self.maxs = RingBuffer(capacity)
+            self.avgs = RingBuffer(capacity)
+        else:
+            self.mins = self.maxs = self.avgs = RingBuffer(capacity)
+        self._bucket = None  # Номер текущего (незавершенного) интервала
+        self._sum = 0.0
+        self._count = 0
+        self._min = 0.0
+        self._max = 0.0
+
+    def add(self, timestamp, value):
+        """Учитывает образец в уровне"""
+        if not self.resolution:
+            self.times.append(timestamp)
+            self.avgs.append(value)
+            return
+
+        bucket = math.floor(timestamp / self.resolution)
+        if bucket != self._bucket:
+            self._close_bucket()
+            self._bucket = bucket
+            self._sum = value
+            self._count = 1
+            self._min = value
+            self._max = value
+            return
+
+        self._sum += value
+        self._count += 1
+        if value < self._min:
+            self._min = value
+        elif value > self._max:
+            self._max = value
+
+    def _close_bucket(self):
+        """Переносит агрегаты завершенного интервала в буферы уровня"""
+        if not self._count:
+            return
+        self.times.append(self._bucket * self.resolution)
+        self.mins.append(self._min)
+        self.maxs.append(self._max)
+        self.avgs.append(self._sum / self._count)
+        self._count = 0
+
+    def partial(self):
+        """Агрегаты текущего (незавершенного) интервала
+
+        Returns:
+            tuple: (начало интервала, минимум, максимум, среднее) или None,
+                если интервал пуст или это уровень исходных образцов
+        """
+        if not self.resolution or not self._count:
+            return None
+        return (self._bucket * self.resolution, self._min, self._max, self._sum / self._count)
+
+    def span(self):
+        """Интервал времени, покрытый сохраненными точками уровня, секунды"""
+        if not len(self.times):
+            return 0.0
+        times = self.times.view()
+        return times[-1] - times[0] + self.resolution
+
+    def clear(self):
+        """Удаляет все точки уровня"""
+        self.times.clear()
+        self.mins.clear()
+        self.maxs.clear()
+        self.avgs.clear()
+        self._bucket = None
+        self._count = 0
+
+    def __len__(self):
+        return len(self.times)
+
+
+class RollupSeries:
+    """Ряд с исходными образцами и уровнями агрегации"""
+
+    def __init__(self, resolutions=ROLLUP_RESOLUTIONS, capacity=DEFAULT_CAPACITY):
+        """
+        Args:
+            resolutions: Длительности интервалов уровней по возрастанию, секунды
+            capacity: Количество точек в каждом уровне
+        """
+        self.tiers = [RollupTier(resolution, capacity) for resolution in resolutions]
+        self.start_time = None  # Время первого образца ряда
+
+    @property
+    def raw(self):
+        """Уровень с наиболее подробными данными"""
+        return self.tiers[0]
+
+    def append(self, timestamp, value):
+        """Добавляет образец во все уровни
+
+        Args:
+            timestamp: Время образца, секунды
+            value: Значение
+        """
+        if self.start_time is None:
+            self.start_time = timestamp
+        for tier in self.tiers:
+            tier.add(timestamp, value)
+
+    def tier_for_range(self, start, end, max_points=DEFAULT_MAX_POINTS):
+        """Выбирает уровень для отображения интервала времени
+
+        Берется самый подробный уровень, который дает на интервале не больше
+        max_points точек и еще хранит данные с начала интервала (старые точки
+        подробных уровней вытесняются раньше).
+
+        Args:
+            start: Начало интервала, секунды
+            end: Конец интервала, секунды
+            max_points: Максимальное желаемое количество точек
+
+        Returns:
+            RollupTier: Выбранный уровень
+        """
+        span = max(end - start, 0.0)
+        for tier in self.tiers:
+            count = len(tier)
+            if not count:
+                continue
+            complete = count < tier.times.capacity or tier.times.view()[0] <= start
+            if tier.resolution:
+                points = span / tier.resolution
+            else:
+                # Для исходных образцов оцениваем плотность по сохраненным данным
+                covered = tier.span()
+                points = count * span / covered if covered > 0 else count
+            if complete and points <= max_points:
+                return tier
+
+        # Интервал слишком длинный - используем самый грубый уровень с данными
+        for tier in reversed(self.tiers):
+            if len(tier):
+                return tier
+        return self.tiers[0]
+
+    def clear(self):
+        """Удаляет все данные ряда"""
+        for tier in self.tiers:
+            tier.clear()
+        self.start_time = None
+
+    def __len__(self):
+        return len(self.tiers[0])
@@ -0,0 +1,177 @@
+"""
+Скорость и статистика измерения, вычисляемые на сервере.
+
+Агенты передают сами счетчики адаптера (байты, пакеты, ошибки,
+отбрасывания) с временем чтения, а скорость и накопленную статистику
+сервер считает по разностям счетчиков. Поскольку счетчики накопительные,
+потерянный образец не искажает статистику: следующая разность просто
+охватывает больший интервал.
+"""
+
+from src.core.protocol import COUNTER_FIELDS
+from src.core.stream_stats import StreamStats
+
+COUNTER_WRAP = 1 << 32  # Модуль 32-разрядных счетчиков (старые драйверы, Windows)
+
+
+def counter_delta(previous, current):
+    """Прирост счетчика с учетом переполнения и сброса
+
+    Если значение уменьшилось, а предыдущее помещалось в 32 разряда и
+    прирост через переполнение правдоподобен (меньше половины диапазона),
+    считаем, что 32-разрядный счетчик переполнился. Иначе счетчик был
+    сброшен (перезапуск драйвера, переподключение адаптера) и прирост
+    считается от нуля.
+
+    Args:
+        previous: Предыдущее значение
+        current: Текущее значение
+
+    Returns:
+        int: Неотрицательный прирост
+    """
+    if current >= previous:
+        return current - previous
+    if previous < COUNTER_WRAP:
+        wrapped = current + COUNTER_WRAP - previous
+        if wrapped < COUNTER_WRAP // 2:
+            return wrapped
+    return current
+
+
+def counter_deltas(previous, current):
+    """Приросты всех счетчиков образца
+
+    Args:
+        previous: Предыдущие значения в порядке COUNTER_FIELDS
+        current: Текущие значения в том же порядке
+
+    Returns:
+        list: Приросты в порядке COUNTER_FIELDS
+    """
+    return [counter_delta(prev, cur) for prev, cur in zip(previous, current)]
+
+
+def counter_rates(deltas, interval):
+    """Пакетная скорость, ошибки и отбрасывания по приростам счетчиков
+
+    Рост ошибок и отбрасываний при высокой пакетной скорости - признак
+    насыщения адаптера, который не виден по одной пропускной способности.
+
+    Args:
+        deltas: Приросты счетчиков в порядке COUNTER_FIELDS
+        interval: Время между образцами, секунды
+
+    Returns:
+        dict: Пакеты в секунду (packets_recv, packets_sent), ошибки и
+            отбрасывания в секунду в обоих направлениях (errors, drops)
+    """
+    return {
+        'packets_recv': deltas[2] / interval,
+        'packets_sent': deltas[3] / interval,
+        'errors': (deltas[4] + deltas[5]) / interval,
+        'drops': (deltas[6] + deltas[7]) / interval
+    }
+
+
+class SampleStats:
+    """Скорость и статистика потока образцов счетчиков одного адаптера"""
+    __slots__ = (
+        'adapter', 'first_ns', 'prev_ns', 'prev_counters', 'totals',
+        'total_time', 'download_stats', 'upload_stats', 'clock_offset'
+    )
+
+    def __init__(self, adapter):
+        """
+        Args:
+            adapter: Имя адаптера
+        """
+        self.adapter = adapter
+        self.download_stats = StreamStats()
+        self.upload_stats = StreamStats()
+        self.reset()
+
+    def reset(self):
+        """Начинает статистику заново"""
+        self.first_ns = None  # Время первого образца (часы отправителя)
+        self.prev_ns = None
+        self.prev_counters = None
+        self.totals = [0] * len(COUNTER_FIELDS)  # Прирост счетчиков с начала измерения
+        self.total_time = 0.0  # секунды
+        # Время сервера (UNIX time) минус часы отправителя в секундах;
+        # задается по первому пакету образцов (см. wall_time) и дальше не меняется
+        self.clock_offset = None
+        self.download_stats.reset()
+        self.upload_stats.reset()
+
+    def update(self, timestamp_ns, counters):
+        """Учитывает образец счетчиков
+
+        Args:
+            timestamp_ns: Время чтения счетчиков, time.monotonic_ns() отправителя
+            counters: Значения счетчиков в порядке COUNTER_FIELDS
+
+        Returns:
+            dict: Данные в формате speeds_data ({'download', 'upload',
+                'interval', поля counter_rates(), 'stats': {...}}) или None для первого образца
+                и образцов, пришедших не по порядку
+        """
+        if self.prev_ns is None:
+            self.first_ns = self.prev_ns = timestamp_ns
+            self.prev_counters = counters
+            return None
+        if timestamp_ns <= self.prev_ns:
+            return None
+
+        interval = (timestamp_ns - self.prev_ns) / 1e9
+        deltas = counter_deltas(self.prev_counters, counters)
+        self.prev_ns = timestamp_ns
+        self.prev_counters = counters
+
+        totals = self.totals
+        for index, delta in enumerate(deltas):
+            totals[index] += delta
+        self.total_time += interval
+
+        download = deltas[0] / 1024 / interval  # КБ/с
+        upload = deltas[1] / 1024 / interval
+        timestamp = timestamp_ns / 1e9
+        self.download_stats.update(download, timestamp, interval)
+        self.upload_stats.update(upload, timestamp, interval)
+
+        # Среднее - по приросту счетчиков, т.е. взвешенное по времени
+        stats = {
+            'avg_download': totals[0] / 1024 / self.total_time,
+            'avg_upload': totals[1] / 1024 / self.total_time,
+            'duration': int((timestamp_ns - self.first_ns) // 1_000_000_000)
+        }
+        stats.update(self.download_stats.summary('download'))
+        stats.update(self.upload_stats.summary('upload'))
+        data = {
+            'download': download,
+            'upload': upload,
+            'interval': interval,
+            'stats': stats
+        }
+        data.update(counter_rates(deltas, interval))
+        return data
+
+    def wall_time(self, timestamp_ns, now, last_ns):
+        """Время образца по часам сервера
+
+        Смещение часов отправителя фиксируется один раз - по первому
+        пакету, в котором самый поздний образец считается полученным
+        сейчас. Поэтому задержки сети и пакетирования не сдвигают время
+        последующих образцов, и оно возрастает вместе с часами отправителя.
+
+        Args:
+            timestamp_ns: Время образца, time.monotonic_ns() отправителя
+            now: Текущее время сервера (UNIX time)
+            last_ns: Время самого позднего образца в пакете (часы отправителя)
+
+        Returns:
+            float: UNIX time образца
+        """
+        if self.clock_offset is None:
+            self.clock_offset = now - last_ns / 1e9
+        return self.clock_offset + timestamp_ns / 1e9
@@ -0,0 +1,75 @@
+"""
+Планировщик периодических измерений без накопления дрейфа.
+
+Моменты срабатывания отсчитываются от начала расписания
+(start + k * interval) по монотонным часам, а не от конца предыдущей
+паузы. Поэтому время обработки и неточность sleep() не сдвигают
+последующие измерения; пропущенные из-за задержки такты не
+навёрстываются пачкой, а пропускаются.
+"""
+
+import time
+
+DEFAULT_INTERVAL = 1.0  # секунды
+MIN_INTERVAL = 0.01     # 10 мс - минимальный поддерживаемый интервал
+
+
+def normalize_interval(interval):
+    """Приводит интервал измерения к допустимому значению
+
+    Args:
+        interval: Интервал в секундах (None - интервал по умолчанию)
+
+    Returns:
+        float: Интервал не меньше MIN_INTERVAL
+    """
+    if interval is None:
+        return DEFAULT_INTERVAL
+    return max(float(interval), MIN_INTERVAL)
+
+
+class PeriodicSchedule:
+    """Расписание тактов с фиксированным интервалом"""
+    __slots__ = ('interval', '_interval_ns', '_next_ns')
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        """
+        Args:
+            interval: Интервал между тактами, секунды
+        """
+        self.interval = normalize_interval(interval)
+        self._interval_ns = int(self.interval * 1e9)
+        self.reset()
+
+    def reset(self):
+        """Начинает отсчет тактов с текущего момента"""
+        self._next_ns = time.monotonic_ns()
+
+    def next_delay(self):
+        """Переходит к следующему такту и возвращает время до него
+
+        Returns:
+            float: Пауза до следующего такта, секунды
+        """
+        now = time.monotonic_ns()
+        self._next_ns += self._interval_ns
+        if self._next_ns <= now:
+            # Опоздали больше чем на такт - пропускаем пропущенные такты
+            missed = (now - self._next_ns) // self._interval_ns + 1
+            self._next_ns += missed * self._interval_ns
+        return (self._next_ns - now) / 1e9
+
+    def sleep(self):
+        """Ждет наступления следующего такта"""
+        time.sleep(self.next_delay())
+
+    def wait(self, event):
+        """Ждет следующего такта или установки события
+
+        Args:
+            event: threading.Event, прерывающий ожидание
+
+        Returns:
+            bool: True, если ожидание прервано событием
+        """
+        return event.wait(self.next_delay())
@@ -0,0 +1,1117 @@
+import asyncio
+import socket
+import json
+import threading
+import time
+from functools import partial
+from typing import Dict, Any
+from src.core.log_queue import DEBUG, ERROR, INFO, WARNING, LogQueue
+from src.core.network_monitor import NetworkMonitor
+from src.core.protocol import (
+    CAPABILITIES, RECV_BUFFER_SIZE, SNAPSHOT, MessageDecoder, ProtocolError,
+    decode_payload, decode_sample, decode_sample_batch, encode_message,
+    is_sample, is_sample_batch
+)
+from src.core.sample_stats import SampleStats
+from src.core.scheduler import PeriodicSchedule, normalize_interval
+
+LISTEN_BACKLOG = 1024
+# Неотправленных байт у подписчика, при которых очередное сообщение скорости пропускается
+PUSH_HIGH_WATER = 256 * 1024
+# Срок, после которого снимок адаптеров агента запрашивается заново, секунды.
+# Об изменении IP, MTU или скорости соединения агент не сообщает.
+SNAPSHOT_TTL = 60.0
+
+# Сообщения, которые присылает клиентское приложение (агент)
+AGENT_MESSAGE_TYPES = (
+    'client_info', 'adapters_list', 'adapter_info', 'speeds_data', 'speeds_batch',
+    'adapter_id', 'adapter_event', 'snapshot'
+)
+
+# Запросы подписки на скорость обрабатываются прямо в цикле событий
+SUBSCRIPTION_REQUEST_TYPES = ('subscribe', 'unsubscribe')
+
+# Запросы, меняющие состояние измерения клиента, выполняются строго по порядку;
+# остальные запросы с id выполняются параллельно и отвечают по готовности
+ORDERED_REQUEST_TYPES = ('start_measurement', 'stop_measurement', 'get_speeds')
+
+# Сведения об адаптерах отдаются из кэша, поэтому эти запросы не блокируют
+# и выполняются прямо в цикле событий, без передачи в пул потоков
+INLINE_REQUEST_TYPES = ('get_adapters', 'get_adapter_info', 'get_snapshot')
+
+# События сервера, на которые можно подписаться через subscribe()
+SERVER_EVENTS = (
+    'client_connected',        # ip, port
+    'client_disconnected',     # ip, port
+    'server_started',          # port
+    'server_stopped',
+    'adapters_list_received',  # client_id, adapters
+    'adapter_info_received',   # client_id, adapter, info
+    'adapter_event_received',  # client_id, event, adapter - added, removed, up, down
+    'snapshot_received',       # client_id, [{'name', 'info', 'counters'}, ...] - все адаптеры агента
+                               # (из сохраненного снимка - без 'counters')
+    'speeds_data_received',    # client_id, adapter, data
+    'speeds_batch_received',   # client_id, adapter, [data, ...] - пакет образцов одного адаптера
+)
+
+class ServerCore:
+    """Ядро сетевого сервера без зависимости от Qt
+    
+    Сообщает о событиях через обычные функции обратного вызова,
+    поэтому может работать как в графическом приложении, так и в
+    фоновом процессе без PyQt.
+    """
+    
+    def __init__(self, store=None):
+        """
+        Args:
+            store: Хранилище измерений (MeasurementStore) или None, если
+                измерения не нужно сохранять на диск
+        """
+        self.server_socket = None
+        self.is_running = False
+        self.clients = {}  # {client_id: (writer, client_address)}
+        self.client_info = {}  # {client_id: {'pc_name': 'PC_NAME'}}
+        self.client_id_counter = 0
+        self.server_thread = None
+        self.loop = None
+        self.async_server = None
+        self.network_monitor = NetworkMonitor(history_capacity=0)  # История скорости не нужна
+        self.sessions = {}  # {client_id: MeasurementSession} - измерения удаленных клиентов
+        self.subscriptions = {}  # {client_id: asyncio.Task} - отправка скорости подписчикам
+        self.sample_streams = {}  # {client_id: {adapter_id: SampleStats}} - образцы счетчиков агентов
+        self.snapshots = {}  # {client_id: (время получения, [адаптеры без счетчиков])} - последний снимок агента
+        self.port = None
+        self.store = store
+        self._listeners = {event: [] for event in SERVER_EVENTS}
+        self.log = LogQueue()  # Лог сервера; записи забирает окно или фоновый процесс
+        # Ошибки фоновых потоков монитора (наблюдение за адаптерами, кэш сведений) - в лог
+        self.network_monitor.set_error_handler(partial(self.log.log, ERROR))
+        
+    def subscribe(self, event, callback):
+        """Подписка на событие сервера
+        
+        Обработчики вызываются в том потоке, где произошло событие
+        (чаще всего в потоке цикла событий сервера).
+        
+        Args:
+            event: Имя события из SERVER_EVENTS
+            callback: Функция, принимающая аргументы события
+        """
+        if event not in self._listeners:
+            raise ValueError(f"Неизвестное событие сервера: {event}")
+        self._listeners[event].append(callback)
+        
+    def _emit(self, event, *args):
+        """Вызов всех обработчиков события"""
+        for callback in self._listeners[event]:
+            callback(*args)
+            
+    def _log(self, message, *args, level=INFO):
+        """Добавление сообщения в лог сервера
+        
+        Args:
+            message: Текст или шаблон '%s'; аргументы подставляются, только
+                если сообщение попадет в лог
+            level: Уровень сообщения
+        """
+        self.log.log(level, message, *args)
+        
+    def get_ip_addresses(self):
+        """Получает список всех IP-адресов компьютера"""
+        ip_addresses = []
+        try:
+            # Получаем имя компьютера
+            hostname = socket.gethostname()
+            # Получаем все IP-адреса для этого имени
+            ips = socket.getaddrinfo(hostname, None)
+            
+            # Фильтруем только IPv4 адреса
+            for ip in ips:
+                if ip[0] == socket.AF_INET:  # только IPv4
+                    ip_addr = ip[4][0]
+                    if not ip_addr.startswith('127.'):  # исключаем локальный адрес
+                        ip_addresses.append(ip_addr)
+                        
+            # Добавляем внешний IP, если есть подключение к интернету
+            try:
+                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                s.connect(("8.8.8.8", 80))
+                external_ip = s.getsockname()[0]
+                if external_ip not in ip_addresses:
+                    ip_addresses.append(external_ip)
+                s.close()
+            except:
+                pass
+                
+        except Exception as e:
+            self._log("Ошибка при получении IP-адресов: %s", e, level=ERROR)
+        
+        return ip_addresses
+
+    def get_local_ip(self):
+        """Получает локальный IPv4 адрес компьютера"""
+        try:
+            # Создаем временное подключение для определения IP
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.connect(("8.8.8.8", 80))
+            ip = s.getsockname()[0]
+            s.close()
+            return ip
+        except:
+            # Если не удалось определить IP через подключение,
+            # пробуем получить через hostname
+            try:
+                hostname = socket.gethostname()
+                ip = socket.gethostbyname(hostname)
+                return ip
+            except:
+                return "127.0.0.1"
+
+    def start_server(self, port=5000, host=None):
+        """Запуск сервера на указанном порту
+        
+        Args:
+            port: Порт сервера
+            host: Адрес для прослушивания (по умолчанию локальный IP)
+        """
+        if self.is_running:
+            self._log("Сервер уже запущен")
+            return False
+            
+        try:
+            # Получаем локальный IP адрес
+            local_ip = host or self.get_local_ip()
+            
+            # Создаем серверный сокет
+            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server_socket.bind((local_ip, port))
+            self.server_socket.listen(LISTEN_BACKLOG)
+            self.server_socket.setblocking(False)
+            
+            # Открываем хранилище измерений; без него сервер тоже работает
+            if self.store:
+                try:
+                    self.store.on_error = self._on_store_error
+                    self.store.open()
+                    self._log("История измерений сохраняется в %s", self.store.path)
+                except Exception as e:
+                    self._log("Не удалось открыть хранилище измерений: %s", e, level=WARNING)
+            
+            # Сохраняем порт
+            self.port = port
+            
+            # Выводим информацию о запуске
+            self._log("\n=== Информация о сервере ===")
+            self._log("Сервер запущен на %s:%s", local_ip, port)
+            self._log("\nДля тестирования на этом компьютере:")
+            self._log("1. Используйте IP-адрес: %s", local_ip)
+            self._log("2. Порт в обоих случаях: %s", port)
+            
+            # Все клиентские соединения обслуживаются одним циклом событий
+            # в отдельном потоке
+            self.loop = asyncio.new_event_loop()
+            self.is_running = True
+            self.server_thread = threading.Thread(target=self._run_event_loop)
+            self.server_thread.daemon = True
+            self.server_thread.start()
+            
+            self._log("\nСервер успешно запущен и готов к подключениям")
+            self._emit('server_started', port)
+            return True
+            
+        except Exception as e:
+            self._log("Ошибка при запуске сервера: %s", e, level=ERROR)
+            if self.server_socket:
+                self.server_socket.close()
+                self.server_socket = None
+            return False
+
+    def stop_server(self):
+        """Остановка сервера"""
+        if not self.is_running:
+            return
+            
+        try:
+            # Останавливаем сервер
+            self.is_running = False
+            
+            # Закрываем соединения и останавливаем цикл событий
+            if self.loop and self.loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+                try:
+                    future.result(timeout=5.0)
+                except Exception as e:
+                    self._log("Ошибка при закрытии соединений: %s", e, level=ERROR)
+                    
+            if self.server_thread and self.server_thread is not threading.current_thread():
+                self.server_thread.join(5.0)
+                
+            self.clients = {}
+            self.client_id_counter = 0
+            
+            # Записываем на диск все принятые измерения
+            if self.store:
+                self.store.close()
+                
+            self._log("Сервер остановлен")
+            self._emit('server_stopped')
+            
+        except Exception as e:
+            self._log("Ошибка при остановке сервера: %s", e, level=ERROR)
+            
+    def _run_event_loop(self):
+        """Поток цикла событий сервера"""
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._start_listening())
+            self.loop.run_forever()
+        except Exception as e:
+            if self.is_running:
+                self._log("Ошибка в цикле событий сервера: %s", e, level=ERROR)
+        finally:
+            try:
+                self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            finally:
+                self.loop.close()
+                
+            # Если цикл завершился, но сервер еще запущен, останавливаем его
+            if self.is_running:
+                self.stop_server()
+                
+    async def _start_listening(self):
+        """Начинает прием подключений на серверном сокете"""
+        self.async_server = await asyncio.start_server(
+            self._handle_client,
+            sock=self.server_socket,
+            limit=RECV_BUFFER_SIZE
+        )
+        self._log("Сервер запущен на порту %s", self.port)
+        
+    async def _shutdown(self):
+        """Закрывает все соединения и останавливает цикл событий"""
+        if self.async_server:
+            self.async_server.close()
+            
+        for writer, _ in list(self.clients.values()):
+            writer.close()
+            
+        if self.async_server:
+            await self.async_server.wait_closed()
+        self.async_server = None
+        
+        # Даем обработчикам клиентов завершиться
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=1.0)
+        asyncio.get_running_loop().stop()
+        
+    async def _handle_client(self, reader, writer):
+        """Обработка клиента (сопрограмма в цикле событий сервера)"""
+        client_address = writer.get_extra_info('peername')[:2]
+        # Добавляем клиента в список, используя строковый ID в формате ip:port
+        client_id = f"{client_address[0]}:{client_address[1]}"
+        self._log("Новое подключение с ID: %s", client_id)
+        self.clients[client_id] = (writer, client_address)
+        
+        # Отправляем сигнал о подключении клиента
+        self._log("Клиент подключен: %s:%s", client_address[0], client_address[1])
+        self._emit('client_connected', client_address[0], client_address[1])
+        
+        # Ответы на несколько запросов подряд уходят без задержки алгоритма Нейгла
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
+        loop = asyncio.get_running_loop()
+        decoder = MessageDecoder()
+        try:
+            while self.is_running:
+                # Ждем данных без опроса: цикл событий разбудит нас сам
+                data = await reader.read(RECV_BUFFER_SIZE)
+                if not data:
+                    # Клиент отключился
+                    break
+                    
+                # Обрабатываем каждое полностью полученное сообщение
+                for payload in decoder.feed(data):
+                    if is_sample(payload):
+                        # Двоичный образец скорости - без разбора JSON и записи в лог
+                        self._process_sample(client_id, payload)
+                        continue
+                    if is_sample_batch(payload):
+                        self._process_sample_batch(client_id, payload)
+                        continue
+                        
+                    message = self._decode_client_data(client_id, payload, client_address)
+                    if message is None:
+                        continue
+                        
+                    if message.get('type') in AGENT_MESSAGE_TYPES:
+                        # Сообщения агента только передаются в сигналы
+                        self._process_client_message(client_id, message)
+                    elif message.get('type') in SUBSCRIPTION_REQUEST_TYPES:
+                        self._process_subscription(client_id, message)
+                    elif message['type'] in INLINE_REQUEST_TYPES:
+                        self._process_request(client_id, message)
+                    elif 'id' in message and message['type'] not in ORDERED_REQUEST_TYPES:
+                        # Клиент сопоставляет ответы по id, поэтому не ждем
+                        # завершения запроса перед чтением следующего
+                        loop.run_in_executor(None, self._process_request, client_id, message)
+                    else:
+                        # Запросы могут обращаться к WMI и psutil, поэтому
+                        # выполняются вне цикла событий
+                        await loop.run_in_executor(None, self._process_request, client_id, message)
+                        
+        except ProtocolError as e:
+            self._log("Нарушение протокола клиентом %s:%s: %s", client_address[0], client_address[1], e, level=ERROR)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            self._log("Ошибка в обработчике клиента %s:%s: %s", client_address[0], client_address[1], e, level=ERROR)
+            
+        finally:
+            # Закрываем соединение с клиентом
+            try:
+                writer.close()
+            except:
+                pass
+                
+            # Удаляем клиента из списка, если он еще там
+            if client_id in self.clients:
+                del self.clients[client_id]
+                
+            # Закрываем подписку и измерение клиента
+            self._cancel_subscription(client_id)
+            self._close_session(client_id)
+            self.sample_streams.pop(client_id, None)
+            self.snapshots.pop(client_id, None)
+                
+            # Отправляем сигнал об отключении клиента
+            self._log("Клиент отключен: %s:%s", client_address[0], client_address[1])
+            self._emit('client_disconnected', client_address[0], client_address[1])
+            
+    def _decode_client_data(self, client_id, data, client_address):
+        """Декодирование сообщения от клиента
+        
+        Returns:
+            dict: Сообщение или None, если данные некорректны
+        """
+        try:
+            # Пытаемся декодировать данные как JSON
+            message = decode_payload(data)
+            
+            # Логируем полученное сообщение
+            self._log("Получено от %s:%s: %s", client_address[0], client_address[1], message, level=DEBUG)
+            
+            if not isinstance(message, dict) or 'type' not in message:
+                self._log("Получено сообщение без типа: %s", message, level=WARNING)
+                return None
+            return message
+            
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self._log("Получены некорректные данные от %s:%s", client_address[0], client_address[1], level=WARNING)
+            return None
+            
+    def _process_request(self, client_id, message):
+        """Обработка запроса к серверу (выполняется в пуле потоков или,
+        для INLINE_REQUEST_TYPES, в цикле событий)
+
+        Если в запросе указан id, он возвращается в ответе, чтобы клиент
+        мог сопоставить ответы с запросами независимо от их порядка.
+        """
+        if client_id not in self.clients:
+            return
+            
+        request_id = message.get('id')
+        try:
+            if message['type'] == 'get_adapters':
+                self._send_adapters_list(client_id, request_id)
+            elif message['type'] == 'get_adapter_info':
+                self._send_adapter_info(client_id, message.get('adapter'), request_id)
+            elif message['type'] == 'get_snapshot':
+                # Все адаптеры сервера со сведениями и счетчиками одним ответом
+                response = {'type': 'snapshot'}
+                response.update(self.network_monitor.get_snapshot())
+                self._reply(client_id, response, request_id)
+            elif message['type'] == 'get_speeds':
+                self._send_speeds(client_id, message.get('adapter'), request_id)
+            elif message['type'] == 'start_measurement':
+                # Запускаем измерение для указанного адаптера
+                adapter_name = message.get('adapter')
+                if not adapter_name:
+                    raise ValueError("Не указан адаптер для измерения")
+                # У каждого клиента своя сессия, чтобы измерения разных
+                # клиентов не сбрасывали друг друга
+                self._close_session(client_id)
+                self.sessions[client_id] = self.network_monitor.open_session(adapter_name)
+                response = {
+                    'type': 'measurement_started',
+                    'adapter': adapter_name
+                }
+                self._reply(client_id, response, request_id)
+                self._log("Запущено измерение для адаптера %s", adapter_name)
+            elif message['type'] == 'stop_measurement':
+                # Останавливаем измерение
+                self._close_session(client_id)
+                response = {
+                    'type': 'measurement_stopped'
+                }
+                self._reply(client_id, response, request_id)
+                self._log("Измерение остановлено")
+            else:
+                raise ValueError(f"Неизвестный тип сообщения: {message['type']}")
+        except Exception as e:
+            error_message = {
+                'type': 'error',
+                'message': str(e)
+            }
+            self._reply(client_id, error_message, request_id)
+            self._log("Ошибка при обработке сообщения: %s", e, level=ERROR)
+            
+    def _process_subscription(self, client_id, message):
+        """Обработка подписки на скорость (выполняется в цикле событий)
+
+        После подписки сервер сам отправляет клиенту сообщения speeds_update
+        с заданным интервалом, пока клиент не отпишется или не отключится.
+        Подписка не зависит от сессии измерения: пока измерение не запущено,
+        сообщения не отправляются.
+        """
+        request_id = message.get('id')
+        if message['type'] == 'unsubscribe':
+            self._cancel_subscription(client_id)
+            self._reply(client_id, {'type': 'unsubscribed'}, request_id)
+            self._log("Клиент %s отписался от данных о скорости", client_id)
+            return
+
+        try:
+            interval = normalize_interval(message.get('interval'))
+        except (TypeError, ValueError):
+            interval = normalize_interval(None)
+
+        self._cancel_subscription(client_id)
+        self.subscriptions[client_id] = asyncio.get_running_loop().create_task(
+            self._push_speeds(client_id, interval)
+        )
+        self._reply(client_id, {'type': 'subscribed', 'interval': interval}, request_id)
+        self._log("Клиент %s подписался на данные о скорости (интервал %s с)", client_id, interval)
+
+    async def _push_speeds(self, client_id, interval):
+        """Периодическая отправка скорости подписанному клиенту
+        
+        Если клиент не успевает читать и в буфере отправки накопилось больше
+        PUSH_HIGH_WATER байт, такт пропускается: скорость считается по
+        счетчикам, поэтому следующее сообщение охватит пропущенный интервал.
+        """
+        schedule = PeriodicSchedule(interval)
+        skipped = 0
+        while client_id in self.clients:
+            await asyncio.sleep(schedule.next_delay())
+
+            session = self.sessions.get(client_id)
+            if session is None or client_id not in self.clients:
+                continue
+            writer = self.clients[client_id][0]
+            if writer.transport.get_write_buffer_size() > PUSH_HIGH_WATER:
+                if not skipped:
+                    self._log("Клиент %s не успевает принимать данные о скорости, отправка приостановлена",
+                              client_id, level=WARNING)
+                skipped += 1
+                continue
+            if skipped:
+                self._log("Отправка скорости клиенту %s возобновлена (пропущено сообщений: %s)", client_id, skipped)
+                skipped = 0
+            try:
+                message = self._build_speeds_message(session, 'speeds_update')
+            except Exception as e:
+                self._log("Ошибка при получении скорости для подписчика %s: %s", client_id, e, level=ERROR)
+                continue
+            if message is not None:
+                self._send_message(writer, message)
+
+    def _cancel_subscription(self, client_id):
+        """Отменяет подписку клиента на скорость, если она есть"""
+        task = self.subscriptions.pop(client_id, None)
+        if task is not None:
+            task.cancel()
+
+    def _build_speeds_message(self, session, message_type):
+        """Сообщение с текущей скоростью сессии измерения
+
+        Returns:
+            dict: Сообщение или None, если скорость не удалось получить
+        """
+        speeds = session.get_current_speeds()
+        if speeds is None:
+            return None
+        return {
+            'type': message_type,
+            'adapter_name': session.adapter_name,
+            'speeds': speeds,
+            'time': f"{speeds['stats']['duration']} сек"  # Используем длительность замера вместо текущего времени
+        }
+
+    def _send_adapters_list(self, client_id, request_id=None):
+        """Отправка списка адаптеров клиенту"""
+        if client_id not in self.clients:
+            return
+            
+        try:
+            # Получаем реальный список адаптеров через NetworkMonitor
+            adapters = self.network_monitor.get_adapters()
+            
+            # Формируем и отправляем сообщение
+            message = {
+                'type': 'adapters_list',
+                'adapters': adapters
+            }
+            self._reply(client_id, message, request_id)
+            self._log("Отправлен список адаптеров: %s", adapters, level=DEBUG)
+            
+        except Exception as e:
+            self._log("Ошибка при отправке списка адаптеров: %s", e, level=ERROR)
+            self._reply(client_id, {'type': 'error', 'message': str(e)}, request_id)
+            
+    def _send_adapter_info(self, client_id, adapter_name, request_id=None):
+        """Отправка информации об адаптере клиенту"""
+        if client_id not in self.clients or not adapter_name:
+            return
+            
+        try:
+            # Получаем реальную информацию об адаптере через NetworkMonitor
+            adapter_info = self.network_monitor.get_adapter_info(adapter_name)
+            
+            # Формируем и отправляем сообщение
+            message = {
+                'type': 'adapter_info',
+                'adapter_name': adapter_name,
+                'info': adapter_info
+            }
+            self._reply(client_id, message, request_id)
+            self._log("Отправлена информация об адаптере %s", adapter_name, level=DEBUG)
+            
+        except Exception as e:
+            self._log("Ошибка при отправке информации об адаптере: %s", e, level=ERROR)
+            self._reply(client_id, {'type': 'error', 'message': str(e)}, request_id)
+            
+    def _send_speeds(self, client_id, adapter_name=None, request_id=None):
+        """Отправка информации о скорости сети клиенту"""
+        if client_id not in self.clients:
+            return
+            
+        try:
+            session = self.sessions.get(client_id)
+            if session is None:
+                self._log("Ошибка: измерение скорости не запущено", level=ERROR)
+                error_message = {
+                    'type': 'error',
+                    'message': 'Измерение скорости не запущено'
+                }
+                self._reply(client_id, error_message, request_id)
+                return
+                
+            # Получаем реальные данные о скорости через сессию клиента
+            # (скорость отдается по адаптеру, измерение которого запустил клиент)
+            message = self._build_speeds_message(session, 'speeds')
+            if message is None:
+                error_message = {
+                    'type': 'error',
+                    'message': 'Не удалось получить данные о скорости'
+                }
+                self._reply(client_id, error_message, request_id)
+                return
+                
+            self._reply(client_id, message, request_id)
+            self._log("Отправлена информация о скорости для адаптера %s", session.adapter_name, level=DEBUG)
+            
+        except Exception as e:
+            self._log("Ошибка при отправке информации о скорости: %s", e, level=ERROR)
+            error_message = {
+                'type': 'error',
+                'message': str(e)
+            }
+            self._reply(client_id, error_message, request_id)
+            
+    def _close_session(self, client_id):
+        """Закрывает сессию измерения клиента, если она открыта"""
+        session = self.sessions.pop(client_id, None)
+        if session is not None:
+            self.network_monitor.close_session(session)
+            
+    def _reply(self, client_id, message, request_id=None):
+        """Отправка ответа на запрос клиента
+
+        Args:
+            client_id: Идентификатор клиента
+            message: Ответ
+            request_id: id запроса (None - запрос без id)
+        """
+        client = self.clients.get(client_id)
+        if client is None:
+            return
+        if request_id is not None:
+            message['id'] = request_id
+        self._send_message(client[0], message)
+        
+    def _send_message(self, writer, message):
+        """Отправка сообщения клиенту
+        
+        Может вызываться из любого потока: запись в сокет всегда
+        выполняется в цикле событий сервера.
+        
+        Args:
+            writer: Поток записи клиента
+            message: Сообщение для отправки
+        """
+        try:
+            # Упаковываем сообщение в кадр и отправляем
+            data = encode_message(message)
+            if self._in_event_loop():
+                writer.write(data)
+            else:
+                self.loop.call_soon_threadsafe(writer.write, data)
+        except Exception as e:
+            self._log("Ошибка при отправке сообщения: %s", e, level=ERROR)
+            
+    def _in_event_loop(self):
+        """Проверяет, выполняется ли код в потоке цикла событий сервера"""
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+            
+    def broadcast_message(self, message):
+        """Отправка сообщения всем подключенным клиентам"""
+        for client_id in list(self.clients.keys()):
+            self._send_message(self.clients[client_id][0], message)
+            
+    def get_clients_count(self):
+        """Получение количества подключенных клиентов"""
+        return len(self.clients)
+        
+    def get_clients_list(self):
+        """Получение списка подключенных клиентов"""
+        return [(client_address[0], client_address[1]) for _, client_address in self.clients.values()]
+
+    def process_command(self, command: dict) -> dict:
+        """Обрабатывает команды от клиента"""
+        try:
+            cmd_type = command.get('type')
+            
+            if cmd_type == 'get_adapters':
+                adapters = self.network_monitor.get_adapters()
+                print(f"Отправляем список адаптеров: {adapters}")
+                return {
+                    'type': 'adapters_list',
+                    'adapters': adapters
+                }
+                
+            elif cmd_type == 'get_adapter_info':
+                adapter_name = command.get('adapter')
+                print(f"Получаем информацию об адаптере: {adapter_name}")
+                info = self.network_monitor.get_adapter_info(adapter_name)
+                print(f"Информация об адаптере: {info}")
+                return {
+                    'type': 'adapter_info',
+                    'info': info
+                }
+                
+            elif cmd_type == 'start_measurement':
+                adapter_name = command.get('adapter')
+                self.network_monitor.start_measurement(adapter_name)
+                return {'type': 'measurement_started'}
+                
+            elif cmd_type == 'stop_measurement':
+                self.network_monitor.stop_measurement()
+                return {'type': 'measurement_stopped'}
+                
+            elif cmd_type == 'get_speeds':
+                speeds = self.network_monitor.get_current_speeds()
+                return {
+                    'type': 'speeds_data',
+                    'data': speeds
+                }
+                
+            return {'type': 'error', 'message': 'Неизвестная команда'}
+            
+        except Exception as e:
+            print(f"Ошибка при обработке команды: {e}")
+            return {'type': 'error', 'message': str(e)}
+
+    def request_adapters_list(self, client_id):
+        """Запрос списка адаптеров у клиента
+        
+        Args:
+            client_id: Идентификатор клиента в формате ip:port
+        """
+        self._log("Запрашиваем список адаптеров для клиента %s", client_id, level=DEBUG)
+        self._log("Сервер запущен: %s, клиенты: %s", self.is_running, list(self.clients), level=DEBUG)
+        
+        if not self.is_running:
+            self._log("Ошибка: сервер не запущен", level=ERROR)
+            return False
+            
+        if client_id not in self.clients:
+            self._log("Ошибка: клиент %s не найден в списке", client_id, level=ERROR)
+            return False
+            
+        message = {
+            'type': 'get_adapters',
+        }
+        
+        try:
+            writer = self.clients[client_id][0]
+            self._send_message(writer, message)
+            return True
+        except Exception as e:
+            self._log("Ошибка при запросе списка адаптеров: %s", e, level=ERROR)
+            return False
+            
+    def request_snapshot(self, client_id):
+        """Запрос всех адаптеров клиента со сведениями и счетчиками
+        
+        Результат приходит событием snapshot_received. Снимок хранится до
+        изменения адаптеров агента, но не дольше SNAPSHOT_TTL, поэтому
+        повторный выбор клиента не отправляет ему запросов. Счетчики в
+        сохраненном снимке не хранятся: они есть только в ответе агента.
+        Агенту без поддержки снимка отправляется обычный запрос списка
+        адаптеров (событие adapters_list_received).
+        
+        Args:
+            client_id: Идентификатор клиента в формате ip:port
+        """
+        if not self.is_running or client_id not in self.clients:
+            return False
+            
+        snapshot = self._cached_snapshot(client_id)
+        if snapshot is not None:
+            self._emit('snapshot_received', client_id, snapshot)
+            return True
+            
+        if SNAPSHOT not in self.client_info.get(client_id, {}).get('capabilities', ()):
+            return self.request_adapters_list(client_id)
+            
+        try:
+            writer = self.clients[client_id][0]
+            self._send_message(writer, {'type': 'get_snapshot'})
+            return True
+        except Exception as e:
+            self._log("Ошибка при запросе снимка адаптеров: %s", e, level=ERROR)
+            return False
+            
+    def _cached_snapshot(self, client_id):
+        """Сохраненный снимок адаптеров клиента или None, если его нет или он устарел"""
+        cached = self.snapshots.get(client_id)
+        if cached is None:
+            return None
+        received, adapters = cached
+        if time.monotonic() - received > SNAPSHOT_TTL:
+            self.snapshots.pop(client_id, None)
+            return None
+        return adapters
+        
+    def request_adapter_info(self, client_id, adapter):
+        """Запрос информации об адаптере у клиента
+        
+        Если сведения есть в снимке адаптеров клиента, событие
+        adapter_info_received отправляется сразу, без запроса.
+        
+        Args:
+            client_id: Идентификатор клиента в формате ip:port
+            adapter: Имя адаптера
+        """
+        if not self.is_running or client_id not in self.clients:
+            return False
+            
+        for adapter_snapshot in self._cached_snapshot(client_id) or ():
+            if adapter_snapshot['name'] == adapter:
+                self._emit('adapter_info_received', client_id, adapter, adapter_snapshot['info'])
+                return True
+            
+        message = {
+            'type': 'get_adapter_info',
+            'adapter': adapter
+        }
+        
+        try:
+            writer = self.clients[client_id][0]
+            self._send_message(writer, message)
+            return True
+        except Exception as e:
+            self._log("Ошибка при запросе информации об адаптере: %s", e, level=ERROR)
+            return False
+            
+    def start_monitoring(self, client_id, adapter, interval=None, batch_window=None, batch_samples=None):
+        """Запуск мониторинга скорости на клиенте
+        
+        Args:
+            client_id: Идентификатор клиента в формате ip:port
+            adapter: Имя адаптера
+            interval: Интервал измерения в секундах (None - интервал клиента)
+            batch_window: Сколько секунд клиент накапливает образцы перед
+                отправкой (0 - отправлять сразу, None - настройка клиента)
+            batch_samples: Максимальное количество образцов в пакете
+        """
+        if not self.is_running or client_id not in self.clients:
+            return False
+            
+        message = {
+            'type': 'start_monitoring',
+            'adapter': adapter
+        }
+        if interval is not None:
+            message['interval'] = interval
+        if batch_window is not None:
+            message['batch_window'] = batch_window
+        if batch_samples is not None:
+            message['batch_samples'] = batch_samples
+        
+        try:
+            writer = self.clients[client_id][0]
+            self._send_message(writer, message)
+            return True
+        except Exception as e:
+            self._log("Ошибка при запуске мониторинга: %s", e, level=ERROR)
+            return False
+            
+    def stop_monitoring(self, client_id, adapter=None):
+        """Остановка мониторинга скорости на клиенте
+        
+        Args:
+            client_id: Идентификатор клиента в формате ip:port
+            adapter: Имя адаптера (None - остановить мониторинг всех адаптеров)
+        """
+        if not self.is_running or client_id not in self.clients:
+            return False
+            
+        message = {
+            'type': 'stop_monitoring'
+        }
+        if adapter:
+            message['adapter'] = adapter
+        
+        try:
+            writer = self.clients[client_id][0]
+            self._send_message(writer, message)
+            return True
+        except Exception as e:
+            self._log("Ошибка при остановке мониторинга: %s", e, level=ERROR)
+            return False
+
+    def _process_client_message(self, client_id, message):
+        """Обработка сообщения от клиента
+        
+        Args:
+            client_id: Идентификатор клиента
+            message: Полученное сообщение
+            
+        Returns:
+            dict: Ответ клиенту или None, если ответ не требуется
+        """
+        try:
+            message_type = message.get('type')
+            
+            if message_type == 'client_info':
+                # Клиент прислал информацию о себе
+                pc_name = message.get('pc_name', 'Неизвестный ПК')
+                self.client_info[client_id] = {'pc_name': pc_name}
+                self._log("Получена информация о клиенте %s: %s", client_id, pc_name)
+                
+                # Сообщаем клиенту, какие из его возможностей поддерживает сервер
+                if 'capabilities' in message:
+                    capabilities = [c for c in CAPABILITIES if c in message['capabilities']]
+                    self.client_info[client_id]['capabilities'] = capabilities
+                    self._send_message(self.clients[client_id][0], {
+                        'type': 'capabilities',
+                        'capabilities': capabilities
+                    })
+                return None
+                
+            elif message_type == 'adapters_list':
+                # Клиент прислал список адаптеров
+                adapters = message.get('adapters', [])
+                self._emit('adapters_list_received', client_id, adapters)
+                return None
+                
+            elif message_type == 'adapter_info':
+                # Клиент прислал информацию об адаптере
+                adapter = message.get('adapter', '')
+                info = message.get('info', {})
+                self._emit('adapter_info_received', client_id, adapter, info)
+                return None
+                
+            elif message_type == 'snapshot':
+                # Клиент прислал все адаптеры со сведениями и счетчиками
+                adapters = message.get('adapters', [])
+                # Счетчики быстро устаревают, поэтому сохраняются только сведения
+                self.snapshots[client_id] = (time.monotonic(), [
+                    {key: value for key, value in adapter.items() if key != 'counters'}
+                    for adapter in adapters
+                ])
+                self._emit('snapshot_received', client_id, adapters)
+                return None
+                
+            elif message_type == 'speeds_data':
+                if 'sample' in message:
+                    # Образец счетчиков в JSON (агент без двоичных образцов)
+                    self._ingest_samples(client_id, [tuple(message['sample'])])
+                else:
+                    # Старые агенты присылают уже вычисленную скорость
+                    adapter = message.get('adapter', '')
+                    data = message.get('data', {})
+                    self._on_speeds_data(client_id, adapter, data)
+                return None
+                
+            elif message_type == 'speeds_batch':
+                # Клиент прислал пакет образцов счетчиков в JSON
+                self._ingest_samples(client_id, [tuple(sample) for sample in message.get('samples', [])],
+                                     batch=True)
+                return None
+                
+            elif message_type == 'adapter_event':
+                # Агент сообщил об изменении адаптера (добавлен, удален, включен, отключен)
+                event = message.get('event', '')
+                adapter = message.get('adapter', '')
+                self._log("Клиент %s: адаптер %s - %s", client_id, adapter, event)
+                # Снимок адаптеров устарел - следующий запрос получит новый
+                self.snapshots.pop(client_id, None)
+                self._emit('adapter_event_received', client_id, event, adapter)
+                return None
+                
+            elif message_type == 'adapter_id':
+                # Клиент объявил id адаптера для образцов счетчиков;
+                # статистика по этому id начинается заново
+                adapter_id = int(message['id'])
+                streams = self.sample_streams.setdefault(client_id, {})
+                streams[adapter_id] = SampleStats(message.get('adapter', ''))
+                return None
+                
+            else:
+                # Неизвестный тип сообщения
+                self._log("Неизвестный тип сообщения от клиента %s: %s", client_id, message_type, level=WARNING)
+                return None
+                
+        except Exception as e:
+            self._log("Ошибка при обработке сообщения от клиента %s: %s", client_id, e, level=ERROR)
+            return None
+            
+    def _process_sample(self, client_id, payload):
+        """Обработка двоичного образца счетчиков от агента"""
+        try:
+            self._ingest_samples(client_id, [decode_sample(payload)])
+        except Exception as e:
+            self._log("Ошибка при обработке образца от клиента %s: %s", client_id, e, level=ERROR)
+            
+    def _process_sample_batch(self, client_id, payload):
+        """Обработка пакета двоичных образцов счетчиков от агента"""
+        try:
+            self._ingest_samples(client_id, decode_sample_batch(payload), batch=True)
+        except Exception as e:
+            self._log("Ошибка при обработке пакета образцов от клиента %s: %s", client_id, e, level=ERROR)
+            
+    def _ingest_samples(self, client_id, records, batch=False):
+        """Вычисление скорости по образцам счетчиков агента
+
+        Образцы группируются по адаптерам, и по каждому адаптеру
+        выполняется одна запись в хранилище и одно событие. Первый образец
+        после объявления адаптера только запоминает счетчики.
+
+        Args:
+            client_id: Идентификатор клиента
+            records: Кортежи (adapter_id, timestamp_ns, счетчики COUNTER_FIELDS)
+            batch: Образцы пришли пакетом (событие speeds_batch_received)
+        """
+        if not records:
+            return
+        streams = self.sample_streams.get(client_id, {})
+
+        # Время образцов по часам сервера - через смещение часов агента,
+        # зафиксированное для адаптера по первому пакету
+        now = time.time()
+        last_ns = max(record[1] for record in records)
+
+        batches = {}
+        unknown = set()
+        for adapter_id, timestamp_ns, *counters in records:
+            stream = streams.get(adapter_id)
+            if stream is None:
+                unknown.add(adapter_id)
+                continue
+            timestamp = stream.wall_time(timestamp_ns, now, last_ns)
+            data = stream.update(timestamp_ns, counters)
+            if data is None:
+                continue
+            data['timestamp'] = timestamp
+            batches.setdefault(stream.adapter, []).append(data)
+
+        if unknown:
+            self._log("Образцы необъявленных адаптеров %s от клиента %s", sorted(unknown), client_id, level=WARNING)
+        for adapter, samples in batches.items():
+            if batch:
+                self._on_speeds_batch(client_id, adapter, samples)
+            else:
+                for data in samples:
+                    self._on_speeds_data(client_id, adapter, data)
+            
+    def _on_speeds_batch(self, client_id, adapter, batch):
+        """Сохранение и рассылка пакета данных о скорости одного адаптера"""
+        if self.store and self.store.is_open:
+            self.store.extend(self.get_history_key(client_id), adapter, [
+                (data['timestamp'], data.get('download', 0.0), data.get('upload', 0.0))
+                for data in batch
+            ])
+        self._emit('speeds_batch_received', client_id, adapter, batch)
+        
+    def _on_speeds_data(self, client_id, adapter, data):
+        """Сохранение и рассылка полученных данных о скорости"""
+        if self.store and self.store.is_open:
+            # Время образца, как и в пакете; без него - время получения
+            self.store.append(self.get_history_key(client_id), adapter,
+                              data.get('download', 0.0), data.get('upload', 0.0),
+                              data.get('timestamp'))
+        self._emit('speeds_data_received', client_id, adapter, data)
+        
+    def _on_store_error(self, error):
+        """Ошибка записи истории измерений (вызывается в потоке записи)"""
+        self._log("Ошибка записи истории измерений: %s", error, level=ERROR)
+        
+    def get_history_key(self, client_id):
+        """Ключ клиента в хранилище измерений
+        
+        Используется имя ПК, чтобы история не терялась при переподключении
+        клиента с другого порта. Пока имя неизвестно, используется ip:port.
+        """
+        info = self.client_info.get(client_id)
+        if info and info.get('pc_name'):
+            return info['pc_name']
+        return client_id
+        
+    def query_history(self, client_name, adapter, start=None, end=None):
+        """Выборка сохраненной истории скорости
+        
+        Args:
+            client_name: Ключ клиента в хранилище (см. get_history_key)
+            adapter: Имя адаптера
+            start: Начало интервала (UNIX time)
+            end: Конец интервала (UNIX time)
+            
+        Returns:
+            list: Кортежи (timestamp, download, upload)
+        """
+        if not self.store:
+            return []
+        return self.store.query(client_name, adapter, start, end)
+        
+    def get_client_name(self, client_id):
+        """Получение имени ПК клиента
+        
+        Args:
+            client_id: Идентификатор клиента
+            
+        Returns:
+            str: Имя ПК клиента или "Неизвестный ПК"
+        """
+        if client_id in self.client_info:
+            return self.client_info[client_id].get('pc_name', 'Неизвестный ПК')
+        return 'Неизвестный ПК' 
\ No newline at end of file
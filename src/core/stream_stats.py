@@ -0,0 +1,314 @@
+"""
+Потоковая статистика ряда скорости.
+
+Каждый образец учитывается без хранения истории (за O(1), гистограмма -
+за O(log B) по количеству корзин), поэтому статистика одинаково дешева
+на агенте, на сервере (по образцу на каждый адаптер каждого клиента) и в
+окне:
+
+- Ewma - экспоненциальное скользящее среднее с учетом интервала между
+  образцами (неравномерный интервал не меняет постоянную времени);
+- RunningVariance - среднее и дисперсия по алгоритму Уэлфорда;
+- WindowMinMax - минимум и максимум за последние window секунд на
+  монотонных очередях (каждый образец добавляется и удаляется один раз);
+- LogHistogram - процентили по гистограмме с логарифмическими корзинами
+  (как в HdrHistogram): относительная погрешность не больше precision,
+  процентили считаются только при чтении.
+
+StreamStats объединяет их для одного ряда. Модуль использует только
+стандартную библиотеку: агенту и серверу без интерфейса numpy не нужен.
+"""
+
+import math
+from array import array
+from collections import deque
+
+DEFAULT_TIME_CONSTANT = 10.0  # Постоянная времени EWMA, секунды
+DEFAULT_WINDOW = 60.0  # Окно минимума и максимума, секунды
+DEFAULT_PRECISION = 0.01  # Относительная погрешность процентилей
+LOWEST_VALUE = 0.01  # Меньшие значения (в том числе 0) попадают в нулевую корзину
+HIGHEST_VALUE = 1e8  # Большие значения попадают в последнюю корзину
+PERCENTILES = (50, 95, 99)
+
+
+class Ewma:
+    """Экспоненциальное скользящее среднее по времени"""
+    __slots__ = ('time_constant', 'value')
+
+    def __init__(self, time_constant=DEFAULT_TIME_CONSTANT):
+        """
+        Args:
+            time_constant: Время, за которое вклад образца убывает в e раз, секунды
+        """
+        self.time_constant = time_constant
+        self.value = None
+
+    def reset(self):
+        self.value = None
+
+    def update(self, value, interval):
+        """Учитывает образец
+
+        Args:
+            value: Значение
+            interval: Время с предыдущего образца, секунды
+
+        Returns:
+            float: Новое значение среднего
+        """
+        if self.value is None:
+            self.value = value
+        else:
+            alpha = 1.0 - math.exp(-interval / self.time_constant)
+            self.value += alpha * (value - self.value)
+        return self.value
+
+
+class RunningVariance:
+    """Среднее и дисперсия по алгоритму Уэлфорда (устойчив к потере точности)"""
+    __slots__ = ('count', 'mean', '_m2')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Сумма квадратов отклонений от среднего
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """Выборочная дисперсия (0 для меньше чем двух образцов)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+
+class WindowMinMax:
+    """Минимум и максимум за последние window секунд
+
+    В очереди минимумов значения возрастают, в очереди максимумов убывают:
+    новый образец вытесняет с конца значения, которые уже не могут стать
+    минимумом (максимумом), а устаревшие удаляются с начала. Амортизированно
+    O(1) на образец; в очередях не больше образцов, чем пришло за окно.
+    """
+    __slots__ = ('window', '_mins', '_maxs')
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        """
+        Args:
+            window: Длина окна, секунды
+        """
+        self.window = window
+        self._mins = deque()  # (время, значение)
+        self._maxs = deque()
+
+    def reset(self):
+        self._mins.clear()
+        self._maxs.clear()
+
+    def update(self, value, timestamp):
+        """Учитывает образец
+
+        Args:
+            value: Значение
+            timestamp: Время образца, секунды (монотонное)
+        """
+        mins = self._mins
+        while mins and mins[-1][1] >= value:
+            mins.pop()
+        mins.append((timestamp, value))
+        maxs = self._maxs
+        while maxs and maxs[-1][1] <= value:
+            maxs.pop()
+        maxs.append((timestamp, value))
+
+        # Последний образец не старше окна, поэтому очереди не опустеют
+        horizon = timestamp - self.window
+        while mins[0][0] < horizon:
+            mins.popleft()
+        while maxs[0][0] < horizon:
+            maxs.popleft()
+
+    @property
+    def min(self):
+        return self._mins[0][1] if self._mins else None
+
+    @property
+    def max(self):
+        return self._maxs[0][1] if self._maxs else None
+
+
+class LogHistogram:
+    """Гистограмма с логарифмическими корзинами для процентилей
+
+    Корзина i >= 1 охватывает [lowest * g^(i - 1), lowest * g^i), где
+    g = (1 + precision)^2, а значением корзины считается ее геометрическая
+    середина, поэтому погрешность процентиля не больше precision. Корзина 0
+    - значения меньше lowest (в том числе 0), последняя - больше highest;
+    их значениями считаются наблюдавшиеся минимум и максимум.
+
+    Количества образцов хранятся в дереве Фенвика по корзинам: добавление
+    образца и поиск процентиля - O(log B), где B - количество корзин
+    (около 1160 при настройках по умолчанию), независимо от распределения
+    значений.
+    """
+    __slots__ = ('lowest', 'count', 'min', 'max', '_log_lowest', '_inv_log_growth',
+                 '_buckets', '_tree', '_top_step')
+
+    def __init__(self, precision=DEFAULT_PRECISION, lowest=LOWEST_VALUE, highest=HIGHEST_VALUE):
+        """
+        Args:
+            precision: Относительная погрешность процентилей
+            lowest: Нижняя граница первой корзины
+            highest: Верхняя граница диапазона корзин
+        """
+        self.lowest = lowest
+        self._log_lowest = math.log(lowest)
+        self._inv_log_growth = 1.0 / (2 * math.log1p(precision))
+        self._buckets = 2 + int(math.ceil((math.log(highest) - self._log_lowest) * self._inv_log_growth))
+        self._top_step = 1 << (self._buckets.bit_length() - 1)  # Старшая степень двойки для поиска
+        self.reset()
+
+    def reset(self):
+        self._tree = array('Q', bytes(8 * (self._buckets + 1)))  # Дерево Фенвика, индексы с 1
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def update(self, value):
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if value < self.lowest:
+            index = 0
+        else:
+            index = 1 + int((math.log(value) - self._log_lowest) * self._inv_log_growth)
+            if index >= self._buckets:
+                index = self._buckets - 1
+
+        tree = self._tree
+        size = self._buckets
+        position = index + 1
+        while position <= size:
+            tree[position] += 1
+            position += position & -position
+
+    def percentile(self, percent):
+        """Значение, не больше которого percent процентов образцов
+
+        Args:
+            percent: Процентиль от 0 до 100
+
+        Returns:
+            float: Оценка значения (в пределах наблюдавшихся минимума и
+                максимума) или None, если образцов не было
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(percent / 100 * self.count))  # Номер образца по возрастанию
+
+        # Спуск по дереву: последняя позиция, до которой включительно меньше rank образцов
+        tree = self._tree
+        size = self._buckets
+        position = 0
+        step = self._top_step
+        while step:
+            following = position + step
+            if following <= size and tree[following] < rank:
+                position = following
+                rank -= tree[following]
+            step >>= 1
+        return self._bucket_value(position)  # Корзина с образцом номер rank (с 0)
+
+    def _bucket_value(self, index):
+        """Геометрическая середина корзины в пределах наблюдавшихся значений"""
+        if index == 0:
+            return self.min
+        if index == self._buckets - 1:
+            return self.max  # Значения выше highest: точнее границы не знаем
+        estimate = math.exp(self._log_lowest + (index - 0.5) / self._inv_log_growth)
+        return min(max(estimate, self.min), self.max)
+
+
+class StreamStats:
+    """Потоковая статистика одного ряда (например, скорости загрузки)"""
+    __slots__ = ('maximum', 'ewma', 'variance', 'window', 'histogram')
+
+    def __init__(self, time_constant=DEFAULT_TIME_CONSTANT, window=DEFAULT_WINDOW,
+                 precision=DEFAULT_PRECISION):
+        """
+        Args:
+            time_constant: Постоянная времени EWMA, секунды
+            window: Окно минимума и максимума, секунды
+            precision: Относительная погрешность процентилей
+        """
+        self.maximum = 0.0
+        self.ewma = Ewma(time_constant)
+        self.variance = RunningVariance()
+        self.window = WindowMinMax(window)
+        self.histogram = LogHistogram(precision)
+
+    def reset(self):
+        """Начинает статистику заново"""
+        self.maximum = 0.0
+        self.ewma.reset()
+        self.variance.reset()
+        self.window.reset()
+        self.histogram.reset()
+
+    @property
+    def count(self):
+        return self.variance.count
+
+    @property
+    def mean(self):
+        """Среднее по образцам (не взвешенное по времени)"""
+        return self.variance.mean
+
+    def update(self, value, timestamp, interval):
+        """Учитывает образец
+
+        Args:
+            value: Значение
+            timestamp: Время образца, секунды (монотонное)
+            interval: Время с предыдущего образца, секунды
+        """
+        if value > self.maximum:
+            self.maximum = value
+        self.ewma.update(value, interval)
+        self.variance.update(value)
+        self.window.update(value, timestamp)
+        self.histogram.update(value)
+
+    def summary(self, name):
+        """Статистика для поля 'stats' данных скорости
+
+        Args:
+            name: Имя ряда, добавляемое к ключам ('download', 'upload')
+
+        Returns:
+            dict: max_, ewma_, std_, window_min_, window_max_ и p50_/p95_/p99_
+                с именем ряда (например, 'p95_download')
+        """
+        summary = {
+            f'max_{name}': self.maximum,
+            f'ewma_{name}': self.ewma.value if self.ewma.value is not None else 0.0,
+            f'std_{name}': self.variance.stddev,
+            f'window_min_{name}': self.window.min if self.count else 0.0,
+            f'window_max_{name}': self.window.max if self.count else 0.0,
+        }
+        for percent in PERCENTILES:
+            value = self.histogram.percentile(percent)
+            summary[f'p{percent}_{name}'] = value if value is not None else 0.0
+        return summary
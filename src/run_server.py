@@ -0,0 +1,90 @@
+import argparse
+import os
+import signal
+import sys
+import threading
+import time
+
+# Добавляем корневую директорию проекта в PYTHONPATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.core.log_queue import DEBUG, LEVEL_NAMES, WARNING
+from src.core.measurement_store import MeasurementStore, default_store_path
+from src.core.server_core import ServerCore
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Сервер мониторинга сетевых адаптеров (без графического интерфейса)")
+    parser.add_argument('--host', default=None,
+                        help="адрес для прослушивания (по умолчанию локальный IP, 0.0.0.0 - все интерфейсы)")
+    parser.add_argument('--port', type=int, default=5000, help="порт сервера (по умолчанию 5000)")
+    parser.add_argument('--db', default=default_store_path(),
+                        help="файл хранилища измерений (по умолчанию %(default)s)")
+    parser.add_argument('--no-store', action='store_true', help="не сохранять измерения на диск")
+    parser.add_argument('--retention-days', type=float, default=None,
+                        help="срок хранения измерений в днях (по умолчанию без ограничения)")
+    parser.add_argument('--quiet', action='store_true', help="не выводить лог сервера")
+    parser.add_argument('--verbose', action='store_true',
+                        help="выводить отладочные сообщения (каждое полученное сообщение)")
+    return parser.parse_args()
+
+
+LOG_INTERVAL = 0.2  # секунды между выводом накопившихся записей лога
+
+
+def print_log(records):
+    """Вывод записей лога с отметкой времени одной записью в stdout"""
+    if not records:
+        return
+    lines = []
+    for timestamp, level, text in records:
+        stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+        prefix = f"{LEVEL_NAMES.get(level, level)}: " if level >= WARNING else ""
+        lines.append(f"[{stamp}] {prefix}{text}")
+    print("\n".join(lines), flush=True)
+
+
+def main():
+    """Запуск сервера в фоновом режиме"""
+    args = parse_args()
+    store = None
+    if not args.no_store:
+        retention = args.retention_days * 86400 if args.retention_days else None
+        store = MeasurementStore(args.db, retention=retention)
+    server = ServerCore(store)
+    if args.verbose:
+        server.log.level = DEBUG
+
+    if not server.start_server(args.port, args.host):
+        # Причина ошибки осталась в очереди лога; выводим ее и при --quiet
+        print_log(server.log.drain())
+        sys.exit(1)
+
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    # Ждем сигнала остановки, выводя лог пачками; таймаут также позволяет
+    # обработать Ctrl+C в Windows
+    while not stop_event.wait(LOG_INTERVAL):
+        records = server.log.drain()
+        if not args.quiet:
+            print_log(records)
+        if not server.is_running:
+            break
+
+    server.stop_server()
+    if not args.quiet:
+        print_log(server.log.drain())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,49 @@
 # src/ui/adapter_management.py
 
-from PyQt6.QtWidgets import QTableWidgetItem, QHeaderView
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from src.core.adapter_watcher import ADAPTER_ADDED, ADAPTER_REMOVED
+from src.ui.info_table_model import INFO_FIELDS, MEASUREMENT_FIELDS, MEASUREMENT_FIELD_IDS, info_table_model
+
+class AdapterEventBridge(QObject):
+    """Передает изменения адаптеров из потока наблюдения в поток интерфейса"""
+    adapter_event = pyqtSignal(str, str)  # событие, имя адаптера
 
 class AdapterManagement:
     def __init__(self, window, network_monitor):
         self.window = window
         self.network_monitor = network_monitor
+        self.events_bridge = AdapterEventBridge()
+        self.events_bridge.adapter_event.connect(self.on_adapter_event)
+        self._adapter_listener = self.events_bridge.adapter_event.emit
 
     def setup_table(self):
         """Настройка таблицы с информацией об адаптере"""
-        self.window.adapterInfoTable.setColumnCount(2)
-        self.window.adapterInfoTable.setRowCount(15)
-
-        # Устанавливаем заголовки
-        self.window.adapterInfoTable.setHorizontalHeaderLabels(['Параметр', 'Значение'])
-
-        parameters = [
-            'ID адаптера',
-            'Описание',
-            'Тип интерфейса',
-            'IP адрес',
-            'MAC адрес',
-            'Скорость адаптера',
-            'MTU',
-            'Статус',
-            'Время замера',
-            'Загрузка - текущая',
-            'Загрузка - максимальная',
-            'Загрузка - средняя',
-            'Отдача - текущая',
-            'Отдача - максимальная',
-            'Отдача - средняя'
-        ]
-        for i, param in enumerate(parameters):
-            self.add_table_item(i, 0, param)
-            self.add_table_item(i, 1, '-')
-
-        self.configure_table()
-
-    def add_table_item(self, row, column, text):
-        """Добавляет элемент в таблицу"""
-        item = QTableWidgetItem(text)
-        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        self.window.adapterInfoTable.setItem(row, column, item)
-
-    def configure_table(self):
-        """Настраивает внешний вид таблицы"""
-        self.window.adapterInfoTable.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        self.window.adapterInfoTable.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        self.window.adapterInfoTable.verticalHeader().hide()
-        for i in range(15):
-            self.window.adapterInfoTable.setRowHeight(i, 25)
+        self.table_model = info_table_model(self.window.adapterInfoTable, INFO_FIELDS + MEASUREMENT_FIELDS)
 
     def load_adapters(self):
         """Загружает список адаптеров"""
         adapters = self.window.network_monitor.get_adapters()
         self.window.adapterList.addItems(adapters)
+        # Дальше список обновляется по событиям наблюдателя адаптеров
+        self.network_monitor.add_adapter_listener(self._adapter_listener)
+
+    def stop_watching(self):
+        """Отключает обновление списка адаптеров"""
+        self.network_monitor.remove_adapter_listener(self._adapter_listener)
+
+    def on_adapter_event(self, event, adapter_name):
+        """Обновляет список адаптеров при добавлении, удалении или смене состояния"""
+        adapter_list = self.window.adapterList
+        items = adapter_list.findItems(adapter_name, Qt.MatchFlag.MatchExactly)
+        if event == ADAPTER_ADDED:
+            if not items:
+                adapter_list.addItem(adapter_name)
+        elif event == ADAPTER_REMOVED:
+            for item in items:
+                adapter_list.takeItem(adapter_list.row(item))
+        elif adapter_name == getattr(self.window, 'selected_adapter', None):
+            # Включение или отключение выбранного адаптера меняет его статус в таблице
+            self.show_adapter_info(adapter_name)
 
     def on_adapter_selected(self, adapter_name):
         """Вызывается при выборе адаптера"""
@@ -69,17 +56,6 @@ class AdapterManagement:
         """Отображает информацию об адаптере"""
         adapter_info = self.network_monitor.get_adapter_info(adapter_name) or {}
         
-        # Обновляем значения в таблице
-        self.window.adapterInfoTable.item(0, 1).setText(adapter_info.get('id', '-'))
-        self.window.adapterInfoTable.item(1, 1).setText(adapter_info.get('description', '-'))
-        self.window.adapterInfoTable.item(2, 1).setText(adapter_info.get('interface_type', '-'))
-        self.window.adapterInfoTable.item(3, 1).setText(adapter_info.get('ip', '-'))
-        self.window.adapterInfoTable.item(4, 1).setText(adapter_info.get('mac', '-'))
-        self.window.adapterInfoTable.item(5, 1).setText(adapter_info.get('speed', '-'))
-        self.window.adapterInfoTable.item(6, 1).setText(adapter_info.get('mtu', '-'))
-        self.window.adapterInfoTable.item(7, 1).setText(adapter_info.get('status', '-'))
-        self.window.adapterInfoTable.item(8, 1).setText('-')  # Время замера будет обновляться отдельно
-        
-        # Сбрасываем значения скорости
-        for i in range(9, 15):
-            self.window.adapterInfoTable.item(i, 1).setText('-')
\ No newline at end of file
+        # Обновляем значения в таблице; время и скорость замера сбрасываем
+        self.table_model.update({field_id: adapter_info.get(field_id, '-') for field_id, _ in INFO_FIELDS})
+        self.table_model.clear_values(MEASUREMENT_FIELD_IDS)
@@ -0,0 +1,232 @@
+"""
+Обзор всех клиентов: плитка со спарклайном на каждый ряд (клиент, адаптер).
+
+Плитки - это строки модели (DashboardModel), а не виджеты: модель хранит
+только ключи рядов, а данные для рисования берет из общего хранилища
+истории ServerManagement (RollupSeries в clients_data), в которое уже
+пишут обработчики данных. Рисует плитку делегат (SparklineDelegate), а
+QListView вызывает его только для плиток в видимой области; сигнал
+dataChanged для плитки за пределами экрана не приводит к рисованию.
+Поэтому стоимость кадра зависит от количества видимых плиток, а не от
+количества подключенных адаптеров.
+"""
+
+import numpy as np
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QPointF, QRectF, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate
+
+SPARKLINE_POINTS = 120  # Последних точек на спарклайне
+TILE_SIZE = QSize(220, 90)
+TILE_SPACING = 6
+
+DOWNLOAD_COLOR = QColor(0, 100, 255)  # Как на основном графике
+UPLOAD_COLOR = QColor(255, 50, 50)
+
+# Роль данных: история ряда {'download_speeds': RollupSeries, 'upload_speeds': RollupSeries}
+SERIES_ROLE = Qt.ItemDataRole.UserRole + 1
+# Роль данных: ключ ряда (client_id, adapter)
+KEY_ROLE = Qt.ItemDataRole.UserRole + 2
+
+
+class DashboardModel(QAbstractListModel):
+    """Список рядов (клиент, адаптер) для плиток обзора"""
+
+    def __init__(self, series_lookup, title_lookup=None, parent=None):
+        """
+        Args:
+            series_lookup: Функция series_lookup(client_id, adapter) - история ряда
+                или None, если ее уже нет
+            title_lookup: Функция title_lookup(client_id) - подпись клиента
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.series_lookup = series_lookup
+        self.title_lookup = title_lookup
+        self._keys = []
+        self._rows = {}  # {(client_id, adapter): номер строки}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self._keys[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            client_id, adapter = key
+            title = self.title_lookup(client_id) if self.title_lookup else client_id
+            return f"{title} / {adapter}"
+        if role == SERIES_ROLE:
+            return self.series_lookup(*key)
+        if role == KEY_ROLE:
+            return key
+        return None
+
+    def keys(self):
+        """Ряды в порядке плиток"""
+        return list(self._keys)
+
+    def add(self, key):
+        """Добавляет плитку ряда, если ее еще нет"""
+        if key in self._rows:
+            return
+        row = len(self._keys)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._keys.append(key)
+        self._rows[key] = row
+        self.endInsertRows()
+
+    def refresh(self, keys):
+        """Сообщает представлению об изменении рядов
+
+        Ряды без плитки добавляются. Представление перерисовывает только
+        видимые из измененных плиток.
+
+        Args:
+            keys: Измененные ряды (client_id, adapter)
+        """
+        for key in keys:
+            row = self._rows.get(key)
+            if row is None:
+                self.add(key)
+                continue
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [SERIES_ROLE])
+
+    def remove_client(self, client_id):
+        """Удаляет плитки всех адаптеров клиента"""
+        self.remove_keys([key for key in self._keys if key[0] == client_id])
+
+    def remove_keys(self, keys):
+        """Удаляет плитки рядов"""
+        # С конца, чтобы номера оставшихся удаляемых строк не сдвигались
+        rows = sorted((self._rows[key] for key in keys if key in self._rows), reverse=True)
+        if not rows:
+            return
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._keys[row]
+            self.endRemoveRows()
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+
+    def clear(self):
+        """Удаляет все плитки"""
+        self.beginResetModel()
+        self._keys = []
+        self._rows = {}
+        self.endResetModel()
+
+
+class SparklineDelegate(QStyledItemDelegate):
+    """Рисование плитки: подпись, текущая скорость и спарклайны загрузки и отдачи"""
+
+    def __init__(self, points=SPARKLINE_POINTS, unit="Кбит/с", parent=None):
+        """
+        Args:
+            points: Количество последних точек на спарклайне
+            unit: Единицы скорости для подписи
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.points = points
+        self.unit = unit
+        self.download_pen = QPen(DOWNLOAD_COLOR, 1.5)
+        self.upload_pen = QPen(UPLOAD_COLOR, 1.5)
+
+    def sizeHint(self, option, index):
+        return TILE_SIZE
+
+    def paint(self, painter, option, index):
+        painter.save()
+        try:
+            rect = QRectF(option.rect).adjusted(1, 1, -1, -1)
+            palette = option.palette
+            selected = bool(option.state & QStyle.StateFlag.State_Selected)
+            painter.setPen(QPen(palette.highlight().color() if selected else palette.mid().color()))
+            painter.setBrush(palette.base())
+            painter.drawRect(rect)
+
+            metrics = option.fontMetrics
+            line_height = metrics.height()
+            text_rect = rect.adjusted(6, 3, -6, 0)
+            text_rect.setHeight(line_height)
+            title = metrics.elidedText(index.data(Qt.ItemDataRole.DisplayRole) or "",
+                                       Qt.TextElideMode.ElideMiddle, int(text_rect.width()))
+            painter.setPen(palette.text().color())
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+
+            series = index.data(SERIES_ROLE)
+            if not series:
+                return
+            download = series['download_speeds'].raw.avgs.view()[-self.points:]
+            upload = series['upload_speeds'].raw.avgs.view()[-self.points:]
+            if not len(download):
+                return
+
+            # Текущая скорость
+            text_rect.translate(0, line_height)
+            painter.setPen(palette.placeholderText().color())
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                             f"↓ {download[-1]:.1f}  ↑ {upload[-1]:.1f} {self.unit}")
+
+            # Спарклайны в общем масштабе по видимому окну
+            plot_rect = rect.adjusted(6, 3 + 2 * line_height + 2, -6, -4)
+            peak = max(float(download.max()), float(upload.max() if len(upload) else 0.0))
+            if peak <= 0:
+                peak = 1.0
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            for values, pen in ((download, self.download_pen), (upload, self.upload_pen)):
+                if len(values) < 2:
+                    continue
+                painter.setPen(pen)
+                painter.drawPolyline(self._polygon(values, peak, plot_rect))
+        finally:
+            painter.restore()
+
+    def _polygon(self, values, peak, rect):
+        """Точки спарклайна в координатах плитки
+
+        Точки распределяются по ширине на self.points позиций, поэтому
+        короткая история прижимается к правому краю.
+        """
+        count = len(values)
+        step = rect.width() / max(self.points - 1, 1)
+        xs = rect.right() - step * np.arange(count - 1, -1, -1)
+        ys = rect.bottom() - np.asarray(values, dtype=float) / peak * rect.height()
+        return QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())])
+
+
+class DashboardView(QListView):
+    """Сетка плиток обзора; рисуются только плитки в видимой области"""
+
+    # Плитка выбрана двойным щелчком: client_id, adapter
+    tile_activated = pyqtSignal(str, str)
+
+    def __init__(self, model, parent=None):
+        """
+        Args:
+            model: Модель плиток (DashboardModel)
+            parent: Родительский виджет
+        """
+        super().__init__(parent)
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setFlow(QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        # Одинаковый размер плиток: раскладка не опрашивает делегат для каждой строки
+        self.setUniformItemSizes(True)
+        self.setGridSize(TILE_SIZE + QSize(TILE_SPACING, TILE_SPACING))
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setItemDelegate(SparklineDelegate(parent=self))
+        self.setModel(model)
+        self.doubleClicked.connect(self._on_double_clicked)
+
+    def _on_double_clicked(self, index):
+        key = index.data(KEY_ROLE)
+        if key:
+            self.tile_activated.emit(*key)
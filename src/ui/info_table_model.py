@@ -0,0 +1,186 @@
+"""
+Модель таблицы «Параметр - Значение» для сведений об адаптере и скорости.
+
+Строки задаются полями (id поля, название) и находятся по id, а не по
+номеру строки или тексту названия. Значение хранится готовой строкой и
+меняется на месте: если текст не изменился, модель ничего не делает,
+иначе сообщает представлению об изменении одной ячейки (dataChanged).
+Поэтому обновление скорости стоит столько, сколько полей изменилось, и
+не создает элементов таблицы.
+"""
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtWidgets import QAbstractItemView, QHeaderView
+
+EMPTY_VALUE = '-'
+
+# Сведения об адаптере (ключи словаря NetworkMonitor.get_adapter_info())
+INFO_FIELDS = (
+    ('id', 'ID адаптера'),
+    ('description', 'Описание'),
+    ('interface_type', 'Тип интерфейса'),
+    ('ip', 'IP адрес'),
+    ('mac', 'MAC адрес'),
+    ('speed', 'Скорость адаптера'),
+    ('mtu', 'MTU'),
+    ('status', 'Статус'),
+)
+
+# Результаты замера скорости (см. speed_values())
+MEASUREMENT_FIELDS = (
+    ('time', 'Время замера'),
+    ('current_download', 'Загрузка - текущая'),
+    ('max_download', 'Загрузка - максимальная'),
+    ('avg_download', 'Загрузка - средняя'),
+    ('ewma_download', 'Загрузка - сглаженная'),
+    ('p95_download', 'Загрузка - 95-й процентиль'),
+    ('std_download', 'Загрузка - отклонение'),
+    ('current_upload', 'Отдача - текущая'),
+    ('max_upload', 'Отдача - максимальная'),
+    ('avg_upload', 'Отдача - средняя'),
+    ('ewma_upload', 'Отдача - сглаженная'),
+    ('p95_upload', 'Отдача - 95-й процентиль'),
+    ('std_upload', 'Отдача - отклонение'),
+)
+# Потоковая статистика (см. stream_stats.StreamStats.summary()); есть не у всех источников
+STREAM_STAT_FIELDS = ('ewma_download', 'p95_download', 'std_download',
+                      'ewma_upload', 'p95_upload', 'std_upload')
+MEASUREMENT_FIELD_IDS = tuple(field_id for field_id, _ in MEASUREMENT_FIELDS)
+
+
+def speed_values(data, unit):
+    """Значения полей MEASUREMENT_FIELDS по данным скорости
+
+    Args:
+        data: Данные скорости ({'download', 'upload', 'stats': {...}})
+        unit: Единицы скорости для подписи
+
+    Returns:
+        dict: {id поля: текст}; время и статистика - только если в данных есть stats
+    """
+    values = {
+        'current_download': f"{data['download']:.2f} {unit}",
+        'current_upload': f"{data['upload']:.2f} {unit}",
+    }
+    stats = data.get('stats')
+    if stats:
+        values['time'] = f"{stats.get('duration', 0)} сек"
+        values['max_download'] = f"{stats['max_download']:.2f} {unit}"
+        values['avg_download'] = f"{stats['avg_download']:.2f} {unit}"
+        values['max_upload'] = f"{stats['max_upload']:.2f} {unit}"
+        values['avg_upload'] = f"{stats['avg_upload']:.2f} {unit}"
+        for field_id in STREAM_STAT_FIELDS:
+            if field_id in stats:
+                values[field_id] = f"{stats[field_id]:.2f} {unit}"
+    return values
+
+
+class InfoTableModel(QAbstractTableModel):
+    """Таблица из двух столбцов: название поля и его значение"""
+
+    HEADERS = ('Параметр', 'Значение')
+
+    def __init__(self, fields=(), parent=None):
+        """
+        Args:
+            fields: Поля в порядке строк - пары (id поля, название)
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.fields = ()
+        self._labels = []
+        self._values = []
+        self._rows = {}  # {id поля: номер строки}
+        self.set_fields(fields)
+
+    def set_fields(self, fields):
+        """Задает набор строк; все значения становятся пустыми"""
+        self.beginResetModel()
+        self.fields = tuple(fields)
+        self._labels = [label for _, label in self.fields]
+        self._values = [EMPTY_VALUE] * len(self.fields)
+        self._rows = {field_id: row for row, (field_id, _) in enumerate(self.fields)}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._labels)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        return self._labels[row] if index.column() == 0 else self._values[row]
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def value(self, field_id):
+        """Текущий текст поля или None, если такого поля нет"""
+        row = self._rows.get(field_id)
+        return self._values[row] if row is not None else None
+
+    def set_value(self, field_id, value):
+        """Меняет значение поля
+
+        Поля, которых нет в таблице, пропускаются. Если текст не изменился,
+        представление не уведомляется.
+        """
+        row = self._rows.get(field_id)
+        if row is None:
+            return
+        text = value if isinstance(value, str) else str(value)
+        if self._values[row] == text:
+            return
+        self._values[row] = text
+        index = self.index(row, 1)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+
+    def update(self, values):
+        """Меняет значения нескольких полей
+
+        Args:
+            values: {id поля: значение}
+        """
+        for field_id, value in values.items():
+            self.set_value(field_id, value)
+
+    def clear_values(self, field_ids=None):
+        """Сбрасывает значения полей (None - всех) в EMPTY_VALUE"""
+        if field_ids is None:
+            field_ids = self._rows
+        for field_id in field_ids:
+            self.set_value(field_id, EMPTY_VALUE)
+
+
+def info_table_model(view, fields):
+    """Возвращает модель таблицы представления, при необходимости создавая ее
+
+    Одно представление может настраиваться из нескольких мест (например,
+    таблица удаленного адаптера), поэтому уже назначенная модель
+    используется повторно.
+
+    Args:
+        view: QTableView
+        fields: Поля новой модели - пары (id поля, название)
+
+    Returns:
+        InfoTableModel: Модель представления
+    """
+    model = view.model()
+    if isinstance(model, InfoTableModel):
+        return model
+    model = InfoTableModel(fields, view)
+    view.setModel(model)
+    header = view.horizontalHeader()
+    header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+    header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+    view.verticalHeader().hide()
+    view.verticalHeader().setDefaultSectionSize(25)
+    view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    return model
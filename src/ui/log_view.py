@@ -0,0 +1,68 @@
+"""
+Вывод лога из LogQueue в текстовый виджет.
+
+Таймер в потоке интерфейса забирает накопившиеся записи и добавляет их
+в виджет одной вставкой, поэтому количество перерисовок не зависит от
+частоты сообщений. Количество строк в виджете ограничено: старые строки
+удаляет сам документ (setMaximumBlockCount).
+"""
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtGui import QTextCursor
+from src.core.log_queue import WARNING, LEVEL_NAMES
+
+DRAIN_INTERVAL = 250  # мс между выводом накопившихся записей
+MAX_LINES = 5000  # Строк в виджете лога
+MAX_BATCH = 1000  # Записей за одно срабатывание таймера
+
+
+class LogView(QObject):
+    """Периодический вывод записей очереди лога в QTextEdit/QPlainTextEdit"""
+
+    def __init__(self, widget, log_queue, interval=DRAIN_INTERVAL, max_lines=MAX_LINES):
+        """
+        Args:
+            widget: Текстовый виджет лога
+            log_queue: Очередь записей (LogQueue)
+            interval: Интервал вывода, мс
+            max_lines: Максимальное количество строк в виджете
+        """
+        super().__init__(widget)
+        self.widget = widget
+        self.log_queue = log_queue
+        widget.setReadOnly(True)
+        widget.document().setMaximumBlockCount(max_lines)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(interval)
+
+    def flush(self):
+        """Выводит накопившиеся записи одной вставкой"""
+        records = self.log_queue.drain(MAX_BATCH)
+        if not records:
+            return
+
+        lines = []
+        for _, level, text in records:
+            if level >= WARNING:
+                text = f"[{LEVEL_NAMES.get(level, level)}] {text}"
+            lines.append(text)
+
+        widget = self.widget
+        scrollbar = widget.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+
+        cursor = QTextCursor(widget.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not widget.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertText("\n".join(lines))
+
+        # Прокручиваем к новым строкам, только если пользователь не листает лог
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def stop(self):
+        """Останавливает вывод"""
+        self.timer.stop()
@@ -1,14 +1,30 @@
 # src/ui/measurement_management.py
 
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import Qt, QTimer
+from src.core.scheduler import DEFAULT_INTERVAL, normalize_interval
+from src.ui.info_table_model import MEASUREMENT_FIELD_IDS, speed_values
 
 class MeasurementManagement:
     def __init__(self, window):
         self.window = window
         self.is_measuring = False
+        self.interval = DEFAULT_INTERVAL  # Интервал измерения, секунды
         self.timer = QTimer()
+        # Скорость считается по фактическому времени между измерениями,
+        # точный таймер нужен только для равномерных точек на графике
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self.update_measurements)
 
+    def set_interval(self, interval):
+        """Устанавливает интервал измерения
+
+        Args:
+            interval: Интервал в секундах (не меньше 10 мс)
+        """
+        self.interval = normalize_interval(interval)
+        if self.timer.isActive():
+            self.timer.start(round(self.interval * 1000))
+
     def toggle_measurement(self):
         """Включает и выключает замер скорости"""
         if self.is_measuring:
@@ -21,7 +37,7 @@ class MeasurementManagement:
         self.window.network_monitor.start_measurement(self.window.selected_adapter)
         self.is_measuring = True
         self.window.measureSpeedButton.setText("Стоп")
-        self.timer.start(1000)  # Обновляем каждую секунду
+        self.timer.start(round(self.interval * 1000))
 
     def stop_measurement(self):
         """Останавливает замер скорости"""
@@ -29,23 +45,19 @@ class MeasurementManagement:
         self.is_measuring = False
         self.window.measureSpeedButton.setText("Старт")
         self.timer.stop()
-        # Сбрасываем значения в таблице
-        self.window.adapterInfoTable.item(8, 1).setText('-')  # Время
-        for i in range(9, 15):  # Скорости
-            self.window.adapterInfoTable.item(i, 1).setText('-')
+        # Сбрасываем время и скорости в таблице
+        self.window.adapterInfoTable.model().clear_values(MEASUREMENT_FIELD_IDS)
 
     def update_measurements(self):
         """Обновляет все измерения (время и график)"""
         if self.window.selected_adapter:
             speeds = self.window.network_monitor.get_current_speeds()
-            print("Полученные данные о скорости:", speeds)  # Отладочная информация
             if speeds:
                 # Обновляем график
                 self.window.graph_builder.update_graph(
                     self.window.network_monitor.download_speeds,
                     self.window.network_monitor.upload_speeds
                 )
-                print("Обновляем таблицу со значениями:", speeds['stats'])  # Отладочная информация
                 self.update_table(speeds)
 
                 # Проверяем, не истекло ли время
@@ -58,25 +70,9 @@ class MeasurementManagement:
             print("Нет данных для обновления таблицы")  # Отладочная информация
             return
             
-        stats = speeds['stats']
-        print(f"Обновляем время замера: {stats.get('duration', 0)} сек")  # Отладочная информация
-        # Обновляем время измерения
-        try:
-            self.window.adapterInfoTable.item(8, 1).setText(f"{stats.get('duration', 0)} сек")
-        except Exception as e:
-            print(f"Ошибка при обновлении времени замера: {e}")  # Отладочная информация
-        # Обновляем текущую скорость загрузки
-        self.window.adapterInfoTable.item(9, 1).setText(f"{speeds['download']:.2f} КБ/с")
-        # Обновляем максимальную скорость загрузки
-        self.window.adapterInfoTable.item(10, 1).setText(f"{stats['max_download']:.2f} КБ/с")
-        # Обновляем среднюю скорость загрузки
-        self.window.adapterInfoTable.item(11, 1).setText(f"{stats['avg_download']:.2f} КБ/с")
-        # Обновляем текущую скорость отдачи
-        self.window.adapterInfoTable.item(12, 1).setText(f"{speeds['upload']:.2f} КБ/с")
-        # Обновляем максимальную скорость отдачи
-        self.window.adapterInfoTable.item(13, 1).setText(f"{stats['max_upload']:.2f} КБ/с")
-        # Обновляем среднюю скорость отдачи
-        self.window.adapterInfoTable.item(14, 1).setText(f"{stats['avg_upload']:.2f} КБ/с")
+        # Время, текущая, максимальная и средняя скорость; перерисовываются
+        # только изменившиеся ячейки
+        self.window.adapterInfoTable.model().update(speed_values(speeds, "КБ/с"))
 
     def clear_graphs(self):
         """Очищает графики и сбрасывает статистику"""
@@ -85,20 +81,12 @@ class MeasurementManagement:
             if hasattr(self.window, "graph_builder"):
                 self.window.graph_builder.clear_graphs()
             
-            # Сбрасываем значения в таблице
-            self.window.adapterInfoTable.item(8, 1).setText('-')  # Время
-            for i in range(9, 15):  # Скорости
-                self.window.adapterInfoTable.item(i, 1).setText('-')
+            # Сбрасываем время и скорости в таблице
+            self.window.adapterInfoTable.model().clear_values(MEASUREMENT_FIELD_IDS)
                 
             # Очищаем данные в network_monitor
             if hasattr(self.window, "network_monitor"):
-                self.window.network_monitor.download_speeds = []
-                self.window.network_monitor.upload_speeds = []
-                self.window.network_monitor.max_download = 0
-                self.window.network_monitor.max_upload = 0
-                self.window.network_monitor.total_download = 0
-                self.window.network_monitor.total_upload = 0
-                self.window.network_monitor.measurement_count = 0
+                self.window.network_monitor.reset_statistics()
         except Exception as e:
             print(f"Ошибка при очистке графиков: {e}")
 
@@ -54,6 +54,11 @@ class NetworkMonitorWindow(QMainWindow):
             self.minutesInput.textChanged.connect(self.measurement_management.on_time_changed)
             self.secondsInput.textChanged.connect(self.measurement_management.on_time_changed)
 
+            # Интервал измерения применяется и во время замера
+            if hasattr(self, "intervalInput"):
+                self.measurement_management.set_interval(self.intervalInput.value())
+                self.intervalInput.valueChanged.connect(self.measurement_management.set_interval)
+
             # Настраиваем график скорости
             if hasattr(self, "graphWidget"):
                 self.graph_builder = GraphBuilder(self.graphWidget)
@@ -83,7 +88,9 @@ class NetworkMonitorWindow(QMainWindow):
             
     def on_tab_changed(self, index):
         """Обработчик изменения текущей вкладки"""
-        pass
+        # Графики удаленных клиентов на скрытой вкладке не перерисовывались
+        if hasattr(self, "server_management"):
+            self.server_management.request_render()
 
     def closeEvent(self, event):
         """Обработчик закрытия окна"""
@@ -91,6 +98,10 @@ class NetworkMonitorWindow(QMainWindow):
         if hasattr(self, "measurement_management"):
             self.measurement_management.stop_measurement()
             
+        # Отключаем наблюдение за адаптерами
+        if hasattr(self, "adapter_management"):
+            self.adapter_management.stop_watching()
+            
         # Останавливаем сервер, если запущен
         if hasattr(self, "server_management"):
             self.server_management.server.stop_server()
@@ -1,7 +1,13 @@
-from PyQt6.QtWidgets import QTableWidgetItem, QHeaderView, QAbstractItemView
-from PyQt6.QtCore import Qt, QTimer
+import time
+from PyQt6.QtCore import QObject, pyqtSignal
 from src.core.graph_builder import GraphBuilder
 from src.core.network_client import NetworkClient
+from src.core.stream_stats import StreamStats
+from src.ui.info_table_model import INFO_FIELDS, MEASUREMENT_FIELDS, MEASUREMENT_FIELD_IDS, info_table_model, speed_values
+
+class RemoteSpeedsBridge(QObject):
+    """Передает данные о скорости из потока чтения клиента в поток интерфейса"""
+    speeds_received = pyqtSignal(dict)
 
 class RemoteMonitoring:
     def __init__(self, window, network_monitor):
@@ -10,8 +16,21 @@ class RemoteMonitoring:
         self.remote_client = None
         self.remote_connected = False
         self.remote_is_measuring = False
-        self.remote_timer = None
+        self.remote_interval = 1.0  # Интервал получения скорости от сервера, секунды
         self.remote_graph_builder = None
+        self.remote_adapters_info = {}  # Информация об адаптерах, загруженная при подключении
+        # Статистика замера считается по мере поступления образцов, без прохода по истории
+        self.remote_download_stats = StreamStats()
+        self.remote_upload_stats = StreamStats()
+        # Переданные КБ и время замера для средней скорости, взвешенной по
+        # времени (как в MeasurementSession и SampleStats)
+        self.remote_total_download = 0.0
+        self.remote_total_upload = 0.0
+        self.remote_total_time = 0.0
+        # Данные от сервера приходят в потоке чтения клиента, сигнал
+        # доставляет их в поток интерфейса через очередь Qt
+        self.speeds_bridge = RemoteSpeedsBridge()
+        self.speeds_bridge.speeds_received.connect(self.on_remote_speeds_received)
 
     def setup_remote_monitoring(self):
         """Настройка удаленного мониторинга"""
@@ -56,10 +75,6 @@ class RemoteMonitoring:
         if hasattr(self.window, "remoteClearGraphs"):
             self.window.remoteClearGraphs.clicked.connect(self.clear_remote_graphs)
 
-        # Инициализируем таймер для удаленных измерений
-        self.remote_timer = QTimer()
-        self.remote_timer.timeout.connect(self.update_remote_measurements)
-
         # Инициализируем график для удаленного режима
         if hasattr(self.window, "remoteGraphWidget") and self.window.remoteGraphWidget is not None:
             print("Инициализация графика для удаленного режима...")
@@ -80,41 +95,7 @@ class RemoteMonitoring:
         if not hasattr(self.window, "remoteInfoTable"):
             return
             
-        # Задаем параметры таблицы
-        table = self.window.remoteInfoTable
-        table.setColumnCount(2)
-        table.setRowCount(15)
-        
-        # Добавляем заголовки
-        table.setHorizontalHeaderLabels(['Параметр', 'Значение'])
-        
-        # Задаем параметры для таблицы
-        parameters = [
-            'ID адаптера', 'Описание', 'Тип интерфейса',
-            'IP адрес', 'MAC адрес', 'Скорость адаптера',
-            'MTU', 'Статус', 'Время замера',
-            'Загрузка - текущая', 'Загрузка - максимальная',
-            'Загрузка - средняя', 'Отдача - текущая',
-            'Отдача - максимальная', 'Отдача - средняя'
-        ]
-        
-        # Заполняем таблицу начальными значениями
-        for i, param in enumerate(parameters):
-            item = QTableWidgetItem(param)
-            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            table.setItem(i, 0, item)
-            
-            value_item = QTableWidgetItem('-')
-            value_item.setFlags(value_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            table.setItem(i, 1, value_item)
-        
-        # Настраиваем отображение заголовков
-        header = table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        
-        # Отключаем выбор ячеек
-        table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.remote_table_model = info_table_model(self.window.remoteInfoTable, INFO_FIELDS + MEASUREMENT_FIELDS)
 
     def connect_to_remote(self):
         """Подключение к удаленному компьютеру"""
@@ -192,8 +173,16 @@ class RemoteMonitoring:
         if not self.remote_connected:
             return
         
-        # Получаем список адаптеров
-        adapters = self.remote_client.get_adapters()
+        # Адаптеры вместе со сведениями приходят одним сообщением
+        snapshot = self.remote_client.get_snapshot()
+        if snapshot is not None:
+            adapters = [adapter['name'] for adapter in snapshot]
+            self.remote_adapters_info = {adapter['name']: adapter['info'] for adapter in snapshot}
+        else:
+            # Старый сервер без снимка: список адаптеров и пакет запросов
+            # сведений, ответы сопоставляются по id
+            adapters = self.remote_client.get_adapters()
+            self.remote_adapters_info = self.remote_client.get_adapters_info(adapters) if adapters else {}
         
         # Заполняем выпадающий список
         if hasattr(self.window, "remoteAdapterList"):
@@ -215,18 +204,15 @@ class RemoteMonitoring:
         if not self.remote_connected:
             return
 
-        adapter_info = self.remote_client.get_adapter_info(adapter_name) or {}
+        adapter_info = self.remote_adapters_info.get(adapter_name)
+        if adapter_info is None:
+            adapter_info = self.remote_client.get_adapter_info(adapter_name) or {}
         
         # Обновляем информацию в таблице
         if hasattr(self.window, "remoteInfoTable"):
-            self.window.remoteInfoTable.item(0, 1).setText(adapter_info.get('id', '-'))
-            self.window.remoteInfoTable.item(1, 1).setText(adapter_info.get('description', '-'))
-            self.window.remoteInfoTable.item(2, 1).setText(adapter_info.get('interface_type', '-'))
-            self.window.remoteInfoTable.item(3, 1).setText(adapter_info.get('ip', '-'))
-            self.window.remoteInfoTable.item(4, 1).setText(adapter_info.get('mac', '-'))
-            self.window.remoteInfoTable.item(5, 1).setText(adapter_info.get('speed', '-'))
-            self.window.remoteInfoTable.item(6, 1).setText(adapter_info.get('mtu', '-'))
-            self.window.remoteInfoTable.item(7, 1).setText(adapter_info.get('status', '-'))
+            self.remote_table_model.update({
+                field_id: adapter_info.get(field_id, '-') for field_id, _ in INFO_FIELDS
+            })
             
     def toggle_remote_measurement(self):
         """Включает и выключает замер скорости на удаленном компьютере"""
@@ -265,29 +251,29 @@ class RemoteMonitoring:
         self.remote_is_measuring = True
         
         # Очищаем данные
-        self.remote_client.download_speeds = []
-        self.remote_client.upload_speeds = []
+        self.remote_client.download_speeds.clear()
+        self.remote_client.upload_speeds.clear()
+        self.reset_remote_stats()
         
         # Обновляем кнопку
         if hasattr(self.window, "remoteMeasureSpeedButton"):
             self.window.remoteMeasureSpeedButton.setText("Остановить")
         
-        # Запускаем таймер для обновления данных
-        self.remote_timer.start(1000)
+        # Подписываемся на данные: сервер сам присылает скорость с заданным интервалом
+        if not self.remote_client.subscribe(self.speeds_bridge.speeds_received.emit, self.remote_interval):
+            print("Не удалось подписаться на данные о скорости")
 
     def stop_remote_measurement(self):
         """Останавливает замер скорости на удаленном компьютере"""
         if not self.remote_connected:
             return
             
-        # Останавливаем измерение на удаленном компьютере
-        self.remote_client.stop_measurement()
-        
         # Сбрасываем флаг измерения
         self.remote_is_measuring = False
         
-        # Останавливаем таймер
-        self.remote_timer.stop()
+        # Отписываемся от данных и останавливаем измерение на удаленном компьютере
+        self.remote_client.unsubscribe()
+        self.remote_client.stop_measurement()
         
         # Обновляем кнопку
         if hasattr(self.window, "remoteMeasureSpeedButton"):
@@ -299,19 +285,13 @@ class RemoteMonitoring:
         
         # Очищаем информацию о скорости в таблице
         if hasattr(self.window, "remoteInfoTable"):
-            for i in range(8, 15):
-                self.window.remoteInfoTable.item(i, 1).setText('-')
+            self.remote_table_model.clear_values(MEASUREMENT_FIELD_IDS)
 
-    def update_remote_measurements(self):
-        """Обновляет данные о скорости с удаленного компьютера"""
+    def on_remote_speeds_received(self, speed_data):
+        """Обрабатывает данные о скорости, присланные удаленным компьютером"""
         if not self.remote_connected or not self.remote_is_measuring:
             return
             
-        # Получаем текущую скорость
-        speed_data = self.remote_client.get_speeds()
-        if not speed_data:
-            return
-            
         # Извлекаем данные о скорости
         download = speed_data.get('download', 0)
         upload = speed_data.get('upload', 0)
@@ -320,37 +300,39 @@ class RemoteMonitoring:
         self.remote_client.download_speeds.append(download)
         self.remote_client.upload_speeds.append(upload)
         
+        # Обновляем статистику замера
+        now = time.monotonic()
+        interval = speed_data.get('interval', self.remote_interval)
+        self.remote_download_stats.update(download, now, interval)
+        self.remote_upload_stats.update(upload, now, interval)
+        self.remote_total_download += download * interval
+        self.remote_total_upload += upload * interval
+        self.remote_total_time += interval
+        
         # Обновляем график
         if self.remote_graph_builder:
             self.remote_graph_builder.update_graph(self.remote_client.download_speeds, self.remote_client.upload_speeds)
         
-        # Обновляем информацию в таблице
+        # Обновляем информацию в таблице по накопленной статистике
         if hasattr(self.window, "remoteInfoTable"):
-            # Обновляем время замера
-            time_value = speed_data.get('time', '-')
-            self.window.remoteInfoTable.item(8, 1).setText(time_value)
-            
-            # Обновляем скорость загрузки
-            self.window.remoteInfoTable.item(9, 1).setText(f"{download:.2f} KB/s")
-            
-            # Обновляем максимальную скорость загрузки
-            max_download = max(self.remote_client.download_speeds)
-            self.window.remoteInfoTable.item(10, 1).setText(f"{max_download:.2f} KB/s")
-            
-            # Обновляем среднюю скорость загрузки
-            avg_download = sum(self.remote_client.download_speeds) / len(self.remote_client.download_speeds)
-            self.window.remoteInfoTable.item(11, 1).setText(f"{avg_download:.2f} KB/s")
-            
-            # Обновляем скорость отдачи
-            self.window.remoteInfoTable.item(12, 1).setText(f"{upload:.2f} KB/s")
-            
-            # Обновляем максимальную скорость отдачи
-            max_upload = max(self.remote_client.upload_speeds)
-            self.window.remoteInfoTable.item(13, 1).setText(f"{max_upload:.2f} KB/s")
-            
-            # Обновляем среднюю скорость отдачи
-            avg_upload = sum(self.remote_client.upload_speeds) / len(self.remote_client.upload_speeds)
-            self.window.remoteInfoTable.item(14, 1).setText(f"{avg_upload:.2f} KB/s")
+            total_time = self.remote_total_time or 1.0
+            stats = {
+                'avg_download': self.remote_total_download / total_time,
+                'avg_upload': self.remote_total_upload / total_time,
+            }
+            stats.update(self.remote_download_stats.summary('download'))
+            stats.update(self.remote_upload_stats.summary('upload'))
+            values = speed_values({'download': download, 'upload': upload, 'stats': stats}, "KB/s")
+            values['time'] = speed_data.get('time', '-')
+            self.remote_table_model.update(values)
+
+    def reset_remote_stats(self):
+        """Сбрасывает статистику замера"""
+        self.remote_download_stats.reset()
+        self.remote_upload_stats.reset()
+        self.remote_total_download = 0.0
+        self.remote_total_upload = 0.0
+        self.remote_total_time = 0.0
 
     def on_remote_hide_download_changed(self, state):
         """Обработчик изменения состояния чекбокса скрытия графика загрузки"""
@@ -365,8 +347,9 @@ class RemoteMonitoring:
     def clear_remote_graphs(self):
         """Очищает графики и данные для удаленного мониторинга"""
         # Очищаем данные
-        self.remote_client.download_speeds = []
-        self.remote_client.upload_speeds = []
+        self.remote_client.download_speeds.clear()
+        self.remote_client.upload_speeds.clear()
+        self.reset_remote_stats()
         
         # Очищаем график
         if self.remote_graph_builder:
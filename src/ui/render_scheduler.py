@@ -0,0 +1,83 @@
+"""
+Ограничение частоты перерисовки интерфейса.
+
+Данные от агентов приходят с частотой, не связанной с частотой экрана:
+много агентов или интервал меньше секунды дают сотни сообщений в секунду.
+Обработчик сообщения только сохраняет данные и отмечает ряд (клиент,
+адаптер) как измененный, а RenderScheduler не чаще одного раза за кадр
+передает функции отрисовки все ряды, измененные с прошлого кадра. Пока
+изменений нет, таймер не работает.
+"""
+
+import time
+from PyQt6.QtCore import QObject, QTimer
+
+DEFAULT_FPS = 20  # Кадров в секунду
+MIN_FPS = 1
+MAX_FPS = 60
+
+
+class RenderScheduler(QObject):
+    """Перерисовка измененных рядов не чаще заданной частоты кадров"""
+
+    def __init__(self, render, fps=DEFAULT_FPS, parent=None):
+        """
+        Args:
+            render: Функция отрисовки render(ключи); возвращает ключи, которые
+                сейчас нельзя отрисовать (например, виджет скрыт), или None.
+                Такие ключи остаются измененными до request_frame().
+            fps: Максимальная частота кадров
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.render = render
+        self._dirty = set()
+        self._deferred = set()
+        self._last_frame = 0.0
+        self.frame_interval = 1.0 / DEFAULT_FPS
+        self.set_fps(fps)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_frame)
+
+    def set_fps(self, fps):
+        """Задает максимальную частоту кадров (от MIN_FPS до MAX_FPS)"""
+        fps = min(max(fps, MIN_FPS), MAX_FPS)
+        self.frame_interval = 1.0 / fps
+
+    def mark_dirty(self, key):
+        """Отмечает ряд как измененный; он будет отрисован в ближайшем кадре"""
+        self._dirty.add(key)
+        self._schedule()
+
+    def request_frame(self):
+        """Перерисовывает в ближайшем кадре и ряды, отложенные функцией отрисовки"""
+        if self._deferred:
+            self._dirty |= self._deferred
+            self._deferred = set()
+        if self._dirty:
+            self._schedule()
+
+    def discard(self, key):
+        """Забывает об изменении ряда (ряд удален или больше не показывается)"""
+        self._dirty.discard(key)
+        self._deferred.discard(key)
+
+    def _schedule(self):
+        """Запускает таймер кадра, если он еще не запущен"""
+        if self._timer.isActive():
+            return
+        # Кадр не раньше, чем через frame_interval после предыдущего
+        delay = self._last_frame + self.frame_interval - time.monotonic()
+        self._timer.start(max(0, int(delay * 1000)))
+
+    def _on_frame(self):
+        """Отрисовка рядов, измененных с прошлого кадра"""
+        dirty, self._dirty = self._dirty, set()
+        self._last_frame = time.monotonic()
+        if not dirty:
+            return
+        deferred = self.render(dirty)
+        if deferred:
+            self._deferred.update(deferred)
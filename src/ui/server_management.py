@@ -1,10 +1,27 @@
+import time
 from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtWidgets import QListWidgetItem, QTableWidgetItem
+from PyQt6.QtWidgets import QListWidgetItem
+from src.core.adapter_watcher import ADAPTER_ADDED, ADAPTER_REMOVED
+from src.core.log_queue import DEBUG, ERROR, INFO, WARNING
 from src.core.network_server import NetworkServer
+from src.core.ring_buffer import DEFAULT_CAPACITY
+from src.core.rollup import RollupSeries
+from src.ui.dashboard import DashboardModel, DashboardView
+from src.ui.info_table_model import INFO_FIELDS, MEASUREMENT_FIELDS, info_table_model, speed_values
+from src.ui.log_view import LogView
+from src.ui.render_scheduler import RenderScheduler
 
 class ServerManagement:
     """Класс для управления серверной частью приложения"""
     
+    # Строки таблицы для скоростей счетчиков: (название, ключ данных, единицы)
+    COUNTER_RATE_ROWS = (
+        ("Пакеты - прием", 'packets_recv', "пак/с"),
+        ("Пакеты - отправка", 'packets_sent', "пак/с"),
+        ("Ошибки", 'errors', "1/с"),
+        ("Отбрасывания", 'drops', "1/с"),
+    )
+    
     def __init__(self, window):
         """
         Инициализация менеджера сервера
@@ -16,18 +33,26 @@ class ServerManagement:
         self.server = NetworkServer()
         self.selected_client = None
         self.selected_adapter = None
+        self.pending_adapter = None  # Адаптер, выбираемый после получения списка (переход с плитки обзора)
         self.is_monitoring = False
         
         # Словарь для хранения данных клиентов
-        self.clients_data = {}  # формат: {client_id: {'adapter': name, 'download_speeds': [], 'upload_speeds': []}}
+        self.history_capacity = DEFAULT_CAPACITY  # Количество точек истории на адаптер
+        self.clients_data = {}  # формат: {client_id:adapter: {'adapter': name, 'download_speeds': RollupSeries, 'upload_speeds': RollupSeries}}
+        
+        # Данные выбранного адаптера (ссылки на буферы из clients_data)
+        self.download_speeds = RollupSeries(capacity=self.history_capacity)
+        self.upload_speeds = RollupSeries(capacity=self.history_capacity)
         
-        # Инициализация данных для графика
-        self.download_speeds = []
-        self.upload_speeds = []
+        # Последний образец каждого ряда и перерисовка не чаще частоты кадров:
+        # обработчики данных только отмечают ряд измененным
+        self.latest_speeds = {}  # {(client_id, adapter): data}
+        self.render_scheduler = RenderScheduler(self.render_dirty)
         
         # Инициализация таймера
         self.target_time = 0
         self.elapsed_time = 0
+        self.measurement_start = time.monotonic()
         self.measurement_timer = QTimer()
         self.measurement_timer.timeout.connect(self.on_measurement_timer)
         
@@ -36,10 +61,12 @@ class ServerManagement:
         self.server.client_disconnected.connect(self.on_client_disconnected)
         self.server.server_started.connect(self.on_server_started)
         self.server.server_stopped.connect(self.on_server_stopped)
-        self.server.log_message.connect(self.on_log_message)
         self.server.adapters_list_received.connect(self.on_adapters_list_received)
         self.server.adapter_info_received.connect(self.on_adapter_info_received)
+        self.server.adapter_event_received.connect(self.on_adapter_event_received)
+        self.server.snapshot_received.connect(self.on_snapshot_received)
         self.server.speeds_data_received.connect(self.on_speeds_data_received)
+        self.server.speeds_batch_received.connect(self.on_speeds_batch_received)
         
         # Настройка интерфейса
         self.setup_ui()
@@ -60,6 +87,10 @@ class ServerManagement:
         
     def setup_ui(self):
         """Настройка пользовательского интерфейса"""
+        # Лог сервера и окна выводится в виджет пачками по таймеру
+        if hasattr(self.window, "serverLogWidget"):
+            self.log_view = LogView(self.window.serverLogWidget, self.server.log)
+            
         # Подключаем кнопку запуска сервера
         if hasattr(self.window, "startServerButton"):
             self.window.startServerButton.clicked.connect(self.toggle_server)
@@ -98,14 +129,22 @@ class ServerManagement:
         if hasattr(self.window, "remoteHideUpload"):
             self.window.remoteHideUpload.stateChanged.connect(self.on_hide_upload_changed)
             
-        # Инициализируем таблицу информации
+        # Инициализируем таблицу информации: сведения, замер и скорости счетчиков
         if hasattr(self.window, "remoteInfoTable"):
-            table = self.window.remoteInfoTable
-            table.setColumnCount(2)
-            table.setHorizontalHeaderLabels(['Параметр', 'Значение'])
-            table.horizontalHeader().setStretchLastSection(True)
+            counter_fields = tuple((key, name) for name, key, _ in self.COUNTER_RATE_ROWS)
+            self.info_model = info_table_model(self.window.remoteInfoTable,
+                                               INFO_FIELDS + MEASUREMENT_FIELDS + counter_fields)
             self.log_message("Инициализирована таблица информации об адаптере")
             
+        # Вкладка обзора: плитки всех клиентов и адаптеров из общей истории
+        self.dashboard_model = DashboardModel(
+            lambda client_id, adapter: self.clients_data.get(f"{client_id}:{adapter}"),
+            self.client_display_name)
+        if hasattr(self.window, "tabWidget"):
+            self.dashboard = DashboardView(self.dashboard_model)
+            self.dashboard.tile_activated.connect(self.on_dashboard_tile_activated)
+            self.window.tabWidget.addTab(self.dashboard, "Обзор клиентов")
+            
         # Устанавливаем порт по умолчанию
         if hasattr(self.window, "serverPortInput"):
             self.window.serverPortInput.setText("5000")
@@ -134,7 +173,7 @@ class ServerManagement:
                     try:
                         port = int(self.window.serverPortInput.text())
                     except ValueError:
-                        self.log_message("Ошибка: некорректный порт. Используется порт 5000.")
+                        self.log_message("Ошибка: некорректный порт. Используется порт 5000.", level=WARNING)
                         port = 5000
                 
                 if self.server.start_server(port):
@@ -144,7 +183,7 @@ class ServerManagement:
                     # Обновляем состояние UI
                     self.update_ui_state(True)
             except Exception as e:
-                self.log_message(f"Ошибка запуска сервера: {e}")
+                self.log_message(f"Ошибка запуска сервера: {e}", level=ERROR)
                 
     def update_ui_state(self, server_running):
         """Обновление состояния UI в зависимости от статуса сервера"""
@@ -205,8 +244,7 @@ class ServerManagement:
         Args:
             client_id: Идентификатор клиента
         """
-        pc_name = self.server.get_client_name(client_id)
-        display_name = f"{client_id} ({pc_name})"
+        display_name = self.client_display_name(client_id)
         
         # Обновляем имя в списке на вкладке Сервер
         if hasattr(self.window, "clientsListWidget"):
@@ -222,6 +260,10 @@ class ServerManagement:
                 if item.data(Qt.ItemDataRole.UserRole) == client_id:
                     item.setText(display_name)
         
+    def client_display_name(self, client_id):
+        """Подпись клиента в списках и на плитках обзора"""
+        return f"{client_id} ({self.server.get_client_name(client_id)})"
+        
     def on_client_disconnected(self, ip, port):
         """Обработка отключения клиента"""
         client_id = f"{ip}:{port}"
@@ -232,6 +274,10 @@ class ServerManagement:
         for key in keys_to_remove:
             del self.clients_data[key]
             self.log_message(f"Удалены сохраненные данные для {key}")
+        for key in [key for key in self.latest_speeds if key[0] == client_id]:
+            del self.latest_speeds[key]
+            self.render_scheduler.discard(key)
+        self.dashboard_model.remove_client(client_id)
         
         # Удаляем клиента из списка на вкладке Сервер
         if hasattr(self.window, "clientsListWidget"):
@@ -254,9 +300,8 @@ class ServerManagement:
                 self.window.remoteAdapterList.clear()
                 self.window.remoteAdapterList.setEnabled(False)
                 
-            if hasattr(self.window, "remoteInfoTable"):
-                self.window.remoteInfoTable.clearContents()
-                self.window.remoteInfoTable.setRowCount(0)
+            if hasattr(self, "info_model"):
+                self.info_model.clear_values()
                 
             if hasattr(self.window, "remoteMeasureSpeedButton"):
                 self.window.remoteMeasureSpeedButton.setEnabled(False)
@@ -293,21 +338,16 @@ class ServerManagement:
         if hasattr(self.window, "clientsList"):
             self.window.clientsList.clear()
             
-    def on_log_message(self, message):
-        """Обработка сообщений от сервера"""
-        self.log_message(message)
+    def log_message(self, message, *args, level=INFO):
+        """Добавление сообщения в лог
         
-    def log_message(self, message):
-        """Добавление сообщения в лог"""
-        if hasattr(self.window, "serverLogWidget"):
-            self.window.serverLogWidget.append(message)
+        Сообщение попадает в общую с сервером очередь и выводится в виджет
+        вместе с остальными записями (см. LogView).
+        """
+        self.server.log.log(level, message, *args)
             
     def on_client_selected(self, item):
         """Обработка выбора клиента из списка"""
-        # Сохраняем данные текущего клиента перед переключением
-        if self.selected_client and self.selected_adapter:
-            self.save_current_client_data()
-            
         # Получаем идентификатор клиента из данных элемента
         client_id = item.data(Qt.ItemDataRole.UserRole)
         if not client_id:
@@ -316,11 +356,6 @@ class ServerManagement:
         self.selected_client = client_id
         self.log_message(f"Выбран клиент: {client_id}")
         
-        # Запрашиваем список адаптеров
-        self.log_message(f"Отправляем запрос на получение списка адаптеров для клиента {client_id}")
-        result = self.server.request_adapters_list(self.selected_client)
-        self.log_message(f"Результат запроса адаптеров: {result}")
-        
         # Включаем список адаптеров
         if hasattr(self.window, "remoteAdapterList"):
             self.window.remoteAdapterList.setEnabled(True)
@@ -329,11 +364,17 @@ class ServerManagement:
         # Сбрасываем выбранный адаптер
         self.selected_adapter = None
         
+        # Запрашиваем адаптеры со сведениями одним сообщением; сохраненный
+        # снимок сервер отдает сразу, поэтому список заполняется после очистки
+        self.log_message("Отправляем запрос на получение снимка адаптеров для клиента %s", client_id, level=DEBUG)
+        result = self.server.request_snapshot(self.selected_client)
+        self.log_message("Результат запроса адаптеров: %s", result, level=DEBUG)
+        
         # Очищаем график при смене клиента
         if hasattr(self, "graph_builder"):
             self.graph_builder.clear_graphs()
-            self.download_speeds = []
-            self.upload_speeds = []
+            self.download_speeds = RollupSeries(capacity=self.history_capacity)
+            self.upload_speeds = RollupSeries(capacity=self.history_capacity)
             
         # Отключаем кнопку замера скорости и сбрасываем состояние мониторинга
         if hasattr(self.window, "remoteMeasureSpeedButton"):
@@ -347,30 +388,24 @@ class ServerManagement:
             self.log_message("Не выбран клиент, нельзя запросить информацию об адаптере")
             return
             
-        # Сохраняем данные текущего адаптера перед переключением
-        if self.selected_adapter:
-            self.save_current_client_data()
-            
         # Очищаем график перед переключением на новый адаптер
         if hasattr(self, "graph_builder"):
             self.graph_builder.clear_graphs()
-            self.download_speeds = []
-            self.upload_speeds = []
             
         self.selected_adapter = item.text()
         self.log_message(f"Выбран адаптер: {self.selected_adapter}")
         
         # Запрашиваем информацию об адаптере
-        self.log_message(f"Отправляем запрос на получение информации об адаптере {self.selected_adapter} для клиента {self.selected_client}")
+        self.log_message("Отправляем запрос на получение информации об адаптере %s для клиента %s",
+                         self.selected_adapter, self.selected_client, level=DEBUG)
         result = self.server.request_adapter_info(self.selected_client, self.selected_adapter)
-        self.log_message(f"Результат запроса информации об адаптере: {result}")
+        self.log_message("Результат запроса информации об адаптере: %s", result, level=DEBUG)
         
         # Восстанавливаем сохраненные данные для этого клиента и адаптера
         self.restore_client_data()
         
         # Проверяем, идут ли данные для этого адаптера
-        client_key = f"{self.selected_client}:{self.selected_adapter}"
-        is_receiving_data = client_key in self.clients_data and len(self.clients_data[client_key]['download_speeds']) > 0
+        is_receiving_data = len(self.download_speeds) > 0
         self.is_monitoring = is_receiving_data
         
         # Включаем кнопку замера скорости и устанавливаем правильный текст
@@ -378,102 +413,114 @@ class ServerManagement:
             self.window.remoteMeasureSpeedButton.setEnabled(True)
             self.window.remoteMeasureSpeedButton.setText("Остановить замер" if is_receiving_data else "Начать замер")
             
-    def save_current_client_data(self):
-        """Сохраняет текущие данные клиента"""
-        if not self.selected_client or not self.selected_adapter:
-            return
+    def get_client_series(self, client_id, adapter):
+        """Возвращает историю скорости (с уровнями агрегации) для клиента и адаптера
+        
+        Args:
+            client_id: Идентификатор клиента
+            adapter: Имя адаптера
             
-        client_key = f"{self.selected_client}:{self.selected_adapter}"
-        self.clients_data[client_key] = {
-            'adapter': self.selected_adapter,
-            'download_speeds': self.download_speeds.copy(),
-            'upload_speeds': self.upload_speeds.copy()
-        }
-        self.log_message(f"Сохранены данные для {client_key}: {len(self.download_speeds)} точек")
+        Returns:
+            dict: {'adapter': name, 'download_speeds': RollupSeries, 'upload_speeds': RollupSeries}
+        """
+        client_key = f"{client_id}:{adapter}"
+        client_data = self.clients_data.get(client_key)
+        if client_data is None:
+            client_data = self.clients_data[client_key] = {
+                'adapter': adapter,
+                'download_speeds': RollupSeries(capacity=self.history_capacity),
+                'upload_speeds': RollupSeries(capacity=self.history_capacity)
+            }
+        return client_data
             
     def restore_client_data(self):
-        """Восстанавливает сохраненные данные клиента"""
+        """Показывает сохраненные данные выбранного клиента и адаптера
+        
+        Данные не копируются: выбранный адаптер ссылается на те же
+        буферы, в которые поступают новые измерения.
+        """
         if not self.selected_client or not self.selected_adapter:
             return
             
-        client_key = f"{self.selected_client}:{self.selected_adapter}"
-        if client_key in self.clients_data:
-            data = self.clients_data[client_key]
-            self.download_speeds = data['download_speeds'].copy()
-            self.upload_speeds = data['upload_speeds'].copy()
-            
-            # Обновляем график сохраненными данными
-            if hasattr(self, "graph_builder") and self.download_speeds and self.upload_speeds:
-                try:
-                    self.log_message(f"Восстанавливаем данные для {client_key}: {len(self.download_speeds)} точек")
-                    self.graph_builder.update_graph(self.download_speeds, self.upload_speeds)
-                except Exception as e:
-                    self.log_message(f"Ошибка при восстановлении данных графика: {e}")
-                    import traceback
-                    self.log_message(traceback.format_exc())
-        else:
-            self.download_speeds = []
-            self.upload_speeds = []
-            self.log_message(f"Нет сохраненных данных для {client_key}")
+        client_data = self.get_client_series(self.selected_client, self.selected_adapter)
+        self.download_speeds = client_data['download_speeds']
+        self.upload_speeds = client_data['upload_speeds']
+        
+        # Обновляем график сохраненными данными
+        if hasattr(self, "graph_builder") and len(self.download_speeds):
+            try:
+                self.log_message(f"Восстанавливаем данные для {self.selected_client}:{self.selected_adapter}: {len(self.download_speeds)} точек")
+                self.graph_builder.update_graph(self.download_speeds, self.upload_speeds)
+            except Exception as e:
+                self.log_message(f"Ошибка при восстановлении данных графика: {e}", level=ERROR)
+                import traceback
+                self.log_message(traceback.format_exc(), level=ERROR)
         
     def on_adapters_list_received(self, client_id, adapters):
         """Обработка полученного списка адаптеров"""
-        self.log_message(f"Получен список адаптеров от клиента {client_id}: {adapters}")
+        self.log_message("Получен список адаптеров от клиента %s: %s", client_id, adapters, level=DEBUG)
         
         if self.selected_client != client_id:
-            self.log_message(f"Игнорируем список адаптеров, т.к. выбран другой клиент: {self.selected_client}")
+            self.log_message("Игнорируем список адаптеров, т.к. выбран другой клиент: %s", self.selected_client, level=DEBUG)
             return
             
         # Заполняем список адаптеров
         if hasattr(self.window, "remoteAdapterList"):
-            self.log_message(f"Заполняем список адаптеров на UI: {adapters}")
+            self.log_message("Заполняем список адаптеров на UI: %s", adapters, level=DEBUG)
             self.window.remoteAdapterList.clear()
             for adapter in adapters:
                 self.window.remoteAdapterList.addItem(adapter)
                 
+        # Выбираем адаптер, к которому перешли с плитки обзора
+        adapter, self.pending_adapter = self.pending_adapter, None
+        if adapter and hasattr(self.window, "remoteAdapterList"):
+            items = self.window.remoteAdapterList.findItems(adapter, Qt.MatchFlag.MatchExactly)
+            if items:
+                self.window.remoteAdapterList.setCurrentItem(items[0])
+                self.on_adapter_selected(items[0])
+                
+    def on_snapshot_received(self, client_id, adapters):
+        """Обработка снимка адаптеров клиента
+
+        Сведения об адаптерах остаются в снимке на сервере, поэтому при
+        выборе адаптера они показываются без запроса к клиенту.
+        """
+        self.on_adapters_list_received(client_id, [adapter['name'] for adapter in adapters])
+            
+    def on_adapter_event_received(self, client_id, event, adapter):
+        """Обработка изменения адаптера, о котором сообщил клиент"""
+        if self.selected_client != client_id or not hasattr(self.window, "remoteAdapterList"):
+            return
+            
+        adapter_list = self.window.remoteAdapterList
+        items = adapter_list.findItems(adapter, Qt.MatchFlag.MatchExactly)
+        if event == ADAPTER_ADDED:
+            if not items:
+                adapter_list.addItem(adapter)
+        elif event == ADAPTER_REMOVED:
+            for item in items:
+                adapter_list.takeItem(adapter_list.row(item))
+        elif adapter == self.selected_adapter:
+            # Статус выбранного адаптера изменился - обновляем информацию о нем
+            self.server.request_adapter_info(client_id, adapter)
+            
     def on_adapter_info_received(self, client_id, adapter, info):
         """Обработка полученной информации об адаптере"""
-        self.log_message(f"Получена информация об адаптере {adapter} от клиента {client_id}: {info}")
+        self.log_message("Получена информация об адаптере %s от клиента %s: %s", adapter, client_id, info, level=DEBUG)
         
         if self.selected_client != client_id or self.selected_adapter != adapter:
-            self.log_message(f"Игнорируем информацию об адаптере, т.к. выбран другой клиент/адаптер: {self.selected_client}/{self.selected_adapter}")
+            self.log_message("Игнорируем информацию об адаптере, т.к. выбран другой клиент/адаптер: %s/%s",
+                             self.selected_client, self.selected_adapter, level=DEBUG)
             return
             
-        # Заполняем таблицу информацией
-        if hasattr(self.window, "remoteInfoTable"):
-            self.log_message(f"Заполняем таблицу информацией об адаптере: {info}")
-            table = self.window.remoteInfoTable
-            
-            # Определяем параметры и их порядок
-            parameters = [
-                ('id', 'ID адаптера'),
-                ('description', 'Описание'),
-                ('interface_type', 'Тип интерфейса'),
-                ('ip', 'IP адрес'),
-                ('mac', 'MAC адрес'),
-                ('speed', 'Скорость адаптера'),
-                ('mtu', 'MTU'),
-                ('status', 'Статус'),
-                ('time', 'Время замера'),
-                ('current_download', 'Загрузка - текущая'),
-                ('max_download', 'Загрузка - максимальная'),
-                ('avg_download', 'Загрузка - средняя'),
-                ('current_upload', 'Отдача - текущая'),
-                ('max_upload', 'Отдача - максимальная'),
-                ('avg_upload', 'Отдача - средняя')
-            ]
-            
-            table.setRowCount(len(parameters))
-            
-            for row, (key, display_name) in enumerate(parameters):
-                table.setItem(row, 0, QTableWidgetItem(display_name))
-                value = info.get(key, '-')
-                if isinstance(value, (int, float)) and 'speed' in key:
-                    value = f"{value:.2f} Кбит/с"
-                table.setItem(row, 1, QTableWidgetItem(str(value)))
-                
-            # Настраиваем ширину столбцов
-            table.horizontalHeader().setStretchLastSection(True)
+        # Заполняем таблицу информацией; значения замера из сведений
+        # сбрасываются до следующих данных о скорости
+        if hasattr(self, "info_model"):
+            self.log_message("Заполняем таблицу информацией об адаптере: %s", info, level=DEBUG)
+            self.info_model.update({
+                field_id: info.get(field_id, '-')
+                for field_id, _ in self.info_model.fields
+            })
             
     def toggle_monitoring(self):
         """Включение/выключение мониторинга скорости на выбранном адаптере"""
@@ -492,12 +539,22 @@ class ServerManagement:
         if not self.selected_client or not self.selected_adapter:
             return
             
-        # Запускаем мониторинг на сервере
-        self.server.start_monitoring(self.selected_client, self.selected_adapter)
+        # Запускаем мониторинг на сервере; интервал и пакетная отправка
+        # применяются при запуске замера
+        interval = batch_window = batch_samples = None
+        if hasattr(self.window, "remoteIntervalInput"):
+            interval = self.window.remoteIntervalInput.value()
+        if hasattr(self.window, "remoteBatchWindowInput"):
+            batch_window = self.window.remoteBatchWindowInput.value()
+        if hasattr(self.window, "remoteBatchSamplesInput"):
+            batch_samples = self.window.remoteBatchSamplesInput.value()
+        self.server.start_monitoring(self.selected_client, self.selected_adapter, interval=interval,
+                                     batch_window=batch_window, batch_samples=batch_samples)
         self.is_monitoring = True
         
         # Сбрасываем счетчик времени
         self.elapsed_time = 0
+        self.measurement_start = time.monotonic()
         
         # Запускаем таймер
         self.measurement_timer.start(1000)  # каждую секунду
@@ -515,8 +572,8 @@ class ServerManagement:
         if not self.selected_client:
             return
             
-        # Останавливаем мониторинг на сервере
-        self.server.stop_monitoring(self.selected_client)
+        # Останавливаем мониторинг выбранного адаптера на клиенте
+        self.server.stop_monitoring(self.selected_client, self.selected_adapter)
         self.is_monitoring = False
         
         # Останавливаем таймер
@@ -531,109 +588,113 @@ class ServerManagement:
             
     def on_speeds_data_received(self, client_id, adapter, data):
         """Обработка данных о скорости от клиента"""
-        self.log_message(f"Получены данные о скорости для {adapter} от {client_id}: {data}")
+        self.log_message("Получены данные о скорости для %s от %s: %s", adapter, client_id, data, level=DEBUG)
+        self.on_speeds_batch_received(client_id, adapter, [data])
         
-        # Сохраняем данные для всех клиентов/адаптеров
-        client_key = f"{client_id}:{adapter}"
-        if client_key not in self.clients_data:
-            self.clients_data[client_key] = {
-                'adapter': adapter,
-                'download_speeds': [],
-                'upload_speeds': []
-            }
+    def on_speeds_batch_received(self, client_id, adapter, batch):
+        """Обработка пакета данных о скорости от клиента
+        
+        Все образцы пакета добавляются в историю, а график и таблица
+        перерисовываются в ближайшем кадре (см. render_dirty), сколько бы
+        пакетов ни пришло до него.
+        """
+        if not batch:
+            return
             
-        # Добавляем новые данные
-        client_data = self.clients_data[client_key]
-        client_data['download_speeds'].append(data['download'])
-        client_data['upload_speeds'].append(data['upload'])
+        # Сохраняем данные для всех клиентов/адаптеров (старые точки вытесняются буфером)
+        client_data = self.get_client_series(client_id, adapter)
+        download_series = client_data['download_speeds']
+        upload_series = client_data['upload_speeds']
+        now = time.time()
+        for data in batch:
+            timestamp = data.get('timestamp', now)
+            download_series.append(timestamp, data['download'])
+            upload_series.append(timestamp, data['upload'])
+            
+        key = (client_id, adapter)
+        self.latest_speeds[key] = batch[-1]
+        self.render_scheduler.mark_dirty(key)
+        
+    def render_dirty(self, keys):
+        """Перерисовка рядов, измененных с прошлого кадра
+        
+        На графике показывается только выбранный клиент и адаптер, а на
+        вкладке обзора - плитки всех рядов (перерисовываются только видимые).
+        Ряды скрытой вкладки откладываются до ее показа (request_render()).
         
-        # Ограничиваем количество точек
-        max_points = 60
-        if len(client_data['download_speeds']) > max_points:
-            client_data['download_speeds'] = client_data['download_speeds'][-max_points:]
-            client_data['upload_speeds'] = client_data['upload_speeds'][-max_points:]
+        Args:
+            keys: Измененные ряды (client_id, adapter)
+            
+        Returns:
+            list: Отложенные ряды или None
+        """
+        deferred = []
+        if hasattr(self, "dashboard") and not self.dashboard.isVisible():
+            deferred.extend(keys)
+        else:
+            self.dashboard_model.refresh(keys)
             
-        # Если это текущий выбранный клиент и адаптер, обновляем локальные данные и график
-        if self.selected_client == client_id and self.selected_adapter == adapter:
-            self.download_speeds = client_data['download_speeds'].copy()
-            self.upload_speeds = client_data['upload_speeds'].copy()
+        key = (self.selected_client, self.selected_adapter)
+        if key not in keys:
+            return deferred or None
+        if hasattr(self.window, "remoteGraphWidget") and not self.window.remoteGraphWidget.isVisible():
+            if key not in deferred:
+                deferred.append(key)
+            return deferred
             
-            # Обновляем график
-            try:
-                if hasattr(self, "graph_builder"):
-                    self.log_message(f"Обновляем график: {len(self.download_speeds)} точек")
-                    self.graph_builder.update_graph(self.download_speeds, self.upload_speeds)
-            except Exception as e:
-                self.log_message(f"Ошибка при обновлении графика: {e}")
-                import traceback
-                self.log_message(traceback.format_exc())
-                
-            # Обновляем информацию в таблице
+        client_data = self.get_client_series(*key)
+        self.download_speeds = client_data['download_speeds']
+        self.upload_speeds = client_data['upload_speeds']
+        
+        # Обновляем график
+        try:
+            if hasattr(self, "graph_builder"):
+                self.graph_builder.update_graph(self.download_speeds, self.upload_speeds)
+        except Exception as e:
+            self.log_message(f"Ошибка при обновлении графика: {e}", level=ERROR)
+            import traceback
+            self.log_message(traceback.format_exc(), level=ERROR)
+            
+        # Обновляем информацию в таблице последним образцом
+        data = self.latest_speeds.get(key)
+        if data is not None:
             self.update_speed_table(data)
+        return deferred or None
+        
+    def on_dashboard_tile_activated(self, client_id, adapter):
+        """Переход с плитки обзора к графику клиента и адаптера"""
+        if not hasattr(self.window, "clientsList"):
+            return
+        for row in range(self.window.clientsList.count()):
+            item = self.window.clientsList.item(row)
+            if item.data(Qt.ItemDataRole.UserRole) == client_id:
+                break
+        else:
+            return
+            
+        # Адаптер выбирается, когда придет список адаптеров клиента
+        # (сохраненный снимок приходит сразу, внутри on_client_selected)
+        self.pending_adapter = adapter
+        self.window.clientsList.setCurrentItem(item)
+        self.on_client_selected(item)
+        if hasattr(self.window, "remote_monitoring"):
+            self.window.tabWidget.setCurrentWidget(self.window.remote_monitoring)
+            
+    def request_render(self):
+        """Перерисовка отложенных рядов (например, после показа вкладки)"""
+        self.render_scheduler.request_frame()
             
     def update_speed_table(self, data):
         """Обновление информации о скорости в таблице"""
-        if not hasattr(self.window, "remoteInfoTable"):
+        if not hasattr(self, "info_model"):
             return
             
-        table = self.window.remoteInfoTable
-        
-        # Проверяем, есть ли уже строки для скорости
-        speed_rows = []
-        for row in range(table.rowCount()):
-            param = table.item(row, 0).text()
-            if "Загрузка" in param or "Отдача" in param:
-                speed_rows.append(row)
-                
-        # Если строк для скорости нет, добавляем их
-        if not speed_rows:
-            # Добавляем строки для текущей скорости
-            current_row = table.rowCount()
-            table.setRowCount(current_row + 2)
-            
-            table.setItem(current_row, 0, QTableWidgetItem("Загрузка - текущая"))
-            table.setItem(current_row, 1, QTableWidgetItem(f"{data['download']:.2f} Кбит/с"))
-            
-            table.setItem(current_row + 1, 0, QTableWidgetItem("Отдача - текущая"))
-            table.setItem(current_row + 1, 1, QTableWidgetItem(f"{data['upload']:.2f} Кбит/с"))
-            
-            # Добавляем статистику
-            if 'stats' in data:
-                stats = data['stats']
-                stat_row = current_row + 2
-                table.setRowCount(stat_row + 4)
-                
-                table.setItem(stat_row, 0, QTableWidgetItem("Загрузка - максимальная"))
-                table.setItem(stat_row, 1, QTableWidgetItem(f"{stats['max_download']:.2f} Кбит/с"))
-                
-                table.setItem(stat_row + 1, 0, QTableWidgetItem("Загрузка - средняя"))
-                table.setItem(stat_row + 1, 1, QTableWidgetItem(f"{stats['avg_download']:.2f} Кбит/с"))
-                
-                table.setItem(stat_row + 2, 0, QTableWidgetItem("Отдача - максимальная"))
-                table.setItem(stat_row + 2, 1, QTableWidgetItem(f"{stats['max_upload']:.2f} Кбит/с"))
-                
-                table.setItem(stat_row + 3, 0, QTableWidgetItem("Отдача - средняя"))
-                table.setItem(stat_row + 3, 1, QTableWidgetItem(f"{stats['avg_upload']:.2f} Кбит/с"))
-        else:
-            # Обновляем существующие строки
-            for row in range(table.rowCount()):
-                param = table.item(row, 0).text()
-                if param == "Загрузка - текущая":
-                    table.setItem(row, 1, QTableWidgetItem(f"{data['download']:.2f} Кбит/с"))
-                elif param == "Отдача - текущая":
-                    table.setItem(row, 1, QTableWidgetItem(f"{data['upload']:.2f} Кбит/с"))
-                
-                # Обновляем статистику
-                if 'stats' in data:
-                    stats = data['stats']
-                    if param == "Загрузка - максимальная":
-                        table.setItem(row, 1, QTableWidgetItem(f"{stats['max_download']:.2f} Кбит/с"))
-                    elif param == "Загрузка - средняя":
-                        table.setItem(row, 1, QTableWidgetItem(f"{stats['avg_download']:.2f} Кбит/с"))
-                    elif param == "Отдача - максимальная":
-                        table.setItem(row, 1, QTableWidgetItem(f"{stats['max_upload']:.2f} Кбит/с"))
-                    elif param == "Отдача - средняя":
-                        table.setItem(row, 1, QTableWidgetItem(f"{stats['avg_upload']:.2f} Кбит/с"))
+        values = speed_values(data, "Кбит/с")
+        # Пакетная скорость, ошибки и отбрасывания
+        for _, key, unit in self.COUNTER_RATE_ROWS:
+            if key in data:
+                values[key] = f"{data[key]:.1f} {unit}"
+        self.info_model.update(values)
         
     def get_server_instance(self):
         """Получение экземпляра сервера для использования в других компонентах"""
@@ -654,8 +715,8 @@ class ServerManagement:
         if hasattr(self, "graph_builder"):
             # Очищаем график
             self.graph_builder.clear_graphs()
-            self.download_speeds = []
-            self.upload_speeds = []
+            self.download_speeds = RollupSeries(capacity=self.history_capacity)
+            self.upload_speeds = RollupSeries(capacity=self.history_capacity)
             
             # Удаляем сохраненные данные для текущего клиента и адаптера
             if self.selected_client and self.selected_adapter:
@@ -687,7 +748,8 @@ class ServerManagement:
         if not self.is_monitoring:
             return
             
-        self.elapsed_time += 1
+        # Время считаем по часам, а не по числу срабатываний таймера
+        self.elapsed_time = int(time.monotonic() - self.measurement_start)
         
         # Если достигли целевого времени, останавливаем измерение
         if self.target_time > 0 and self.elapsed_time >= self.target_time:
@@ -699,34 +761,3 @@ class ServerManagement:
             remaining = self.target_time - self.elapsed_time if self.target_time > 0 else 0
             if remaining > 0:
                 self.log_message(f"Осталось времени: {remaining} сек")
-                
-    def get_server_instance(self):
-        """Получение экземпляра сервера для использования в других компонентах"""
-        return self.server 
-
-    def on_hide_download_changed(self, state):
-        """Обработчик изменения состояния чекбокса скрытия графика загрузки"""
-        if hasattr(self, "graph_builder"):
-            self.graph_builder.set_download_visible(not bool(state))
-            
-    def on_hide_upload_changed(self, state):
-        """Обработчик изменения состояния чекбокса скрытия графика отдачи"""
-        if hasattr(self, "graph_builder"):
-            self.graph_builder.set_upload_visible(not bool(state))
-            
-    def clear_graphs(self):
-        """Очистка графиков и сохраненных данных"""
-        if hasattr(self, "graph_builder"):
-            # Очищаем график
-            self.graph_builder.clear_graphs()
-            self.download_speeds = []
-            self.upload_speeds = []
-            
-            # Удаляем сохраненные данные для текущего клиента и адаптера
-            if self.selected_client and self.selected_adapter:
-                client_key = f"{self.selected_client}:{self.selected_adapter}"
-                if client_key in self.clients_data:
-                    del self.clients_data[client_key]
-                    self.log_message(f"Удалены сохраненные данные для {client_key}")
-                    
-            self.log_message("Графики очищены") 
\ No newline at end of file
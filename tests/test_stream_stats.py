@@ -0,0 +1,126 @@
+"""
+Проверка потоковой статистики (src/core/stream_stats.py) против точных
+расчетов по всей истории образцов.
+"""
+
+import math
+import random
+import statistics
+import unittest
+
+from src.core.stream_stats import (DEFAULT_PRECISION, PERCENTILES, LogHistogram,
+                                   RunningVariance, StreamStats, WindowMinMax)
+
+CHECKED_PERCENTILES = (0, 1, 10, 25) + PERCENTILES + (99.9, 100)
+
+
+def exact_percentile(ordered, percent):
+    """Процентиль по отсортированному массиву (ближайший ранг, как в LogHistogram)"""
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LogHistogramTest(unittest.TestCase):
+
+    def assert_percentiles(self, values):
+        histogram = LogHistogram()
+        for value in values:
+            histogram.update(value)
+        ordered = sorted(values)
+        for percent in CHECKED_PERCENTILES:
+            expected = exact_percentile(ordered, percent)
+            actual = histogram.percentile(percent)
+            if expected < histogram.lowest:
+                # Нулевая корзина: значение - наблюдавшийся минимум
+                self.assertLess(actual, histogram.lowest, f"p{percent}")
+            else:
+                self.assertLessEqual(abs(actual - expected), DEFAULT_PRECISION * expected * (1 + 1e-9),
+                                     f"p{percent}: {actual} != {expected}")
+
+    def test_empty(self):
+        self.assertIsNone(LogHistogram().percentile(50))
+
+    def test_lognormal_with_idle(self):
+        generator = random.Random(1)
+        values = [0.0 if generator.random() < 0.1 else generator.lognormvariate(5, 2)
+                  for _ in range(20000)]
+        self.assert_percentiles(values)
+
+    def test_constant(self):
+        self.assert_percentiles([125.0] * 1000)
+
+    def test_bimodal_idle_and_burst(self):
+        generator = random.Random(2)
+        values = []
+        for _ in range(200):
+            values.extend(generator.uniform(0.5, 2.0) for _ in range(50))
+            values.extend(generator.uniform(5e5, 1e6) for _ in range(10))
+        self.assert_percentiles(values)
+
+    def test_drift(self):
+        generator = random.Random(3)
+        values = [(1 + index / 100) * generator.uniform(0.9, 1.1) for index in range(10000)]
+        self.assert_percentiles(values)
+
+    def test_out_of_range(self):
+        histogram = LogHistogram()
+        for value in (1e-3, 5e9, 1e10):
+            histogram.update(value)
+        self.assertEqual(histogram.percentile(0), 1e-3)
+        self.assertEqual(histogram.percentile(100), 1e10)
+
+    def test_reset(self):
+        histogram = LogHistogram()
+        for value in (1.0, 2.0, 3.0):
+            histogram.update(value)
+        histogram.reset()
+        self.assertIsNone(histogram.percentile(50))
+        histogram.update(10.0)
+        self.assertEqual(histogram.percentile(50), 10.0)
+
+
+class WindowMinMaxTest(unittest.TestCase):
+
+    def test_against_brute_force(self):
+        generator = random.Random(4)
+        window = WindowMinMax(5.0)
+        history = []
+        timestamp = 0.0
+        for _ in range(3000):
+            timestamp += generator.uniform(0.01, 0.5)
+            value = generator.uniform(0, 100)
+            window.update(value, timestamp)
+            history.append((timestamp, value))
+            recent = [sample for moment, sample in history if moment >= timestamp - 5.0]
+            self.assertEqual(window.min, min(recent))
+            self.assertEqual(window.max, max(recent))
+
+
+class RunningVarianceTest(unittest.TestCase):
+
+    def test_against_statistics(self):
+        generator = random.Random(5)
+        values = [1e6 + generator.gauss(0, 3) for _ in range(5000)]
+        variance = RunningVariance()
+        for value in values:
+            variance.update(value)
+        self.assertAlmostEqual(variance.mean, statistics.fmean(values), places=6)
+        self.assertAlmostEqual(variance.stddev, statistics.stdev(values), places=6)
+
+
+class StreamStatsTest(unittest.TestCase):
+
+    def test_summary(self):
+        stats = StreamStats()
+        self.assertEqual(stats.summary('download')['p95_download'], 0.0)
+        for index in range(100):
+            stats.update(float(index + 1), index, 1.0)
+        summary = stats.summary('download')
+        self.assertEqual(summary['max_download'], 100.0)
+        self.assertEqual(summary['window_min_download'], 40.0)
+        self.assertAlmostEqual(summary['p50_download'], 50.0, delta=0.5)
+        self.assertAlmostEqual(summary['p99_download'], 99.0, delta=1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()